@@ -10,6 +10,24 @@ class Settings(BaseSettings):
     dynamodb_table_singer_videos: str = Field(
         "vsxp-singer-videos", alias="SINGER_VIDEOS_TABLE_NAME"
     )
+    dynamodb_table_singer_summaries: str = Field(
+        "vsxp-singer-summaries", alias="SINGER_SUMMARIES_TABLE_NAME"
+    )
+    # Seconds before the in-memory catalog snapshot is refreshed (0 = disabled,
+    # which also disables /videos/{video_id}/similar)
+    catalog_refresh_seconds: float = Field(300, alias="CATALOG_REFRESH_SECONDS")
+    # Distinct catalog queries whose encoded responses are kept per snapshot
+    response_cache_entries: int = Field(256, ge=0, alias="RESPONSE_CACHE_ENTRIES")
+    # Cache-Control of read endpoints: fresh for max-age, then served stale
+    # while a CDN/browser revalidates with the catalog-version ETag
+    cache_max_age_seconds: int = Field(60, ge=0, alias="CACHE_MAX_AGE_SECONDS")
+    cache_stale_while_revalidate_seconds: int = Field(
+        300, ge=0, alias="CACHE_STALE_WHILE_REVALIDATE_SECONDS"
+    )
+    # Parallel segments used for full-table scans of the singer-videos table
+    scan_segments: int = Field(4, ge=1, alias="SCAN_SEGMENTS")
+    # Seconds a channel icon stays cached before CHANNEL_INFO is read again
+    channel_info_ttl_seconds: float = Field(3600, alias="CHANNEL_INFO_TTL_SECONDS")
 
     model_config = SettingsConfigDict(
         env_file=".env",
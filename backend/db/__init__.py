@@ -1,7 +1,7 @@
 from typing import List, Optional, Protocol
 
 from config import Settings
-from models import SingerSummary, Video
+from models import SingerSummary, Video, VideoPage
 
 
 class VideoRepository(Protocol):
@@ -13,13 +13,30 @@ class VideoRepository(Protocol):
         limit: int = 50,
     ) -> List[Video]: ...
 
+    def list_videos_page(
+        self,
+        q: Optional[str] = None,
+        singer: Optional[str] = None,
+        tag: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> VideoPage: ...
+
     def get_video(self, video_id: str) -> Optional[Video]: ...
 
     def list_singers(self) -> List[SingerSummary]: ...
 
+    def catalog_version(self) -> Optional[int]: ...
+
 
 def create_video_repository(settings: Settings) -> VideoRepository:
     # Import here to avoid circular dependency
+    from db.catalog import CatalogVideoRepository
     from db.dynamo import DynamoVideoRepository
 
-    return DynamoVideoRepository.from_settings(settings)
+    repo = DynamoVideoRepository.from_settings(settings)
+    if settings.catalog_refresh_seconds > 0:
+        return CatalogVideoRepository(
+            repo, settings.catalog_refresh_seconds, settings.response_cache_entries
+        )
+    return repo
@@ -0,0 +1,401 @@
+"""
+In-memory catalog snapshot.
+
+The singer-videos table is read once and kept in process, so /videos and
+/singers are answered without touching DynamoDB. The snapshot is refreshed in
+the background once it is older than the configured TTL and swapped in with a
+single reference assignment; readers never see a partially built catalog.
+
+Each snapshot records the catalog version it was loaded at. A refresh first
+reads the version and keeps the current snapshot while it is unchanged, so
+idle periods cost one GetItem per refresh instead of a full scan.
+
+Videos are held in a ColumnarCatalog (db/columnar.py) and indexed by row
+number. Loads go from decoded DynamoDB items straight into the columns;
+pydantic models are only built for the rows a response returns.
+
+Each snapshot owns its search and similarity indexes. A refresh copies the
+current snapshot's indexes and syncs the changed videos into the copies, so
+the indexes are swapped in together with the data they describe.
+"""
+
+import sys
+import threading
+import time
+from array import array
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from db.columnar import ColumnarCatalog
+from db.dynamo import DynamoVideoRepository, decode_cursor, encode_cursor, normalize
+from db.search import SearchIndex
+from db.similar import COSINE, SimilarityIndex
+from db.tags import TagIndex
+from models import SingerSummary, Video, VideoPage
+from response_cache import EncodedBody, ResponseCache
+
+
+def _order_key(values: Mapping[str, Any]) -> Tuple[str, str]:
+    return (values.get("published_at") or "", values["video_id"])
+
+
+class CatalogSnapshot:
+    """Read-only view of the catalog at one point in time."""
+
+    def __init__(
+        self,
+        rows: List[Dict[str, Any]],
+        singers: List[SingerSummary],
+        loaded_at: float,
+        search_index: SearchIndex,
+        tag_index: TagIndex,
+        similarity_index: Optional[SimilarityIndex] = None,
+        response_cache_entries: int = 256,
+        version: Optional[int] = None,
+        fallback: Optional[Callable[[str], Optional[Video]]] = None,
+    ):
+        # Rows newest first, matching the order of per-singer queries;
+        # Video objects are built only for the rows a response returns
+        rows.sort(key=_order_key, reverse=True)
+        self.catalog = ColumnarCatalog(rows)
+        self.singers = singers
+        self.loaded_at = loaded_at
+        # Catalog version read before the tables; None if none is published
+        self.version = version
+        self._search_index = search_index
+        self._tag_index = tag_index
+        self._similarity_index = similarity_index or SimilarityIndex()
+        # Reads videos written after the snapshot was loaded
+        self._fallback = fallback
+        # Encoded response bodies; dropped together with the snapshot
+        self.responses = ResponseCache(response_cache_entries)
+
+        self._rows: Dict[str, int] = {
+            video_id: row for row, video_id in enumerate(self.catalog.video_ids)
+        }
+        self._by_singer: Dict[str, array] = {}
+        for row in range(len(self.catalog)):
+            for singer_name in self.catalog.singers(row):
+                rows = self._by_singer.setdefault(normalize(singer_name), array("I"))
+                # Spellings of one singer can normalize to the same key
+                if not rows or rows[-1] != row:
+                    rows.append(row)
+
+    def get_video(self, video_id: str) -> Optional[Video]:
+        row = self._rows.get(video_id)
+        if row is not None:
+            return self.catalog.video(row)
+        return self._fallback(video_id) if self._fallback else None
+
+    def list_singers(self) -> List[SingerSummary]:
+        return self.singers
+
+    def catalog_version(self) -> Optional[int]:
+        return self.version
+
+    def cached_body(
+        self,
+        key: Hashable,
+        build: Callable[[], Tuple[Any, Optional[Dict[str, str]]]],
+    ) -> EncodedBody:
+        """Encoded response for `key`, reused until the snapshot is replaced."""
+        return self.responses.get_or_build(key, build)
+
+    def similar_videos(
+        self,
+        video_id: str,
+        k: int = 10,
+        metric: str = COSINE,
+        exclude_same_singer: bool = False,
+        covers_only: bool = False,
+    ) -> Optional[List[Video]]:
+        """
+        Videos with the closest AI stats, most similar first.
+
+        Returns:
+          None if the video is not in the catalog; an empty list if it has
+          no AI stats
+        """
+        if video_id not in self._rows:
+            return None
+        matches = self._similarity_index.similar(
+            video_id, k, metric, exclude_same_singer, covers_only
+        )
+        return [
+            self.catalog.video(self._rows[match_id]) for match_id, _ in matches or []
+        ]
+
+    def list_videos_page(
+        self,
+        q: Optional[str] = None,
+        singer: Optional[str] = None,
+        tag: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> VideoPage:
+        """
+        Read one page of videos.
+
+        singer, tag and q filters are combined by intersecting their posting
+        sets. Without `q` videos are returned newest first and the cursor
+        records the last (published_at, video_id) returned, so pages stay
+        consistent across snapshot refreshes. With `q` videos are returned in
+        relevance order and the cursor is an offset into the ranking.
+
+        Raises:
+          ValueError: If the cursor is malformed
+        """
+        position = decode_cursor(cursor) if cursor else {}
+        video_ids = self.catalog.video_ids
+
+        singer_rows: Optional[Sequence[int]] = None
+        if singer:
+            singer_rows = self._by_singer.get(normalize(singer), array("I"))
+
+        candidates: Optional[AbstractSet[str]] = None
+        if tag:
+            candidates = self._tag_index.lookup(tag)
+            if singer_rows is not None:
+                candidates = {video_ids[row] for row in singer_rows} & candidates
+        elif q and singer_rows is not None:
+            candidates = {video_ids[row] for row in singer_rows}
+
+        if q:
+            offset = position.get("offset", 0)
+            if not isinstance(offset, int) or offset < 0:
+                raise ValueError(f"Invalid cursor: {cursor}")
+
+            matches = self._search(q, candidates)
+            page = matches[offset : offset + limit]
+            next_cursor = None
+            if offset + limit < len(matches):
+                next_cursor = encode_cursor({"offset": offset + limit})
+            return VideoPage(
+                items=[self.catalog.video(row) for row in page],
+                next_cursor=next_cursor,
+            )
+
+        rows: Sequence[int]
+        if candidates is not None:
+            rows = sorted(
+                self._rows[video_id]
+                for video_id in candidates
+                if video_id in self._rows
+            )
+        elif singer_rows is not None:
+            rows = singer_rows
+        else:
+            rows = range(len(self.catalog))
+
+        if position:
+            after = (position.get("published_at"), position.get("video_id"))
+            if not all(isinstance(value, str) for value in after):
+                raise ValueError(f"Invalid cursor: {cursor}")
+            rows = rows[self._position_after(rows, after) :]
+
+        page = rows[:limit]
+        items = [self.catalog.video(row) for row in page]
+        if len(rows) <= limit:
+            return VideoPage(items=items)
+
+        last = items[-1]
+        return VideoPage(
+            items=items,
+            next_cursor=encode_cursor(
+                {"published_at": last.published_at or "", "video_id": last.video_id}
+            ),
+        )
+
+    def _order_key(self, row: int) -> Tuple[str, str]:
+        return (self.catalog.published_at(row) or "", self.catalog.video_ids[row])
+
+    def _position_after(self, rows: Sequence[int], key: Tuple[str, str]) -> int:
+        """Index of the first row ordered after `key` in newest-first `rows`."""
+        lo, hi = 0, len(rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._order_key(rows[mid]) >= key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _search(self, q: str, candidates: Optional[AbstractSet[str]]) -> List[int]:
+        """Rows matching `q`, best first, optionally restricted to `candidates`."""
+        return [
+            self._rows[video_id]
+            for video_id, _ in self._search_index.search(q, candidates)
+        ]
+
+
+class CatalogVideoRepository:
+    """VideoRepository that serves reads from a periodically refreshed snapshot."""
+
+    def __init__(
+        self,
+        source: DynamoVideoRepository,
+        refresh_seconds: float,
+        response_cache_entries: int = 256,
+    ):
+        self._source = source
+        self._refresh_seconds = refresh_seconds
+        self._response_cache_entries = response_cache_entries
+        self._snapshot: Optional[CatalogSnapshot] = None
+        # Held while a snapshot is being built; only one load runs at a time
+        self._load_lock = threading.Lock()
+
+    def warm(self) -> None:
+        """Load the snapshot eagerly (e.g. at application startup)."""
+        self._current()
+
+    def snapshot(self) -> CatalogSnapshot:
+        """
+        The snapshot currently served, with the same read methods.
+
+        Reading a whole request from one snapshot keeps its version (the
+        ETag) and its data together while a refresh swaps in a newer one.
+        """
+        return self._current()
+
+    def list_videos(
+        self,
+        q: Optional[str] = None,
+        singer: Optional[str] = None,
+        tag: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[Video]:
+        return self.list_videos_page(q=q, singer=singer, tag=tag, limit=limit).items
+
+    def list_videos_page(
+        self,
+        q: Optional[str] = None,
+        singer: Optional[str] = None,
+        tag: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> VideoPage:
+        return self._current().list_videos_page(
+            q=q, singer=singer, tag=tag, limit=limit, cursor=cursor
+        )
+
+    def get_video(self, video_id: str) -> Optional[Video]:
+        return self._current().get_video(video_id)
+
+    def similar_videos(
+        self,
+        video_id: str,
+        k: int = 10,
+        metric: str = COSINE,
+        exclude_same_singer: bool = False,
+        covers_only: bool = False,
+    ) -> Optional[List[Video]]:
+        return self._current().similar_videos(
+            video_id, k, metric, exclude_same_singer, covers_only
+        )
+
+    def list_singers(self) -> List[SingerSummary]:
+        return self._current().list_singers()
+
+    def catalog_version(self) -> Optional[int]:
+        return self._current().catalog_version()
+
+    def cached_body(
+        self,
+        key: Hashable,
+        build: Callable[[], Tuple[Any, Optional[Dict[str, str]]]],
+    ) -> EncodedBody:
+        """Encoded response for `key`, reused until the snapshot is replaced."""
+        return self._current().cached_body(key, build)
+
+    def _current(self) -> CatalogSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            # First request: nothing to serve yet, so load synchronously
+            with self._load_lock:
+                if self._snapshot is None:
+                    self._snapshot = self._load()
+                return self._snapshot
+
+        if time.monotonic() - snapshot.loaded_at >= self._refresh_seconds:
+            self._refresh_in_background()
+        return snapshot
+
+    def _refresh_in_background(self) -> None:
+        # Serve the stale snapshot while a single refresh runs
+        if not self._load_lock.acquire(blocking=False):
+            return
+
+        def run() -> None:
+            try:
+                self._snapshot = self._load()
+            except Exception as e:
+                print(f"Catalog refresh failed: {e}", file=sys.stderr)
+            finally:
+                self._load_lock.release()
+
+        threading.Thread(target=run, name="catalog-refresh", daemon=True).start()
+
+    def _load(self) -> CatalogSnapshot:
+        # Read before the tables, so the data is at least this new
+        version = self._source.catalog_version()
+        snapshot = self._snapshot
+        if version is not None and snapshot and snapshot.version == version:
+            snapshot.loaded_at = time.monotonic()
+            return snapshot
+
+        rows, singers = self._source.load_catalog()
+        video_tags = self._source.load_video_tags()
+
+        # Tags live in the videos table; attach them to the index-table rows
+        tag_terms = {}
+        for values in rows:
+            attributes = video_tags.get(values["video_id"])
+            if attributes:
+                values["tags"] = attributes["tags"]
+                values["genre"] = attributes["genre"]
+            tag_terms[values["video_id"]] = _tag_terms(values, attributes)
+
+        # Sync only the changed videos into copies of the served indexes;
+        # the served snapshot keeps reading the originals until the swap
+        if snapshot:
+            search_index = snapshot._search_index.copy()
+            similarity_index = snapshot._similarity_index.copy()
+        else:
+            search_index, similarity_index = SearchIndex(), SimilarityIndex()
+        search_index.sync(rows)
+        similarity_index.sync(rows)
+
+        # The field values are dropped once the snapshot holds their columns
+        return CatalogSnapshot(
+            rows,
+            singers,
+            loaded_at=time.monotonic(),
+            search_index=search_index,
+            tag_index=TagIndex(tag_terms),
+            similarity_index=similarity_index,
+            response_cache_entries=self._response_cache_entries,
+            version=version,
+            # Videos written after the refresh are still reachable
+            fallback=self._source.get_video,
+        )
+
+
+def _tag_terms(
+    values: Mapping[str, Any], attributes: Optional[Dict[str, Any]]
+) -> List[str]:
+    """Every term the tag filter matches for a video."""
+    terms = list(values.get("tags") or ())
+    if attributes:
+        terms += [attributes["genre"] or "", attributes["video_type"] or ""]
+    terms += [word["word"] for word in values.get("comment_cloud") or ()]
+    return terms
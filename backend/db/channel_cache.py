@@ -0,0 +1,50 @@
+"""Process-wide cache of channel icon URLs read from CHANNEL_INFO records."""
+
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+
+class ChannelInfoCache:
+    """Thread-safe channel_id -> icon URL cache with TTL-based expiry."""
+
+    def __init__(self, ttl_seconds: float):
+        self._ttl_seconds = ttl_seconds
+        # channel_id -> (expires_at, icon_url); None caches a missing CHANNEL_INFO
+        self._entries: Dict[str, Tuple[float, Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    def get_many(
+        self, channel_ids: Iterable[str]
+    ) -> Tuple[Dict[str, Optional[str]], Set[str]]:
+        """
+        Look up several channels at once.
+
+        Returns:
+          Tuple of (cached icons by channel_id, channel_ids that must be fetched)
+        """
+        now = time.monotonic()
+        found: Dict[str, Optional[str]] = {}
+        missing: Set[str] = set()
+
+        with self._lock:
+            for channel_id in channel_ids:
+                entry = self._entries.get(channel_id)
+                if entry and entry[0] > now:
+                    found[channel_id] = entry[1]
+                else:
+                    missing.add(channel_id)
+
+        return found, missing
+
+    def put(self, channel_id: str, icon_url: Optional[str]) -> None:
+        expires_at = time.monotonic() + self._ttl_seconds
+        with self._lock:
+            self._entries[channel_id] = (expires_at, icon_url)
+
+
+@lru_cache
+def get_channel_info_cache(ttl_seconds: float) -> ChannelInfoCache:
+    """Return the cache shared by every repository in this process."""
+    return ChannelInfoCache(ttl_seconds)
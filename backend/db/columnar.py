@@ -0,0 +1,186 @@
+"""
+Columnar in-memory catalog store.
+
+One pydantic Video per catalog row costs kilobytes once its comment cloud,
+AI stats and repeated channel/singer strings are counted. The catalog
+snapshot instead keeps every field in a column: strings are interned once
+in a shared table and referenced by integer IDs, numbers live in packed
+`array`s, and multi-valued fields (singers, tags, comment clouds) are flat
+arrays addressed through offset arrays. Rows are appended from plain field
+values (as decoded from DynamoDB items, or `Video.model_dump()`), and Video
+objects are only built for the rows a response returns.
+
+Measure the footprint with scripts/catalog_memory.py.
+"""
+
+from array import array
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from models import AIStats, CommentWord, Video
+
+# Marks a missing value in integer columns
+_NONE = -(2**31)
+
+# Optional string fields stored as string table IDs
+_STRING_FIELDS = (
+    "video_title",
+    "channel_id",
+    "description",
+    "published_at",
+    "song_title",
+    "link",
+    "game_title",
+    "genre",
+    "original_song_title",
+    "original_artist_name",
+    "thumbnail_url",
+)
+_INT_FIELDS = ("duration", "chorus_start_time", "chorus_end_time")
+STATS_AXES = ("cool", "cute", "energetic", "surprising", "emotional")
+
+
+class StringTable:
+    """Interned strings addressed by integer IDs; ID 0 is None."""
+
+    def __init__(self):
+        self._strings: List[Optional[str]] = [None]
+        self._ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._strings) - 1
+
+    def __getitem__(self, string_id: int) -> Optional[str]:
+        return self._strings[string_id]
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(value)
+            self._ids[value] = string_id
+        return string_id
+
+    def freeze(self) -> None:
+        """Drop the reverse lookup once no more strings are added."""
+        self._ids = {}
+
+
+class _Multi:
+    """A multi-valued column: values of row i are values[offsets[i]:offsets[i+1]]."""
+
+    def __init__(self, typecode: str = "I"):
+        self.offsets = array("I", [0])
+        self.values = array(typecode)
+
+    def append(self, values: Iterable[int]) -> None:
+        self.values.extend(values)
+        self.offsets.append(len(self.values))
+
+    def row(self, index: int) -> Sequence[int]:
+        return self.values[self.offsets[index] : self.offsets[index + 1]]
+
+
+class ColumnarCatalog:
+    """Immutable column store of catalog videos, rows in insertion order."""
+
+    def __init__(self, rows: Iterable[Mapping[str, Any]]):
+        self.strings = StringTable()
+        self.video_ids: List[str] = []
+        self._strings = {field: array("I") for field in _STRING_FIELDS}
+        self._ints = {field: array("i") for field in _INT_FIELDS}
+        # -1 = None, 0 = False, 1 = True
+        self._is_cover = array("b")
+        # Five axes per row (0-100), -1 where a video has no stats
+        self.ai_stats = array("h")
+        self._average_stats = array("h")
+        self._singers = _Multi()
+        self._tags = _Multi()
+        self._comment_words = _Multi()
+        self._comment_importance = array("h")
+
+        for values in rows:
+            self._append(values)
+        self.strings.freeze()
+
+    @classmethod
+    def from_videos(cls, videos: Iterable[Video]) -> "ColumnarCatalog":
+        return cls(video.model_dump() for video in videos)
+
+    def __len__(self) -> int:
+        return len(self.video_ids)
+
+    def _append(self, values: Mapping[str, Any]) -> None:
+        intern = self.strings.intern
+        get = values.get
+        self.video_ids.append(values["video_id"])
+        for field, column in self._strings.items():
+            column.append(intern(get(field)))
+        for field, column in self._ints.items():
+            value = get(field)
+            column.append(_NONE if value is None else value)
+        is_cover = get("is_cover")
+        self._is_cover.append(-1 if is_cover is None else int(is_cover))
+        _append_stats(self.ai_stats, get("ai_stats"))
+        _append_stats(self._average_stats, get("average_stats"))
+
+        self._singers.append(intern(name) for name in get("singers") or ())
+        self._tags.append(intern(tag) for tag in get("tags") or ())
+        cloud = get("comment_cloud") or ()
+        self._comment_words.append(intern(word["word"]) for word in cloud)
+        self._comment_importance.extend(word["importance"] for word in cloud)
+
+    def published_at(self, row: int) -> Optional[str]:
+        return self.strings[self._strings["published_at"][row]]
+
+    def singers(self, row: int) -> List[str]:
+        return [self.strings[i] for i in self._singers.row(row)]
+
+    def video(self, row: int) -> Video:
+        """
+        Materialize one row.
+
+        Rows hold values typed by the item codec or taken from validated
+        models, so they are not validated again.
+        """
+        strings = self.strings
+        fields = {
+            field: strings[column[row]] for field, column in self._strings.items()
+        }
+        for field, column in self._ints.items():
+            value = column[row]
+            fields[field] = None if value == _NONE else value
+
+        is_cover = self._is_cover[row]
+        start = self._comment_words.offsets[row]
+        cloud = [
+            CommentWord.model_construct(
+                word=strings[word], importance=self._comment_importance[start + i]
+            )
+            for i, word in enumerate(self._comment_words.row(row))
+        ]
+        return Video.model_construct(
+            video_id=self.video_ids[row],
+            singers=self.singers(row),
+            tags=[strings[i] for i in self._tags.row(row)],
+            is_cover=None if is_cover < 0 else bool(is_cover),
+            ai_stats=_stats(self.ai_stats, row),
+            average_stats=_stats(self._average_stats, row),
+            comment_cloud=cloud or None,
+            **fields,
+        )
+
+
+def _append_stats(column: array, stats: Optional[Mapping[str, int]]) -> None:
+    if stats is None:
+        column.extend((-1,) * len(STATS_AXES))
+    else:
+        column.extend(stats[axis] for axis in STATS_AXES)
+
+
+def _stats(column: array, row: int) -> Optional[AIStats]:
+    values = column[row * len(STATS_AXES) : (row + 1) * len(STATS_AXES)]
+    if values[0] < 0:
+        return None
+    return AIStats.model_construct(**dict(zip(STATS_AXES, values)))
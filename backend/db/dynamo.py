@@ -1,8 +1,55 @@
-from typing import List, Optional
+import base64
+import binascii
+import json
+import operator
+import random
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import boto3
 from config import Settings
-from models import AIStats, CommentWord, SingerSummary, Video
+from db.channel_cache import ChannelInfoCache, get_channel_info_cache
+from db.item_codec import SINGER_VIDEO_ITEM, VIDEO_ITEM
+from db.scan import SegmentedScanner, SegmentTiming
+from models import SingerSummary, Video, VideoPage
+
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_MAX_KEYS = 100
+BATCH_GET_MAX_ATTEMPTS = 5
+BATCH_GET_BACKOFF_BASE = 0.05  # seconds
+BATCH_GET_BACKOFF_CAP = 1.0  # seconds
+
+# Videos-table record whose `version` the collector bumps after catalog writes
+CATALOG_VERSION_KEY = {
+    "channel_id": {"S": "CATALOG"},
+    "video_id": {"S": "CATALOG_VERSION"},
+}
+
+# Singer-videos attributes read into a Video; description, duration, tags,
+# game_title and genre are not stored in the index table
+_SINGER_VIDEO = SINGER_VIDEO_ITEM.project(
+    "video_id",
+    "video_title",
+    "channel_id",
+    "published_at",
+    "song_title",
+    "singer_name",
+    "is_cover",
+    "link",
+    "original_song_title",
+    "original_artist_name",
+    "ai_stats",
+    "comment_cloud",
+    "chorus_start_time",
+    "chorus_end_time",
+    "thumbnail_url",
+)
+# Catalog loads also read sort_key, for the singer summary fallback
+_CATALOG_ROW = SINGER_VIDEO_ITEM.project("sort_key", *_SINGER_VIDEO.fields)
+_SINGER_SUMMARY = SINGER_VIDEO_ITEM.project(
+    "singer_name", "video_id", "sort_key", "channel_id"
+)
+_VIDEO_TAGS = VIDEO_ITEM.project("video_id", "tags", "genre", "video_type")
 
 
 def normalize(text: str) -> str:
@@ -10,11 +57,47 @@ def normalize(text: str) -> str:
     return text.lower().strip()
 
 
+def encode_cursor(position: dict) -> str:
+    """Encode a resume position (e.g. a LastEvaluatedKey) as an opaque cursor."""
+    raw = json.dumps(position, separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+      ValueError: If the cursor is malformed
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(position, dict):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return position
+
+
 class DynamoVideoRepository:
-    def __init__(self, client, videos_table: str, singer_videos_table: str):
+    def __init__(
+        self,
+        client,
+        videos_table: str,
+        singer_videos_table: str,
+        scan_segments: int = 1,
+        channel_cache: Optional[ChannelInfoCache] = None,
+        singer_summaries_table: Optional[str] = None,
+    ):
         self._client = client
         self._videos_table = videos_table
         self._singer_videos_table = singer_videos_table
+        self._singer_summaries_table = singer_summaries_table
+        # Full-table aggregations run as parallel segmented scans
+        self._scanner = SegmentedScanner(client, scan_segments)
+        self.last_scan_segments: List[SegmentTiming] = []
+        self._channel_cache = channel_cache or ChannelInfoCache(ttl_seconds=0)
 
     @classmethod
     def from_settings(cls, settings: Settings) -> "DynamoVideoRepository":
@@ -23,122 +106,9 @@ class DynamoVideoRepository:
             client,
             settings.dynamodb_table_videos,
             settings.dynamodb_table_singer_videos,
-        )
-
-    def _parse_list(self, value) -> List[str]:
-        if not value or "L" not in value:
-            return []
-        return [v.get("S", "") for v in value["L"] if isinstance(v, dict)]
-
-    def _parse_ai_stats(self, value) -> Optional[AIStats]:
-        """Parse AI stats from DynamoDB Map structure."""
-        if not value or "M" not in value:
-            return None
-        stats_map = value["M"]
-        try:
-            return AIStats(
-                cool=int(stats_map.get("cool", {}).get("N", 50)),
-                cute=int(stats_map.get("cute", {}).get("N", 50)),
-                energetic=int(stats_map.get("energetic", {}).get("N", 50)),
-                surprising=int(stats_map.get("surprising", {}).get("N", 50)),
-                emotional=int(stats_map.get("emotional", {}).get("N", 50)),
-            )
-        except (ValueError, KeyError):
-            return None
-
-    def _parse_comment_cloud(self, value) -> Optional[List[CommentWord]]:
-        """Parse comment cloud from DynamoDB List structure."""
-        if not value or "L" not in value:
-            return None
-        try:
-            words = []
-            for item in value["L"]:
-                if "M" in item:
-                    word_map = item["M"]
-                    words.append(
-                        CommentWord(
-                            word=word_map.get("word", {}).get("S", ""),
-                            importance=int(word_map.get("importance", {}).get("N", 0)),
-                        )
-                    )
-            return words if words else None
-        except (ValueError, KeyError):
-            return None
-
-    def _singer_video_item_to_video(self, item: dict) -> Video:
-        """Convert singer-video index item to Video object."""
-        return Video(
-            video_id=item["video_id"]["S"],
-            video_title=item["video_title"]["S"],
-            channel_id=item.get("channel_id", {}).get("S"),
-            description=None,  # Not stored in index table
-            duration=None,  # Not stored in index table
-            published_at=item.get("published_at", {}).get("S"),
-            song_title=item.get("song_title", {}).get("S"),
-            singers=[
-                item.get("singer_name", {}).get("S", "")
-            ],  # Single singer per record
-            tags=[],
-            is_cover=item.get("is_cover", {}).get("BOOL"),
-            link=item.get("link", {}).get("S"),
-            game_title=None,
-            genre=None,
-            original_song_title=item.get("original_song_title", {}).get("S"),
-            original_artist_name=item.get("original_artist_name", {}).get("S"),
-            view_count=(
-                int(item.get("view_count", {}).get("N", 0))
-                if "view_count" in item
-                else None
-            ),
-            like_count=(
-                int(item.get("like_count", {}).get("N", 0))
-                if "like_count" in item
-                else None
-            ),
-            comment_count=(
-                int(item.get("comment_count", {}).get("N", 0))
-                if "comment_count" in item
-                else None
-            ),
-            channel_title=item.get("channel_title", {}).get("S"),
-            ai_stats=self._parse_ai_stats(item.get("ai_stats")),
-            comment_cloud=self._parse_comment_cloud(item.get("comment_cloud")),
-            chorus_start_time=(
-                int(item["chorus_start_time"]["N"])
-                if "chorus_start_time" in item
-                else None
-            ),
-            chorus_end_time=(
-                int(item["chorus_end_time"]["N"]) if "chorus_end_time" in item else None
-            ),
-            thumbnail_url=item.get("thumbnail_url", {}).get("S"),
-        )
-
-    def _item_to_video(self, item: dict) -> Video:
-        return Video(
-            video_id=item["video_id"]["S"],
-            video_title=item["video_title"]["S"],
-            channel_id=item.get("channel_id", {}).get("S"),
-            description=item.get("description", {}).get("S"),
-            duration=int(item["duration"]["N"]) if "duration" in item else None,
-            published_at=item.get("published_at", {}).get("S"),
-            song_title=item.get("song_title", {}).get("S"),
-            singers=self._parse_list(item.get("singers")),
-            tags=self._parse_list(item.get("tags")),
-            is_cover=item.get("is_cover", {}).get("BOOL"),
-            link=item.get("link", {}).get("S"),
-            game_title=item.get("game_title", {}).get("S"),
-            genre=item.get("genre", {}).get("S"),
-            ai_stats=self._parse_ai_stats(item.get("ai_stats")),
-            comment_cloud=self._parse_comment_cloud(item.get("comment_cloud")),
-            chorus_start_time=(
-                int(item["chorus_start_time"]["N"])
-                if "chorus_start_time" in item
-                else None
-            ),
-            chorus_end_time=(
-                int(item["chorus_end_time"]["N"]) if "chorus_end_time" in item else None
-            ),
+            scan_segments=settings.scan_segments,
+            channel_cache=get_channel_info_cache(settings.channel_info_ttl_seconds),
+            singer_summaries_table=settings.dynamodb_table_singer_summaries,
         )
 
     def list_videos(
@@ -148,37 +118,23 @@ class DynamoVideoRepository:
         tag: Optional[str] = None,
         limit: int = 50,
     ) -> List[Video]:
-        # Use singer-videos table for optimized singer query
-        if singer:
-            singer_key = normalize(singer)
-            response = self._client.query(
-                TableName=self._singer_videos_table,
-                KeyConditionExpression="singer_key = :singer_key",
-                ExpressionAttributeValues={":singer_key": {"S": singer_key}},
-                ScanIndexForward=False,  # Newest first
-                Limit=limit * 2,  # Get more to account for deduplication
-            )
-
-            items = response.get("Items", [])
+        return self.list_videos_page(q=q, singer=singer, tag=tag, limit=limit).items
 
-            # Group by video_id and merge singers
-            video_map = {}
-            for item in items:
-                video_id = item["video_id"]["S"]
-                if video_id not in video_map:
-                    video = self._singer_video_item_to_video(item)
-                    video_map[video_id] = video
-                else:
-                    # Add singer to existing video
-                    singer_name = item.get("singer_name", {}).get("S", "")
-                    if singer_name and singer_name not in video_map[video_id].singers:
-                        video_map[video_id].singers.append(singer_name)
-
-            videos = list(video_map.values())
-            return videos[:limit]
+    def list_videos_page(
+        self,
+        q: Optional[str] = None,
+        singer: Optional[str] = None,
+        tag: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> VideoPage:
+        """
+        Read one page of videos, resuming from an opaque cursor.
 
-        # Scan singer-videos table for all videos
-        scan_kwargs = {"TableName": self._singer_videos_table}
+        Raises:
+          ValueError: If the cursor is malformed
+        """
+        start_key = decode_cursor(cursor) if cursor else None
 
         # Build filter expression parts
         filter_parts = []
@@ -188,31 +144,66 @@ class DynamoVideoRepository:
             filter_parts.append("contains(video_title, :q)")
             expr_attr_values[":q"] = {"S": q}
 
-        # Note: tags are not stored in singer-videos table, so tag filter is not applicable
+        # Note: tags are not stored in singer-videos table; tag filtering needs the
+        # catalog snapshot (see db/catalog.py)
+
+        # Use singer-videos table for optimized singer query
+        if singer:
+            expr_attr_values[":singer_key"] = {"S": normalize(singer)}
+            request_kwargs = {
+                "TableName": self._singer_videos_table,
+                "KeyConditionExpression": "singer_key = :singer_key",
+                "ScanIndexForward": False,  # Newest first
+            }
+            operation = self._client.query
+            key_attrs = ("singer_key", "sort_key")
+        else:
+            # Scan GSI_VIDEO_ID so all singer records of a video arrive together
+            request_kwargs = {
+                "TableName": self._singer_videos_table,
+                "IndexName": "GSI_VIDEO_ID",
+            }
+            operation = self._client.scan
+            key_attrs = ("video_id", "singer_key", "sort_key")
 
         # Combine filter parts with AND
         if filter_parts:
-            scan_kwargs["FilterExpression"] = " AND ".join(filter_parts)
-            scan_kwargs["ExpressionAttributeValues"] = expr_attr_values
-
-        response = self._client.scan(**scan_kwargs)
-        items = response.get("Items", [])
-
-        # Group by video_id and merge singers
-        video_map = {}
-        for item in items:
-            video_id = item["video_id"]["S"]
-            if video_id not in video_map:
-                video = self._singer_video_item_to_video(item)
-                video_map[video_id] = video
-            else:
-                # Add singer to existing video
-                singer_name = item.get("singer_name", {}).get("S", "")
-                if singer_name and singer_name not in video_map[video_id].singers:
-                    video_map[video_id].singers.append(singer_name)
+            request_kwargs["FilterExpression"] = " AND ".join(filter_parts)
+        if expr_attr_values:
+            request_kwargs["ExpressionAttributeValues"] = expr_attr_values
+
+        # Read one item past the page so we know whether the last video is complete
+        request_kwargs["Limit"] = limit + 1
+        if start_key:
+            if set(start_key) != set(key_attrs) or not all(
+                isinstance(value, dict) and isinstance(value.get("S"), str)
+                for value in start_key.values()
+            ):
+                raise ValueError(f"Invalid cursor: {cursor}")
+            request_kwargs["ExclusiveStartKey"] = start_key
+
+        groups: List[List[dict]] = []
+        for item in self._iter_pages(operation, request_kwargs):
+            if groups and groups[-1][0]["video_id"]["S"] == item["video_id"]["S"]:
+                groups[-1].append(item)
+                continue
+
+            if len(groups) == limit:
+                last_item = groups[-1][-1]
+                next_key = {attr: last_item[attr] for attr in key_attrs}
+                return VideoPage(
+                    items=self._merge_singer_video_items(
+                        item for group in groups for item in group
+                    ),
+                    next_cursor=encode_cursor(next_key),
+                )
+            groups.append([item])
 
-        videos = list(video_map.values())
-        return videos[:limit]
+        return VideoPage(
+            items=self._merge_singer_video_items(
+                item for group in groups for item in group
+            )
+        )
 
     def get_video(self, video_id: str) -> Optional[Video]:
         # Use GSI_VIDEO_ID to get all singer records for this video
@@ -228,65 +219,337 @@ class DynamoVideoRepository:
             return None
 
         # Merge all singer records into one video
-        video = self._singer_video_item_to_video(items[0])
-        video.singers = []
+        return self._merge_singer_video_items(items)[0]
+
+    def catalog_version(self) -> Optional[int]:
+        """
+        Read the catalog version counter.
+
+        Returns:
+          The version, or None if the collector hasn't published one yet
+        """
+        response = self._client.get_item(
+            TableName=self._videos_table,
+            Key=CATALOG_VERSION_KEY,
+            ProjectionExpression="version",
+        )
+        version = response.get("Item", {}).get("version", {}).get("N")
+        return int(version) if version is not None else None
 
-        for item in items:
-            singer_name = item.get("singer_name", {}).get("S", "")
-            if singer_name and singer_name not in video.singers:
-                video.singers.append(singer_name)
+    def list_singers(self) -> List[SingerSummary]:
+        # Read the per-singer aggregates maintained by the collector
+        summaries = self._read_singer_summaries()
+        if summaries is not None:
+            return summaries
+
+        # Fallback: aggregate the singer-videos table
+        result = self._scanner.aggregate(
+            {"TableName": self._singer_videos_table},
+            fold=_SingerAggregate.from_items,
+            merge=_SingerAggregate.merge,
+        )
+        self.last_scan_segments = result.segments
+        return self._build_singer_summaries(result.value)
+
+    def _read_singer_summaries(self) -> Optional[List[SingerSummary]]:
+        """
+        Read the singer summaries table.
+
+        Returns:
+          Summaries sorted by name, or None when the table is not configured,
+          missing or not populated yet
+        """
+        if not self._singer_summaries_table:
+            return None
 
-        return video
+        try:
+            items = list(
+                self._iter_pages(
+                    self._client.scan, {"TableName": self._singer_summaries_table}
+                )
+            )
+        except self._client.exceptions.ResourceNotFoundException:
+            return None
+        if not items:
+            return None
 
-    def list_singers(self) -> List[SingerSummary]:
-        # Use singer-videos table for efficient singer aggregation
-        response = self._client.scan(TableName=self._singer_videos_table)
-        items = response.get("Items", [])
-        counts = {}
-        latest_ids = {}
-        singer_channels = {}  # Map singer_name -> channel_id
+        items = [
+            item for item in items if int(item.get("video_count", {}).get("N", 0)) > 0
+        ]
 
-        for item in items:
-            singer_name = item.get("singer_name", {}).get("S", "")
-            video_id = item.get("video_id", {}).get("S", "")
-            channel_id = item.get("channel_id", {}).get("S", "")
+        # Summaries written without an avatar fall back to CHANNEL_INFO
+        channel_icons = self._fetch_channel_icons(
+            {
+                item["channel_id"]["S"]
+                for item in items
+                if "avatar_url" not in item and "channel_id" in item
+            }
+        )
 
-            if singer_name:
-                counts[singer_name] = counts.get(singer_name, 0) + 1
-                # Update latest_id if not set or if this video is newer
-                if singer_name not in latest_ids:
-                    latest_ids[singer_name] = video_id
-                # Track channel_id for this singer
-                if singer_name not in singer_channels and channel_id:
-                    singer_channels[singer_name] = channel_id
+        summaries = [
+            SingerSummary(
+                name=item["singer_name"]["S"],
+                video_count=int(item["video_count"]["N"]),
+                latest_video_id=item.get("latest_video_id", {}).get("S"),
+                avatar_url=item.get("avatar_url", {}).get("S")
+                or channel_icons.get(item.get("channel_id", {}).get("S", "")),
+            )
+            for item in items
+        ]
+        summaries.sort(key=lambda s: s.name.lower())
+        return summaries
+
+    def _iter_pages(self, operation, request_kwargs: dict) -> Iterator[dict]:
+        """Yield items from a scan/query, requesting further pages lazily."""
+        request_kwargs = dict(request_kwargs)
+
+        while True:
+            response = operation(**request_kwargs)
+            yield from response.get("Items", [])
+
+            if "LastEvaluatedKey" in response:
+                request_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+            else:
+                break
+
+    def load_catalog(self) -> Tuple[List[Dict[str, Any]], List[SingerSummary]]:
+        """
+        Read the whole singer-videos table once.
+
+        Items are decoded as each segment is scanned and videos are returned
+        as plain field values, not Video models: the catalog snapshot copies
+        them into columns, so building models for every row would only raise
+        the peak memory of a load.
+
+        Returns:
+          Tuple of (Video field values merged by video_id, singer summaries)
+        """
+        result = self._scanner.aggregate(
+            {"TableName": self._singer_videos_table},
+            fold=_CATALOG_ROW.decode_many,
+            merge=operator.add,
+        )
+        self.last_scan_segments = result.segments
+        rows = result.value
+
+        singers = self._read_singer_summaries()
+        if singers is None:
+            singers = self._build_singer_summaries(_SingerAggregate.from_values(rows))
+        return _merge_singer_video_values(rows), singers
+
+    def load_video_tags(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Read tag-like attributes of every video from the videos table.
+
+        Only the attributes needed for tag filtering are projected.
+
+        Returns:
+          Dict of video_id -> {"tags": [...], "genre": str|None, "video_type": str|None}
+        """
+        result = self._scanner.aggregate(
+            {
+                "TableName": self._videos_table,
+                "ProjectionExpression": "video_id, tags, genre, video_type",
+            },
+            fold=self._fold_video_tags,
+            merge=_merge_dicts,
+        )
+        return result.value
+
+    def _fold_video_tags(self, items: Iterable[dict]) -> Dict[str, Dict[str, Any]]:
+        video_tags = {}
+        for values in _VIDEO_TAGS.decode_many(items):
+            video_id = values["video_id"]
+            if video_id in ("CHANNEL_INFO", "CATALOG_VERSION"):
+                continue
+            video_tags[video_id] = {
+                "tags": values.get("tags", []),
+                "genre": values.get("genre"),
+                "video_type": values.get("video_type"),
+            }
+        return video_tags
+
+    def _merge_singer_video_items(self, items: Iterable[dict]) -> List[Video]:
+        """Group singer-video records by video_id and merge their singers."""
+        return [
+            Video.model_validate(values)
+            for values in _merge_singer_video_values(map(_SINGER_VIDEO.decode, items))
+        ]
+
+    def _fetch_channel_icons(self, channel_ids: Set[str]) -> Dict[str, str]:
+        """Read channel icons through the process-wide channel-info cache."""
+        cached, missing = self._channel_cache.get_many(channel_ids)
+        if missing:
+            fetched = self._batch_get_channel_icons(missing)
+            for channel_id, icon_url in fetched.items():
+                cached[channel_id] = icon_url
+                self._channel_cache.put(channel_id, icon_url)
+
+        return {
+            channel_id: icon_url for channel_id, icon_url in cached.items() if icon_url
+        }
+
+    def _batch_get_channel_icons(
+        self, channel_ids: Set[str]
+    ) -> Dict[str, Optional[str]]:
+        """
+        Read CHANNEL_INFO records with BatchGetItem.
+
+        Returns:
+          Icon URL by channel_id (None when the channel has no CHANNEL_INFO).
+          Channels whose keys could not be read are left out so they are
+          retried on the next call instead of being cached as missing.
+        """
+        icons: Dict[str, Optional[str]] = {}
+        ordered = sorted(channel_ids)
+
+        for start in range(0, len(ordered), BATCH_GET_MAX_KEYS):
+            chunk = ordered[start : start + BATCH_GET_MAX_KEYS]
+            request_items = {
+                self._videos_table: {
+                    "Keys": [
+                        {
+                            "channel_id": {"S": channel_id},
+                            "video_id": {"S": "CHANNEL_INFO"},
+                        }
+                        for channel_id in chunk
+                    ],
+                    "ProjectionExpression": "channel_id, channel_icon_url",
+                }
+            }
+            pending = set(chunk)
 
-        # Get channel icons from CHANNEL_INFO records in videos table
-        channel_icons = {}
-        unique_channels = set(singer_channels.values())
-        for channel_id in unique_channels:
             try:
-                info_response = self._client.get_item(
-                    TableName=self._videos_table,
-                    Key={
-                        "channel_id": {"S": channel_id},
-                        "video_id": {"S": "CHANNEL_INFO"},
-                    },
-                )
-                info_item = info_response.get("Item")
-                if info_item and "channel_icon_url" in info_item:
-                    channel_icons[channel_id] = info_item["channel_icon_url"]["S"]
+                for attempt in range(BATCH_GET_MAX_ATTEMPTS):
+                    if attempt:
+                        # Exponential backoff with full jitter
+                        delay = min(
+                            BATCH_GET_BACKOFF_CAP, BATCH_GET_BACKOFF_BASE * 2**attempt
+                        )
+                        time.sleep(random.uniform(0, delay))
+
+                    response = self._client.batch_get_item(RequestItems=request_items)
+                    for item in response.get("Responses", {}).get(
+                        self._videos_table, []
+                    ):
+                        channel_id = item["channel_id"]["S"]
+                        icons[channel_id] = item.get("channel_icon_url", {}).get("S")
+
+                    request_items = response.get("UnprocessedKeys") or {}
+                    if not request_items:
+                        # Every requested key was processed; absent ones don't exist
+                        for channel_id in pending:
+                            icons.setdefault(channel_id, None)
+                        break
+                    pending = {
+                        key["channel_id"]["S"]
+                        for key in request_items[self._videos_table]["Keys"]
+                    }
             except Exception:
-                # Skip if CHANNEL_INFO not found
+                # Leave this chunk uncached; icons are optional
                 pass
 
+        return icons
+
+    def _build_singer_summaries(
+        self, aggregate: "_SingerAggregate"
+    ) -> List[SingerSummary]:
+        """Turn aggregated singer counts into summaries with channel icons."""
+        singer_channels = aggregate.channels
+        channel_icons = self._fetch_channel_icons(set(singer_channels.values()))
+
         summaries = [
             SingerSummary(
                 name=name,
                 video_count=count,
-                latest_video_id=latest_ids.get(name),
+                latest_video_id=aggregate.latest_ids.get(name),
                 avatar_url=channel_icons.get(singer_channels.get(name, ""), None),
             )
-            for name, count in counts.items()
+            for name, count in aggregate.counts.items()
         ]
         summaries.sort(key=lambda s: s.name.lower())
         return summaries
+
+
+def _merge_singer_video_values(
+    rows: Iterable[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Group decoded singer-video records by video_id and merge their singers.
+
+    Raises:
+      ValueError: If a record has no video_title
+    """
+    videos: Dict[str, Dict[str, Any]] = {}
+    for values in rows:
+        values.pop("sort_key", None)
+        singer_name = values.pop("singer_name", "")
+        video = videos.get(values["video_id"])
+        if video is None:
+            if "video_title" not in values:
+                raise ValueError(f"Video {values['video_id']} has no video_title")
+            # Single singer per record
+            values["singers"] = [singer_name]
+            videos[values["video_id"]] = values
+        elif singer_name and singer_name not in video["singers"]:
+            # Add singer to existing video
+            video["singers"].append(singer_name)
+
+    return list(videos.values())
+
+
+def _merge_dicts(left: dict, right: dict) -> dict:
+    left.update(right)
+    return left
+
+
+class _SingerAggregate:
+    """Partial per-singer aggregation over a subset of singer-video records."""
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        # Map singer_name -> (sort_key, video_id) of the newest record
+        self.latest: Dict[str, Tuple[str, str]] = {}
+        self.channels: Dict[str, str] = {}  # Map singer_name -> channel_id
+
+    @property
+    def latest_ids(self) -> Dict[str, str]:
+        return {name: video_id for name, (_, video_id) in self.latest.items()}
+
+    @classmethod
+    def from_items(cls, items: Iterable[dict]) -> "_SingerAggregate":
+        return cls.from_values(map(_SINGER_SUMMARY.decode, items))
+
+    @classmethod
+    def from_values(cls, rows: Iterable[Dict[str, Any]]) -> "_SingerAggregate":
+        aggregate = cls()
+        counts = aggregate.counts
+        latest = aggregate.latest
+        singer_channels = aggregate.channels
+
+        for values in rows:
+            singer_name = values.get("singer_name", "")
+            video_id = values.get("video_id", "")
+            sort_key = values.get("sort_key", "")
+            channel_id = values.get("channel_id", "")
+
+            if singer_name:
+                counts[singer_name] = counts.get(singer_name, 0) + 1
+                # Update latest if not set or if this video is newer
+                if singer_name not in latest or sort_key > latest[singer_name][0]:
+                    latest[singer_name] = (sort_key, video_id)
+                # Track channel_id for this singer
+                if singer_name not in singer_channels and channel_id:
+                    singer_channels[singer_name] = channel_id
+
+        return aggregate
+
+    def merge(self, other: "_SingerAggregate") -> "_SingerAggregate":
+        for name, count in other.counts.items():
+            self.counts[name] = self.counts.get(name, 0) + count
+        for name, newest in other.latest.items():
+            if name not in self.latest or newest[0] > self.latest[name][0]:
+                self.latest[name] = newest
+        for name, channel_id in other.channels.items():
+            self.channels.setdefault(name, channel_id)
+        return self
@@ -0,0 +1,248 @@
+"""
+Schema-driven codec for DynamoDB items in the low-level wire format.
+
+Entity layouts are declared once as a Schema of Fields. When a schema is
+created each field gets a decoder and an encoder for its kind, so decoding an
+item runs down a table of (attribute, decoder) pairs with no per-field kind
+dispatch; a page of items is decoded with `decode_many`.
+
+Decoding rules:
+- Missing attributes, NULLs and values of an unexpected type are left out of
+  the result unless the field has a default
+- Numbers decode to int (fractional values are truncated)
+- Empty lists decode as missing
+
+Encoding leaves out None values and rejects names outside the schema.
+
+This module has no dependencies on either package; the backend
+(backend/db/item_codec.py) and the collector (collector/item_codec.py) carry
+identical copies, so keep them in sync (collector/test_item_codec.py fails
+when they differ).
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Field kinds
+STRING = "S"
+NUMBER = "N"
+BOOL = "BOOL"
+STRINGS = "L"  # List of strings
+MAP = "M"  # Nested map, decoded with the field's schema
+MAPS = "LM"  # List of nested maps
+
+_MISSING = object()
+
+
+class Field:
+    """One attribute of an item."""
+
+    __slots__ = ("name", "kind", "attribute", "schema", "default")
+
+    def __init__(
+        self,
+        name: str,
+        kind: str = STRING,
+        attribute: Optional[str] = None,
+        schema: Optional["Schema"] = None,
+        default: Any = _MISSING,
+    ):
+        if kind in (MAP, MAPS) and schema is None:
+            raise ValueError(f"Field {name} of kind {kind} needs a schema")
+        self.name = name
+        self.kind = kind
+        self.attribute = attribute or name
+        self.schema = schema
+        self.default = default
+
+
+class Schema:
+    """Field table of one entity, with per-field decoders and encoders."""
+
+    def __init__(self, *fields: Field):
+        self.fields = {field.name: field for field in fields}
+        self._decoders: List[Tuple[str, str, Callable[[dict], Any], Any]] = [
+            (field.attribute, field.name, _decoder(field), field.default)
+            for field in fields
+        ]
+        self._encoders: List[Tuple[str, str, Callable[[Any], dict]]] = [
+            (field.attribute, field.name, _encoder(field)) for field in fields
+        ]
+
+    def project(self, *names: str) -> "Schema":
+        """Schema with only the named fields, for decoding fewer attributes."""
+        return Schema(*(self.fields[name] for name in names))
+
+    def decode(self, item: Dict[str, dict]) -> Dict[str, Any]:
+        """Decode an item into field values."""
+        values: Dict[str, Any] = {}
+        for attribute, name, decode, default in self._decoders:
+            value = item.get(attribute)
+            if value is not None:
+                value = decode(value)
+            if value is not None:
+                values[name] = value
+            elif default is not _MISSING:
+                values[name] = default
+        return values
+
+    def decode_many(self, items: Iterable[Dict[str, dict]]) -> List[Dict[str, Any]]:
+        """Decode a page of items."""
+        decode = self.decode
+        return [decode(item) for item in items]
+
+    def encode(self, values: Dict[str, Any]) -> Dict[str, dict]:
+        """
+        Encode field values into an item.
+
+        Raises:
+          ValueError: If `values` has names outside the schema
+        """
+        unknown = values.keys() - self.fields.keys()
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        item: Dict[str, dict] = {}
+        for attribute, name, encode in self._encoders:
+            value = values.get(name)
+            if value is not None:
+                item[attribute] = encode(value)
+        return item
+
+    def encode_value(self, name: str, value: Any) -> dict:
+        """Encode one field's value, e.g. for an update expression."""
+        return _encoder(self.fields[name])(value)
+
+
+def _number(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))
+
+
+def _decoder(field: Field) -> Callable[[dict], Any]:
+    """Converter from a wire-format value of the field's kind; None if unusable."""
+    kind = field.kind
+    if kind in (STRING, BOOL):
+        return lambda value: value.get(kind)
+    if kind == NUMBER:
+
+        def decode_number(value: dict) -> Optional[int]:
+            number = value.get("N")
+            return None if number is None else _number(number)
+
+        return decode_number
+    if kind == STRINGS:
+
+        def decode_strings(value: dict) -> Optional[List[str]]:
+            strings = value.get("L", ())
+            return [
+                element.get("S", "") for element in strings if isinstance(element, dict)
+            ] or None
+
+        return decode_strings
+
+    decode_map = field.schema.decode
+    if kind == MAP:
+        return lambda value: decode_map(value["M"]) if "M" in value else None
+    if kind == MAPS:
+
+        def decode_maps(value: dict) -> Optional[List[Dict[str, Any]]]:
+            maps = value.get("L", ())
+            return [
+                decode_map(element["M"]) for element in maps if "M" in element
+            ] or None
+
+        return decode_maps
+
+    raise ValueError(f"Unknown field kind: {kind}")
+
+
+def _encoder(field: Field) -> Callable[[Any], dict]:
+    kind = field.kind
+    if kind == STRING:
+        return lambda value: {"S": value}
+    if kind == BOOL:
+        return lambda value: {"BOOL": value}
+    if kind == NUMBER:
+        return lambda value: {"N": str(value)}
+    if kind == STRINGS:
+        return lambda value: {"L": [{"S": string} for string in value]}
+
+    encode_map = field.schema.encode
+    if kind == MAP:
+        return lambda value: {"M": encode_map(value)}
+    if kind == MAPS:
+        return lambda value: {"L": [{"M": encode_map(element)} for element in value]}
+
+    raise ValueError(f"Unknown field kind: {kind}")
+
+
+AI_STATS = Schema(
+    # Axes missing from a stored map read as neutral
+    *(
+        Field(axis, NUMBER, default=50)
+        for axis in ("cool", "cute", "energetic", "surprising", "emotional")
+    )
+)
+
+COMMENT_WORD = Schema(
+    Field("word", default=""),
+    Field("importance", NUMBER, default=0),
+)
+
+# Videos table: one item per video, keyed by (channel_id, video_id)
+VIDEO_ITEM = Schema(
+    Field("channel_id"),
+    Field("video_id"),
+    Field("video_title"),
+    Field("description"),
+    Field("duration", NUMBER),
+    Field("published_at"),
+    Field("view_count", NUMBER),
+    Field("like_count", NUMBER),
+    Field("comment_count", NUMBER),
+    Field("channel_title"),
+    Field("thumbnail_url"),
+    Field("video_type"),
+    Field("song_title"),
+    Field("game_title"),
+    Field("genre"),
+    Field("singers", STRINGS),
+    Field("tags", STRINGS),
+    Field("is_cover", BOOL),
+    Field("link"),
+    Field("ai_stats", MAP, schema=AI_STATS),
+    Field("comment_cloud", MAPS, schema=COMMENT_WORD),
+    Field("chorus_start_time", NUMBER),
+    Field("chorus_end_time", NUMBER),
+    Field("enrichment_state"),
+    Field("enrichment_queue"),
+    Field("enrichment_attempts", NUMBER),
+)
+
+# Singer-videos table: one item per (singer, video)
+SINGER_VIDEO_ITEM = Schema(
+    Field("singer_key"),
+    Field("sort_key"),
+    Field("singer_name"),
+    Field("song_key"),
+    Field("video_id"),
+    Field("song_title"),
+    Field("video_title"),
+    Field("channel_id"),
+    Field("published_at"),
+    Field("is_cover", BOOL),
+    Field("link"),
+    Field("thumbnail_url"),
+    Field("original_song_title"),
+    Field("original_artist_name"),
+    Field("ai_stats", MAP, schema=AI_STATS),
+    Field("comment_cloud", MAPS, schema=COMMENT_WORD),
+    Field("chorus_start_time", NUMBER),
+    Field("chorus_end_time", NUMBER),
+    Field("view_count", NUMBER),
+    Field("like_count", NUMBER),
+    Field("comment_count", NUMBER),
+    Field("channel_title"),
+    Field("subscriber_count", NUMBER),
+)
@@ -0,0 +1,120 @@
+"""
+Segmented parallel scan engine.
+
+Splits a DynamoDB scan into `TotalSegments` segments, folds each segment in
+its own worker thread and merges the partial results with a reducer. Each
+run reports per-segment timing so slow segments are visible.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+from typing import Callable, Generic, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+
+class SegmentTiming:
+    """Timing of one scan segment."""
+
+    def __init__(self, segment: int, pages: int, items: int, seconds: float):
+        self.segment = segment
+        self.pages = pages
+        self.items = items
+        self.seconds = seconds
+
+    def __repr__(self) -> str:
+        return (
+            f"SegmentTiming(segment={self.segment}, pages={self.pages}, "
+            f"items={self.items}, seconds={self.seconds:.3f})"
+        )
+
+
+class SegmentedScanResult(Generic[T]):
+    """Merged value of a segmented scan plus per-segment timing."""
+
+    def __init__(self, value: T, segments: List[SegmentTiming], seconds: float):
+        self.value = value
+        self.segments = segments
+        self.seconds = seconds
+
+
+class SegmentedScanner:
+    """Runs fold/merge aggregations over a table using parallel scan segments."""
+
+    def __init__(self, client, total_segments: int = 1):
+        if total_segments < 1:
+            raise ValueError("total_segments must be at least 1")
+        self._client = client
+        self._total_segments = total_segments
+
+    def aggregate(
+        self,
+        scan_kwargs: dict,
+        fold: Callable[[Iterator[dict]], T],
+        merge: Callable[[T, T], T],
+    ) -> SegmentedScanResult[T]:
+        """
+        Scan the whole table and combine the items.
+
+        Args:
+          scan_kwargs: Base scan arguments (TableName, ProjectionExpression, ...)
+          fold: Reduces the items of one segment to a partial result
+          merge: Combines two partial results; applied in segment order
+
+        Returns:
+          SegmentedScanResult with the merged value and per-segment timing
+        """
+        started = time.perf_counter()
+
+        if self._total_segments == 1:
+            # Single segment: no thread pool, plain paginated scan
+            outcomes = [self._run_segment(scan_kwargs, 0, fold)]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=self._total_segments,
+                thread_name_prefix="dynamo-scan",
+            ) as pool:
+                futures = [
+                    pool.submit(self._run_segment, scan_kwargs, segment, fold)
+                    for segment in range(self._total_segments)
+                ]
+                outcomes = [future.result() for future in futures]
+
+        value = reduce(merge, [partial for partial, _ in outcomes])
+        return SegmentedScanResult(
+            value,
+            [timing for _, timing in outcomes],
+            time.perf_counter() - started,
+        )
+
+    def _run_segment(self, scan_kwargs: dict, segment: int, fold):
+        started = time.perf_counter()
+        counter = {"pages": 0, "items": 0}
+
+        request_kwargs = dict(scan_kwargs)
+        if self._total_segments > 1:
+            request_kwargs["Segment"] = segment
+            request_kwargs["TotalSegments"] = self._total_segments
+
+        def items() -> Iterator[dict]:
+            while True:
+                response = self._client.scan(**request_kwargs)
+                counter["pages"] += 1
+                page = response.get("Items", [])
+                counter["items"] += len(page)
+                yield from page
+
+                if "LastEvaluatedKey" in response:
+                    request_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+                else:
+                    break
+
+        partial = fold(items())
+        timing = SegmentTiming(
+            segment,
+            counter["pages"],
+            counter["items"],
+            time.perf_counter() - started,
+        )
+        return partial, timing
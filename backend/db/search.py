@@ -0,0 +1,219 @@
+"""
+In-process full-text search over the catalog.
+
+Text is normalized (NFKC width folding, lowercase, katakana -> hiragana) and
+split into character unigrams and bigrams, which works for Japanese titles
+without a morphological analyzer. A document matches when it contains every
+n-gram of the query; matches are ranked by IDF-weighted field scores.
+
+Each catalog snapshot owns its index. A refresh derives the next one with
+`copy`, which shares the posting dicts copy-on-write, and syncs only the
+changed videos into it, so the index a snapshot serves never changes.
+"""
+
+import math
+import threading
+import unicodedata
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from db.dynamo import normalize
+from models import Video
+
+# Relative weight of each searchable field
+FIELD_WEIGHTS = {
+    "song_title": 3.0,
+    "singers": 3.0,
+    "original_song_title": 2.0,
+    "original_artist_name": 2.0,
+    "video_title": 1.0,
+}
+
+_KATAKANA_START = 0x30A1  # ァ
+_KATAKANA_END = 0x30F6  # ヶ
+_KANA_OFFSET = 0x60  # Distance from katakana to the matching hiragana
+
+
+def normalize_for_search(text: str) -> str:
+    """Fold width, case and kana variants so equivalent spellings match."""
+    text = normalize(unicodedata.normalize("NFKC", text))
+    return "".join(
+        (
+            chr(ord(ch) - _KANA_OFFSET)
+            if _KATAKANA_START <= ord(ch) <= _KATAKANA_END
+            else ch
+        )
+        for ch in text
+    )
+
+
+def tokenize(text: str) -> Set[str]:
+    """Split text into character unigrams and bigrams of word characters."""
+    grams: Set[str] = set()
+    run: List[str] = []
+
+    for ch in normalize_for_search(text) + " ":
+        if ch.isalnum():
+            run.append(ch)
+            continue
+        grams.update(run)
+        grams.update(a + b for a, b in zip(run, run[1:]))
+        run = []
+
+    return grams
+
+
+def _query_grams(text: str) -> Set[str]:
+    """Bigrams of the query, or unigrams for single-character words."""
+    grams = tokenize(text)
+    bigrams = {gram for gram in grams if len(gram) == 2}
+    covered = {ch for gram in bigrams for ch in gram}
+    return bigrams | {gram for gram in grams if len(gram) == 1 and gram not in covered}
+
+
+def _searchable_fields(values: Mapping[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    get = values.get
+    return (
+        ("song_title", get("song_title") or ""),
+        ("singers", " ".join(get("singers") or ())),
+        ("original_song_title", get("original_song_title") or ""),
+        ("original_artist_name", get("original_artist_name") or ""),
+        ("video_title", get("video_title") or ""),
+    )
+
+
+class SearchIndex:
+    """Inverted n-gram index over searchable video fields."""
+
+    def __init__(self):
+        # gram -> {video_id: field weight}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        # video_id -> searchable field values, to detect changes and remove
+        self._documents: Dict[str, Tuple[Tuple[str, str], ...]] = {}
+        # Grams whose posting dict is this index's own; the others are
+        # shared with the index this one was copied from
+        self._owned: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def copy(self) -> "SearchIndex":
+        """
+        Index with the same documents, for syncing the next catalog into.
+
+        Postings are shared until either index changes them, so copying
+        costs one entry per gram and document rather than per posting.
+        """
+        other = SearchIndex()
+        with self._lock:
+            other._postings = dict(self._postings)
+            other._documents = dict(self._documents)
+            # Both indexes now share every posting
+            self._owned.clear()
+        return other
+
+    def sync(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        """
+        Bring the index in line with a new catalog.
+
+        Args:
+          rows: Field values of every catalog video (see ColumnarCatalog)
+
+        Only videos whose searchable fields changed are re-indexed; videos
+        missing from `rows` are removed.
+        """
+        seen: Set[str] = set()
+        with self._lock:
+            for values in rows:
+                video_id = values["video_id"]
+                seen.add(video_id)
+                fields = _searchable_fields(values)
+                if self._documents.get(video_id) != fields:
+                    self._remove(video_id)
+                    self._add(video_id, fields)
+
+            for video_id in set(self._documents) - seen:
+                self._remove(video_id)
+
+    def add(self, video: Video) -> None:
+        with self._lock:
+            self._remove(video.video_id)
+            self._add(video.video_id, _searchable_fields(video.model_dump()))
+
+    def remove(self, video_id: str) -> None:
+        with self._lock:
+            self._remove(video_id)
+
+    def search(
+        self, query: str, candidates: Optional[Set[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Find videos containing every n-gram of the query.
+
+        Args:
+          query: Free-text query
+          candidates: Optional set of video IDs to restrict the search to
+
+        Returns:
+          (video_id, score) pairs, best match first
+        """
+        grams = _query_grams(query)
+        if not grams:
+            return []
+
+        with self._lock:
+            postings = [self._postings.get(gram) for gram in grams]
+            if not all(postings):
+                return []
+
+            # Intersect starting from the rarest gram
+            postings.sort(key=len)
+            matches = set(postings[0])
+            if candidates is not None:
+                matches &= candidates
+            for posting in postings[1:]:
+                matches.intersection_update(posting)
+                if not matches:
+                    return []
+
+            total = len(self._documents)
+            scores = dict.fromkeys(matches, 0.0)
+            for posting in postings:
+                idf = math.log(1 + total / len(posting))
+                for video_id in matches:
+                    scores[video_id] += idf * posting[video_id]
+
+        return sorted(scores.items(), key=lambda pair: (-pair[1], pair[0]))
+
+    def _add(self, video_id: str, fields: Tuple[Tuple[str, str], ...]) -> None:
+        weights: Dict[str, float] = {}
+        for field, text in fields:
+            for gram in tokenize(text):
+                weights[gram] = weights.get(gram, 0.0) + FIELD_WEIGHTS[field]
+
+        for gram, weight in weights.items():
+            self._writable_posting(gram)[video_id] = weight
+        self._documents[video_id] = fields
+
+    def _remove(self, video_id: str) -> None:
+        fields = self._documents.pop(video_id, None)
+        if fields is None:
+            return
+        for _, text in fields:
+            for gram in tokenize(text):
+                if gram not in self._postings:
+                    continue
+                posting = self._writable_posting(gram)
+                posting.pop(video_id, None)
+                if not posting:
+                    del self._postings[gram]
+                    self._owned.discard(gram)
+
+    def _writable_posting(self, gram: str) -> Dict[str, float]:
+        """The posting of `gram`, copied first if it is shared."""
+        posting = self._postings.get(gram)
+        if gram not in self._owned:
+            posting = dict(posting) if posting else {}
+            self._postings[gram] = posting
+            self._owned.add(gram)
+        return posting
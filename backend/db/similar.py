@@ -0,0 +1,212 @@
+"""
+Nearest-neighbour search over the five-axis AI stats of videos.
+
+Stats vectors are kept in a NumPy matrix with one row per video, so a query
+scores every video with one matrix-vector product (cosine similarity, or
+Euclidean distance expanded as |a|^2 - 2ab + |b|^2 with precomputed squared
+norms) and picks the top k with argpartition.
+
+Each catalog snapshot owns its index. A refresh derives the next one with
+`copy` and `sync`, which rewrites only the rows of videos whose stats, cover
+flag or singers changed and reuses the rows of removed videos, so the index a
+snapshot serves never changes.
+"""
+
+import threading
+from math import sqrt
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+import numpy as np
+from db.columnar import STATS_AXES
+from db.dynamo import normalize
+
+COSINE = "cosine"
+EUCLIDEAN = "euclidean"
+
+_INITIAL_CAPACITY = 1024
+
+# Per-row arrays, grown and copied together
+_ARRAYS = ("_stats", "_unit", "_squared_norms", "_active", "_cover")
+
+# (stats, is_cover, normalized singers) of an indexed video
+_Entry = Tuple[Tuple[int, ...], bool, Tuple[str, ...]]
+
+
+def _entry(values: Mapping[str, Any]) -> _Entry:
+    stats = tuple(values["ai_stats"][axis] for axis in STATS_AXES)
+    singers = values.get("singers") or ()
+    return (
+        stats,
+        bool(values.get("is_cover")),
+        tuple(dict.fromkeys(map(normalize, singers))),
+    )
+
+
+class SimilarityIndex:
+    """Matrix of AI stats vectors of every video that has them."""
+
+    def __init__(self):
+        # row -> video_id; None for rows free for reuse
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._entries: Dict[str, _Entry] = {}
+        self._free: List[int] = []
+        self._singer_rows: Dict[str, Set[int]] = {}
+
+        self._stats = np.zeros((_INITIAL_CAPACITY, len(STATS_AXES)), np.float32)
+        # Rows scaled to unit length, for cosine similarity
+        self._unit = np.zeros_like(self._stats)
+        self._squared_norms = np.zeros(_INITIAL_CAPACITY, np.float32)
+        self._active = np.zeros(_INITIAL_CAPACITY, bool)
+        self._cover = np.zeros(_INITIAL_CAPACITY, bool)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def copy(self) -> "SimilarityIndex":
+        """Independent index with the same rows, for syncing the next catalog into."""
+        other = SimilarityIndex()
+        with self._lock:
+            other._ids = list(self._ids)
+            other._rows = dict(self._rows)
+            other._entries = dict(self._entries)
+            other._free = list(self._free)
+            other._singer_rows = {
+                singer: set(rows) for singer, rows in self._singer_rows.items()
+            }
+            for name in _ARRAYS:
+                setattr(other, name, getattr(self, name).copy())
+        return other
+
+    def sync(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        """
+        Bring the index in line with a new catalog.
+
+        Args:
+          rows: Field values of every catalog video (see ColumnarCatalog)
+
+        Only videos whose stats, cover flag or singers changed are rewritten;
+        videos missing from `rows` or without stats are removed.
+        """
+        seen: Set[str] = set()
+        with self._lock:
+            for values in rows:
+                if values.get("ai_stats") is None:
+                    continue
+                video_id = values["video_id"]
+                seen.add(video_id)
+                entry = _entry(values)
+                if self._entries.get(video_id) != entry:
+                    self._remove(video_id)
+                    self._add(video_id, entry)
+
+            for video_id in set(self._entries) - seen:
+                self._remove(video_id)
+
+    def similar(
+        self,
+        video_id: str,
+        k: int,
+        metric: str = COSINE,
+        exclude_same_singer: bool = False,
+        covers_only: bool = False,
+    ) -> Optional[List[Tuple[str, float]]]:
+        """
+        Find the videos whose stats are closest to a video's.
+
+        Args:
+          video_id: Video to find neighbours of
+          k: Maximum number of neighbours
+          metric: COSINE or EUCLIDEAN
+          exclude_same_singer: Leave out videos sharing a singer with it
+          covers_only: Only return covers
+
+        Returns:
+          (video_id, score) pairs, most similar first; scores are cosine
+          similarity or negated Euclidean distance. None if the video has
+          no stats.
+        """
+        if metric not in (COSINE, EUCLIDEAN):
+            raise ValueError(f"Unknown metric: {metric}")
+
+        with self._lock:
+            row = self._rows.get(video_id)
+            if row is None:
+                return None
+
+            size = len(self._ids)
+            mask = self._active[:size].copy()
+            mask[row] = False
+            if covers_only:
+                mask &= self._cover[:size]
+            if exclude_same_singer:
+                for singer in self._entries[video_id][2]:
+                    mask[list(self._singer_rows[singer])] = False
+
+            # Score every row at once, then drop the filtered ones
+            if metric == COSINE:
+                scores = self._unit[:size] @ self._unit[row]
+            else:
+                # Negated squared distance, |a|^2 - 2ab + |b|^2
+                scores = 2 * (self._stats[:size] @ self._stats[row])
+                scores -= self._squared_norms[:size] + self._squared_norms[row]
+            scores[~mask] = -np.inf
+
+            count = min(k, int(mask.sum()))
+            best = np.argpartition(-scores, count - 1)[:count] if count else []
+            matches = [
+                (self._ids[candidate], float(scores[candidate])) for candidate in best
+            ]
+
+        if metric == EUCLIDEAN:
+            matches = [
+                (match_id, -sqrt(max(-score, 0.0))) for match_id, score in matches
+            ]
+        return sorted(matches, key=lambda pair: (-pair[1], pair[0]))
+
+    def _add(self, video_id: str, entry: _Entry) -> None:
+        if self._free:
+            row = self._free.pop()
+            self._ids[row] = video_id
+        else:
+            row = len(self._ids)
+            if row == len(self._active):
+                self._grow()
+            self._ids.append(video_id)
+
+        stats, is_cover, singers = entry
+        vector = np.asarray(stats, np.float32)
+        norm = np.linalg.norm(vector)
+        self._stats[row] = vector
+        self._squared_norms[row] = norm * norm
+        self._unit[row] = vector / norm if norm else 0.0
+        self._active[row] = True
+        self._cover[row] = is_cover
+        for singer in singers:
+            self._singer_rows.setdefault(singer, set()).add(row)
+
+        self._rows[video_id] = row
+        self._entries[video_id] = entry
+
+    def _remove(self, video_id: str) -> None:
+        entry = self._entries.pop(video_id, None)
+        if entry is None:
+            return
+        row = self._rows.pop(video_id)
+        self._ids[row] = None
+        self._active[row] = False
+        self._free.append(row)
+        for singer in entry[2]:
+            rows = self._singer_rows[singer]
+            rows.discard(row)
+            if not rows:
+                del self._singer_rows[singer]
+
+    def _grow(self) -> None:
+        capacity = len(self._active) * 2
+        for name in _ARRAYS:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
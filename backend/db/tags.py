@@ -0,0 +1,40 @@
+"""
+Tag -> video posting index.
+
+Tags are materialized from the videos table (explicit `tags`, `video_type`,
+`genre` and `comment_cloud` words) when the catalog is loaded, so the `tag`
+filter of /videos is a set lookup instead of a scan of the wide videos table.
+"""
+
+from typing import AbstractSet, Dict, FrozenSet, Iterable, List, Set
+
+from db.search import normalize_for_search
+
+_EMPTY: FrozenSet[str] = frozenset()
+
+
+def normalize_tag(tag: str) -> str:
+    return normalize_for_search(tag)
+
+
+class TagIndex:
+    """Maps normalized tags to the set of video IDs carrying them."""
+
+    def __init__(self, video_tags: Dict[str, Iterable[str]]):
+        self._postings: Dict[str, Set[str]] = {}
+        for video_id, tags in video_tags.items():
+            for tag in tags:
+                key = normalize_tag(tag)
+                if key:
+                    self._postings.setdefault(key, set()).add(video_id)
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def lookup(self, tag: str) -> AbstractSet[str]:
+        """Video IDs tagged with `tag` (case, width and kana insensitive)."""
+        # Shared posting; callers must not mutate it
+        return self._postings.get(normalize_tag(tag), _EMPTY)
+
+    def tags(self) -> List[str]:
+        return sorted(self._postings)
@@ -1,14 +1,30 @@
-from typing import List, Optional
+import sys
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Hashable, List, Literal, Optional, Tuple
 
 from config import Settings, get_settings
 from db import VideoRepository, create_video_repository
-from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from models import SingerSummary, Video
+from response_cache import EncodedBody, catalog_etag, choose_encoding, etag_matches
 
 
 def create_app(settings: Settings) -> FastAPI:
-    app = FastAPI(title="VSingerXrossPlayer Backend")
+    repo = create_video_repository(settings)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Preload the catalog snapshot so the first request doesn't pay for it
+        warm = getattr(repo, "warm", None)
+        if warm:
+            try:
+                warm()
+            except Exception as e:
+                print(f"Catalog warm-up failed: {e}", file=sys.stderr)
+        yield
+
+    app = FastAPI(title="VSingerXrossPlayer Backend", lifespan=lifespan)
 
     # Configure CORS
     app.add_middleware(
@@ -22,42 +38,150 @@ def create_app(settings: Settings) -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
     )
 
-    repo = create_video_repository(settings)
-
     def get_repo() -> VideoRepository:
         return repo
 
+    # Lets browsers and a CDN reuse responses and revalidate in the background
+    cache_control = (
+        f"public, max-age={settings.cache_max_age_seconds}, "
+        f"stale-while-revalidate={settings.cache_stale_while_revalidate_seconds}"
+    )
+
+    def encoded_response(
+        request: Request,
+        repository: VideoRepository,
+        key: Hashable,
+        build: Callable[[VideoRepository], Tuple[Any, Optional[Dict[str, str]]]],
+    ) -> Response:
+        accept_encoding = request.headers.get("accept-encoding")
+        headers = {"Cache-Control": cache_control}
+
+        # Answer the whole request from one catalog snapshot, so the ETag
+        # (its version) and the body (its data) match even if a refresh
+        # swaps in a newer snapshot meanwhile
+        snapshot = getattr(repository, "snapshot", None)
+        reader = snapshot() if snapshot else repository
+        version = reader.catalog_version()
+
+        # Resolve the resource even for a conditional request, so a missing
+        # one is a 404 (or a bad cursor a 400) rather than a 304. The catalog
+        # keeps encoded bodies per snapshot, which makes this a lookup;
+        # otherwise encode now
+        cached_body = getattr(reader, "cached_body", None)
+        if cached_body:
+            body = cached_body(key, lambda: build(reader))
+        else:
+            body = EncodedBody.encode(*build(reader))
+
+        if version is not None:
+            headers["ETag"] = catalog_etag(version, choose_encoding(accept_encoding))
+            if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+                headers["Vary"] = "Accept-Encoding"
+                return Response(status_code=304, headers=headers)
+        return body.response(accept_encoding, headers)
+
     @app.get("/health")
     def health() -> dict:
         return {"status": "ok"}
 
+    # Catalog endpoints return pre-encoded bodies; response_model documents them
     @app.get("/videos", response_model=List[Video])
     def list_videos(
+        request: Request,
         q: Optional[str] = Query(None),
         singer: Optional[str] = Query(None),
         tag: Optional[str] = Query(None),
         limit: int = Query(50, ge=1, le=200),
+        cursor: Optional[str] = Query(None),
         repository: VideoRepository = Depends(get_repo),
-    ) -> List[Video]:
-        return repository.list_videos(q=q, singer=singer, tag=tag, limit=limit)
+    ) -> Response:
+        def build(reader: VideoRepository):
+            page = reader.list_videos_page(
+                q=q, singer=singer, tag=tag, limit=limit, cursor=cursor
+            )
+            # The body stays a plain list; the resume position travels in a header
+            headers = {"X-Next-Cursor": page.next_cursor} if page.next_cursor else {}
+            return page.items, headers
+
+        try:
+            return encoded_response(
+                request,
+                repository,
+                ("videos", q, singer, tag, limit, cursor),
+                build,
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
 
     @app.get("/videos/{video_id}", response_model=Video)
     def get_video(
+        request: Request,
         video_id: str,
         repository: VideoRepository = Depends(get_repo),
-    ) -> Video:
-        video = repository.get_video(video_id)
-        if not video:
-            raise HTTPException(status_code=404, detail="Video not found")
-        return video
+    ) -> Response:
+        def build(reader: VideoRepository):
+            video = reader.get_video(video_id)
+            if not video:
+                raise HTTPException(status_code=404, detail="Video not found")
+            return video, {}
+
+        return encoded_response(request, repository, ("video", video_id), build)
+
+    @app.get(
+        "/videos/{video_id}/similar",
+        response_model=List[Video],
+        responses={
+            404: {"description": "Video not found"},
+            501: {
+                "description": "The in-memory catalog snapshot is disabled "
+                "(CATALOG_REFRESH_SECONDS=0), so there is no stats matrix to search"
+            },
+        },
+    )
+    def similar_videos(
+        request: Request,
+        video_id: str,
+        k: int = Query(10, ge=1, le=100),
+        metric: Literal["cosine", "euclidean"] = Query("cosine"),
+        exclude_same_singer: bool = Query(False),
+        covers_only: bool = Query(False),
+        repository: VideoRepository = Depends(get_repo),
+    ) -> Response:
+        # Answered from the catalog snapshot's stats matrix only
+        if not hasattr(repository, "similar_videos"):
+            raise HTTPException(
+                status_code=501, detail="Similar videos need the catalog snapshot"
+            )
+
+        def build(reader: VideoRepository):
+            videos = reader.similar_videos(
+                video_id, k, metric, exclude_same_singer, covers_only
+            )
+            if videos is None:
+                raise HTTPException(status_code=404, detail="Video not found")
+            return videos, {}
+
+        return encoded_response(
+            request,
+            repository,
+            ("similar", video_id, k, metric, exclude_same_singer, covers_only),
+            build,
+        )
 
     @app.get("/singers", response_model=List[SingerSummary])
     def list_singers(
+        request: Request,
         repository: VideoRepository = Depends(get_repo),
-    ) -> List[SingerSummary]:
-        return repository.list_singers()
+    ) -> Response:
+        return encoded_response(
+            request,
+            repository,
+            ("singers",),
+            lambda reader: (reader.list_singers(), {}),
+        )
 
     return app
 
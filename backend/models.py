@@ -67,6 +67,11 @@ class VideoQuery(BaseModel):
     limit: int = 50
 
 
+class VideoPage(BaseModel):
+    items: List[Video]
+    next_cursor: Optional[str] = None  # Opaque; pass back as `cursor`
+
+
 class SingerSummary(BaseModel):
     name: str
     video_count: int
@@ -0,0 +1,170 @@
+"""
+Pre-serialized, precompressed response bodies.
+
+Catalog responses are JSON-encoded once with orjson, straight from the
+repository's models (they are trusted, so FastAPI's response_model
+validation is skipped), and kept per distinct query together with their
+gzip and brotli variants. Each request only picks the variant matching its
+Accept-Encoding.
+
+Catalog responses carry strong ETags derived from the catalog version the
+collector publishes, one per version and content coding, so a repeat
+request for an unchanged catalog is answered with 304 before any body is
+built.
+"""
+
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import orjson
+from fastapi import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Smaller bodies are sent uncompressed; the framing costs more than it saves
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def _to_json(value: Any) -> Any:
+    # Pydantic models reached while encoding (e.g. items of a list)
+    return value.model_dump()
+
+
+class EncodedBody:
+    """A JSON body with its compressed variants, built on first use."""
+
+    def __init__(self, body: bytes, headers: Optional[Dict[str, str]] = None):
+        self.body = body
+        self.headers = headers or {}
+        self._variants: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def encode(
+        cls, payload: Any, headers: Optional[Dict[str, str]] = None
+    ) -> "EncodedBody":
+        return cls(orjson.dumps(payload, default=_to_json), headers)
+
+    def variant(self, encoding: str) -> bytes:
+        """The body compressed with `encoding` ("br" or "gzip")."""
+        variant = self._variants.get(encoding)
+        if variant is not None:
+            return variant
+        with self._lock:
+            if encoding not in self._variants:
+                if encoding == "br":
+                    variant = brotli.compress(self.body, quality=BROTLI_QUALITY)
+                else:
+                    variant = gzip.compress(self.body, GZIP_LEVEL, mtime=0)
+                self._variants[encoding] = variant
+            return self._variants[encoding]
+
+    def response(
+        self,
+        accept_encoding: Optional[str],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Response:
+        """Build the response, compressed if the client accepts it."""
+        headers = {**self.headers, **(headers or {})}
+        headers["Vary"] = "Accept-Encoding"
+        encoding = None
+        if len(self.body) >= MIN_COMPRESS_SIZE:
+            encoding = choose_encoding(accept_encoding)
+
+        if encoding is None:
+            return Response(self.body, media_type="application/json", headers=headers)
+
+        headers["Content-Encoding"] = encoding
+        return Response(
+            self.variant(encoding), media_type="application/json", headers=headers
+        )
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Preferred supported encoding of an Accept-Encoding header."""
+    if not accept_encoding:
+        return None
+
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        params = params.replace(" ", "")
+        weight = 1.0
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        # q=0 explicitly refuses the coding
+        if weight > 0:
+            accepted.add(coding.strip().lower())
+
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def catalog_etag(version: int, encoding: Optional[str]) -> str:
+    """Strong ETag of a catalog response at `version` sent with `encoding`."""
+    if encoding:
+        return f'"v{version}-{encoding}"'
+    return f'"v{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches `etag` (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+class ResponseCache:
+    """Thread-safe LRU of encoded bodies by query key."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, EncodedBody]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(
+        self,
+        key: Hashable,
+        build: Callable[[], Tuple[Any, Optional[Dict[str, str]]]],
+    ) -> EncodedBody:
+        """
+        Return the body cached under `key`, building it on a miss.
+
+        Args:
+          key: Query identity (endpoint and parameters)
+          build: Returns (payload, extra headers) for the query
+        """
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                return body
+
+        # Encode outside the lock; concurrent misses of one key both build it
+        body = EncodedBody.encode(*build())
+        if self.max_entries <= 0:
+            return body
+
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return body
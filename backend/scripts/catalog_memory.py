@@ -0,0 +1,115 @@
+"""
+Script to compare the memory footprint of the catalog snapshot layouts.
+
+Builds synthetic catalogs and measures, with tracemalloc, a plain list of
+Video models against the ColumnarCatalog the snapshot keeps. Synthetic rows
+draw channels, singers, tags and comment words from small vocabularies, like
+the real catalog where a few hundred singers cover every video.
+
+Usage:
+  uv run python scripts/catalog_memory.py
+  uv run python scripts/catalog_memory.py --rows 10000 --rows 100000
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterator, List, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db.columnar import STATS_AXES, ColumnarCatalog
+from models import AIStats, CommentWord, Video
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+
+
+def synthetic_videos(rows: int, seed: int = 0) -> Iterator[Video]:
+    """Generate `rows` videos with realistic field sizes."""
+    rng = random.Random(seed)
+    channels = [f"UC{i:022d}" for i in range(300)]
+    singers = [f"Singer {i}" for i in range(500)]
+    tags = ["cover", "original", "vocaloid", "anime", "game", "utattemita"]
+    words = [f"word{i}" for i in range(2000)]
+
+    for i in range(rows):
+        stats = AIStats(**{axis: rng.randint(0, 100) for axis in STATS_AXES})
+        yield Video(
+            video_id=f"v{i:010d}",
+            video_title=f"【歌ってみた】Song {i % 5000} / Singer {i % 500}",
+            channel_id=rng.choice(channels),
+            description=f"Synthetic description {i} " * rng.randint(2, 10),
+            duration=rng.randint(120, 400),
+            published_at=f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}T12:00:00Z",
+            song_title=f"Song {i % 5000}",
+            singers=rng.sample(singers, rng.randint(1, 2)),
+            tags=rng.sample(tags, 2),
+            is_cover=rng.random() < 0.8,
+            link=f"https://www.youtube.com/watch?v=v{i:010d}",
+            original_song_title=f"Song {i % 5000}",
+            original_artist_name=f"Artist {i % 800}",
+            ai_stats=stats,
+            average_stats=stats,
+            comment_cloud=[
+                CommentWord(word=word, importance=rng.randint(1, 100))
+                for word in rng.sample(words, 10)
+            ],
+            chorus_start_time=rng.randint(30, 90),
+            chorus_end_time=rng.randint(90, 150),
+            thumbnail_url=f"https://i.ytimg.com/vi/v{i:010d}/hqdefault.jpg",
+        )
+
+
+def measure(build: Callable[[], object]) -> Tuple[int, float]:
+    """Bytes held by the built object and seconds spent building it."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    kept = build()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size, elapsed
+
+
+def main(rows_list: List[int]) -> None:
+    """
+    Main entry point for the comparison.
+
+    Args:
+      rows_list: Catalog sizes to measure
+    """
+    print(f"{'rows':>10} {'List[Video]':>14} {'columnar':>14} {'ratio':>7}")
+    for rows in rows_list:
+        # Both layouts keep the generated strings, so they are counted alike
+        models, _ = measure(lambda: list(synthetic_videos(rows)))
+        columnar, elapsed = measure(
+            lambda: ColumnarCatalog.from_videos(synthetic_videos(rows))
+        )
+        print(
+            f"{rows:>10} {models / 2**20:>11.1f} MB {columnar / 2**20:>11.1f} MB "
+            f"{models / columnar:>6.1f}x  (columnar build {elapsed:.1f}s)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare catalog memory of List[Video] and ColumnarCatalog"
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        action="append",
+        help="Catalog size to measure (can be specified multiple times; "
+        "default: 10k, 100k and 1M)",
+    )
+
+    args = parser.parse_args()
+    main(args.rows or DEFAULT_ROWS)
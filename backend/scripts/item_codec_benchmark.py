@@ -0,0 +1,207 @@
+"""
+Micro-benchmark of singer-videos item decoding.
+
+Compares the schema-driven codec (db/item_codec.py) against the per-item
+converter it replaced, which is kept below as the baseline. Both turn a scan
+of singer-videos items into merged Video models, the work done on every row
+of a catalog load.
+
+Usage:
+  uv run python scripts/item_codec_benchmark.py
+  uv run python scripts/item_codec_benchmark.py --items 50000 --repeat 10
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db.dynamo import _SINGER_VIDEO, DynamoVideoRepository
+from db.item_codec import SINGER_VIDEO_ITEM
+from models import AIStats, CommentWord, Video
+
+AXES = ("cool", "cute", "energetic", "surprising", "emotional")
+
+
+def synthetic_items(count: int, seed: int = 0) -> List[dict]:
+    """Singer-videos items as the collector writes them, ~1.3 per video."""
+    rng = random.Random(seed)
+    items = []
+    video = 0
+    while len(items) < count:
+        video_id = f"v{video:010d}"
+        published_at = f"2024-{video % 12 + 1:02d}-01T12:00:00Z"
+        for singer in rng.sample(range(500), 1 if rng.random() < 0.7 else 2):
+            items.append(
+                SINGER_VIDEO_ITEM.encode(
+                    {
+                        "singer_key": f"singer {singer}",
+                        "sort_key": f"{published_at}#{video_id}",
+                        "singer_name": f"Singer {singer}",
+                        "song_key": f"song {video % 5000}\tartist",
+                        "video_id": video_id,
+                        "song_title": f"Song {video % 5000}",
+                        "video_title": f"【歌ってみた】Song {video % 5000}",
+                        "channel_id": f"UC{video % 300:022d}",
+                        "published_at": published_at,
+                        "is_cover": True,
+                        "link": f"https://www.youtube.com/watch?v={video_id}",
+                        "thumbnail_url": f"https://i.ytimg.com/vi/{video_id}/hq.jpg",
+                        "original_song_title": f"Song {video % 5000}",
+                        "original_artist_name": f"Artist {video % 800}",
+                        "ai_stats": {axis: rng.randint(0, 100) for axis in AXES},
+                        "comment_cloud": [
+                            {"word": f"word{rng.randint(0, 2000)}", "importance": i}
+                            for i in range(10)
+                        ],
+                        "chorus_start_time": 60,
+                        "chorus_end_time": 90,
+                        "view_count": rng.randint(0, 10**6),
+                        "like_count": rng.randint(0, 10**4),
+                        "comment_count": rng.randint(0, 10**3),
+                        "channel_title": f"Channel {video % 300}",
+                        "subscriber_count": 1000,
+                    }
+                )
+            )
+        video += 1
+    return items[:count]
+
+
+def _legacy_ai_stats(value) -> Optional[AIStats]:
+    if not value or "M" not in value:
+        return None
+    stats_map = value["M"]
+    try:
+        return AIStats(
+            **{axis: int(stats_map.get(axis, {}).get("N", 50)) for axis in AXES}
+        )
+    except (ValueError, KeyError):
+        return None
+
+
+def _legacy_comment_cloud(value) -> Optional[List[CommentWord]]:
+    if not value or "L" not in value:
+        return None
+    try:
+        words = [
+            CommentWord(
+                word=item["M"].get("word", {}).get("S", ""),
+                importance=int(item["M"].get("importance", {}).get("N", 0)),
+            )
+            for item in value["L"]
+            if "M" in item
+        ]
+        return words if words else None
+    except (ValueError, KeyError):
+        return None
+
+
+def _legacy_item_to_video(item: dict) -> Video:
+    return Video(
+        video_id=item["video_id"]["S"],
+        video_title=item["video_title"]["S"],
+        channel_id=item.get("channel_id", {}).get("S"),
+        published_at=item.get("published_at", {}).get("S"),
+        song_title=item.get("song_title", {}).get("S"),
+        singers=[item.get("singer_name", {}).get("S", "")],
+        is_cover=item.get("is_cover", {}).get("BOOL"),
+        link=item.get("link", {}).get("S"),
+        original_song_title=item.get("original_song_title", {}).get("S"),
+        original_artist_name=item.get("original_artist_name", {}).get("S"),
+        ai_stats=_legacy_ai_stats(item.get("ai_stats")),
+        comment_cloud=_legacy_comment_cloud(item.get("comment_cloud")),
+        chorus_start_time=(
+            int(item["chorus_start_time"]["N"]) if "chorus_start_time" in item else None
+        ),
+        chorus_end_time=(
+            int(item["chorus_end_time"]["N"]) if "chorus_end_time" in item else None
+        ),
+        thumbnail_url=item.get("thumbnail_url", {}).get("S"),
+    )
+
+
+def legacy_merge(items: List[dict]) -> List[Video]:
+    """The per-item converter the codec replaced."""
+    video_map: Dict[str, Video] = {}
+    for item in items:
+        video_id = item["video_id"]["S"]
+        if video_id not in video_map:
+            video_map[video_id] = _legacy_item_to_video(item)
+        else:
+            singer_name = item.get("singer_name", {}).get("S", "")
+            if singer_name and singer_name not in video_map[video_id].singers:
+                video_map[video_id].singers.append(singer_name)
+    return list(video_map.values())
+
+
+def best_of(repeat: int, runs: Dict[str, Callable[[], object]]) -> Dict[str, float]:
+    """Fastest time of each run, alternating runs so drift affects all alike."""
+    timings = {name: float("inf") for name in runs}
+    for _ in range(repeat):
+        for name, run in runs.items():
+            gc.collect()
+            started = time.perf_counter()
+            run()
+            timings[name] = min(timings[name], time.perf_counter() - started)
+    return timings
+
+
+def main(count: int, repeat: int) -> None:
+    """
+    Main entry point for the benchmark.
+
+    Args:
+      count: Number of singer-videos items to decode
+      repeat: Runs per converter; the fastest is reported
+    """
+    items = synthetic_items(count)
+    # The merge doesn't use the repository's client or tables
+    repository = DynamoVideoRepository.__new__(DynamoVideoRepository)
+    codec_merge = repository._merge_singer_video_items
+
+    if legacy_merge(items) != codec_merge(items):
+        raise SystemExit("Converters disagree on the decoded videos")
+
+    timings = best_of(
+        repeat,
+        {
+            "legacy converter": lambda: legacy_merge(items),
+            "item codec": lambda: codec_merge(items),
+            # Wire format to plain values only, without building models
+            "  decode only": lambda: _SINGER_VIDEO.decode_many(items),
+        },
+    )
+    print(f"Decoding {count} singer-videos items into videos (best of {repeat}):")
+    for name, elapsed in timings.items():
+        print(
+            f"  {name:<18} {elapsed * 1000:8.1f} ms ({elapsed / count * 1e6:.2f} µs/item)"
+        )
+    print(f"  speedup: {timings['legacy converter'] / timings['item codec']:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the item codec with the legacy item converter"
+    )
+    parser.add_argument(
+        "--items",
+        type=int,
+        default=20000,
+        help="Number of singer-videos items to decode (default: 20000)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Runs per converter (default: 5)",
+    )
+
+    args = parser.parse_args()
+    main(args.items, args.repeat)
@@ -0,0 +1,98 @@
+"""
+In-memory stand-ins for the DynamoDB repository, shared by the tests.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config import Settings
+from db.catalog import CatalogVideoRepository
+from fastapi.testclient import TestClient
+from models import AIStats, SingerSummary, Video
+
+
+def make_video(
+    number: int,
+    singers: Iterable[str] = ("Singer",),
+    stats: Optional[Tuple[int, int, int, int, int]] = None,
+    **fields: Any,
+) -> Video:
+    """Video v<number>; higher numbers are published later."""
+    values: Dict[str, Any] = {
+        "video_id": f"v{number:03d}",
+        "video_title": f"Title {number}",
+        "published_at": f"2024-01-01T00:{number // 60:02d}:{number % 60:02d}Z",
+        "singers": list(singers),
+    }
+    if stats is not None:
+        values["ai_stats"] = AIStats(
+            **dict(zip(("cool", "cute", "energetic", "surprising", "emotional"), stats))
+        )
+    values.update(fields)
+    return Video(**values)
+
+
+class FakeVideoSource:
+    """The DynamoVideoRepository methods the catalog snapshot reads."""
+
+    def __init__(self, videos: Iterable[Video] = ()):
+        self.videos: Dict[str, Video] = {video.video_id: video for video in videos}
+        self.version = 1
+        self.loads = 0
+
+    def put(self, video: Video) -> None:
+        self.videos[video.video_id] = video
+        self.version += 1
+
+    def delete(self, video_id: str) -> None:
+        del self.videos[video_id]
+        self.version += 1
+
+    def catalog_version(self) -> Optional[int]:
+        return self.version
+
+    def load_catalog(self) -> Tuple[List[Dict[str, Any]], List[SingerSummary]]:
+        self.loads += 1
+        # Like the singer-videos table, rows carry no tags or genre
+        rows = [
+            video.model_dump(exclude={"tags", "genre"})
+            for video in self.videos.values()
+        ]
+        counts: Dict[str, int] = {}
+        for video in self.videos.values():
+            for singer in video.singers:
+                counts[singer] = counts.get(singer, 0) + 1
+        singers = [
+            SingerSummary(name=name, video_count=count)
+            for name, count in sorted(counts.items())
+        ]
+        return rows, singers
+
+    def load_video_tags(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            video.video_id: {
+                "tags": video.tags,
+                "genre": video.genre,
+                "video_type": None,
+            }
+            for video in self.videos.values()
+        }
+
+    def get_video(self, video_id: str) -> Optional[Video]:
+        return self.videos.get(video_id)
+
+
+def catalog_repository(source: FakeVideoSource) -> CatalogVideoRepository:
+    return CatalogVideoRepository(source, refresh_seconds=3600)
+
+
+def refresh(repository: CatalogVideoRepository) -> None:
+    """Reload the snapshot synchronously, as a background refresh would."""
+    repository._snapshot = repository._load()
+
+
+def api_client(monkeypatch, repository) -> TestClient:
+    """Test client of the app serving `repository`."""
+    import main
+
+    monkeypatch.setattr(main, "create_video_repository", lambda settings: repository)
+    return TestClient(main.create_app(Settings()))
@@ -0,0 +1,200 @@
+"""
+Test script for the in-memory catalog snapshot.
+
+Reads go through CatalogVideoRepository over an in-memory source, so no AWS
+access is needed.
+"""
+
+import pytest
+from db.dynamo import encode_cursor
+from fakes import (
+    FakeVideoSource,
+    api_client,
+    catalog_repository,
+    make_video,
+    refresh,
+)
+
+
+def _ids(page):
+    return [video.video_id for video in page.items]
+
+
+def _walk(repository, **filters):
+    """Video IDs of every page, following next_cursor."""
+    ids, cursor = [], None
+    while True:
+        page = repository.list_videos_page(cursor=cursor, **filters)
+        ids += _ids(page)
+        cursor = page.next_cursor
+        if cursor is None:
+            return ids
+
+
+def test_pages_are_newest_first():
+    repository = catalog_repository(
+        FakeVideoSource(make_video(number) for number in range(1, 8))
+    )
+
+    first = repository.list_videos_page(limit=3)
+
+    assert _ids(first) == ["v007", "v006", "v005"]
+    assert _walk(repository, limit=3) == [f"v{n:03d}" for n in range(7, 0, -1)]
+
+
+def test_cursor_is_stable_across_refresh():
+    source = FakeVideoSource(make_video(number) for number in range(1, 11))
+    repository = catalog_repository(source)
+    first = repository.list_videos_page(limit=4)
+    assert _ids(first) == ["v010", "v009", "v008", "v007"]
+
+    # A newer video arrives and an unseen one is removed before the next page
+    source.put(make_video(20))
+    source.delete("v005")
+    refresh(repository)
+
+    second = repository.list_videos_page(limit=4, cursor=first.next_cursor)
+    third = repository.list_videos_page(limit=4, cursor=second.next_cursor)
+
+    assert _ids(second) == ["v006", "v004", "v003", "v002"]
+    assert _ids(third) == ["v001"]
+    assert third.next_cursor is None
+    assert _ids(repository.list_videos_page(limit=1)) == ["v020"]
+
+
+def test_refresh_keeps_snapshot_while_version_is_unchanged():
+    source = FakeVideoSource([make_video(1)])
+    repository = catalog_repository(source)
+    repository.warm()
+
+    refresh(repository)
+    assert source.loads == 1
+
+    source.put(make_video(2))
+    refresh(repository)
+    assert source.loads == 2
+    assert repository.get_video("v002").video_title == "Title 2"
+
+
+def test_singer_filter():
+    repository = catalog_repository(
+        FakeVideoSource(
+            [
+                make_video(1, singers=["AZKi"]),
+                make_video(2, singers=["Suisei"]),
+                make_video(3, singers=["Suisei", "AZKi"]),
+                make_video(4, singers=["azki"]),
+                make_video(5, singers=["Suisei"]),
+            ]
+        )
+    )
+
+    # Singer names match case-insensitively, and duets appear under both
+    assert _walk(repository, singer=" AZKI ", limit=2) == ["v004", "v003", "v001"]
+    assert _walk(repository, singer="Suisei", limit=2) == ["v005", "v003", "v002"]
+    assert _ids(repository.list_videos_page(singer="nobody")) == []
+
+
+def test_singer_and_tag_filters_intersect():
+    repository = catalog_repository(
+        FakeVideoSource(
+            [
+                make_video(1, singers=["AZKi"], tags=["cover"]),
+                make_video(2, singers=["AZKi"], tags=["original"]),
+                make_video(3, singers=["Suisei"], tags=["cover"]),
+            ]
+        )
+    )
+
+    page = repository.list_videos_page(singer="AZKi", tag="Cover")
+
+    assert _ids(page) == ["v001"]
+    assert page.items[0].tags == ["cover"]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor!",
+        encode_cursor(["published_at", "video_id"]),
+        encode_cursor({"published_at": 1, "video_id": "v001"}),
+    ],
+)
+def test_bad_cursor_is_rejected(cursor):
+    repository = catalog_repository(FakeVideoSource([make_video(1)]))
+
+    with pytest.raises(ValueError):
+        repository.list_videos_page(cursor=cursor)
+
+
+def test_bad_cursor_returns_400(monkeypatch):
+    repository = catalog_repository(FakeVideoSource([make_video(1)]))
+
+    with api_client(monkeypatch, repository) as client:
+        assert client.get("/videos", params={"cursor": "!!!"}).status_code == 400
+        response = client.get(
+            "/videos", params={"q": "title", "cursor": encode_cursor({"offset": -1})}
+        )
+        assert response.status_code == 400
+        assert client.get("/videos").status_code == 200
+
+
+def test_matching_etag_is_304_only_for_existing_videos(monkeypatch):
+    repository = catalog_repository(FakeVideoSource([make_video(1)]))
+
+    with api_client(monkeypatch, repository) as client:
+        etag = client.get("/videos/v001").headers["ETag"]
+
+        conditional = {"If-None-Match": etag}
+        assert client.get("/videos/v001", headers=conditional).status_code == 304
+        assert client.get("/videos/v404", headers=conditional).status_code == 404
+        response = client.get("/videos", params={"cursor": "!!!"}, headers=conditional)
+        assert response.status_code == 400
+
+
+def test_refresh_leaves_the_served_snapshot_unchanged():
+    source = FakeVideoSource(
+        [
+            make_video(1, stats=(80, 20, 80, 20, 80)),
+            make_video(2, stats=(80, 20, 80, 20, 70), video_title="Hibana"),
+        ]
+    )
+    repository = catalog_repository(source)
+    repository.warm()
+    served = repository._snapshot
+
+    source.delete("v002")
+    source.put(make_video(3, stats=(80, 20, 80, 20, 75), video_title="Hibana"))
+    refresh(repository)
+
+    # The old snapshot keeps answering from its own data and indexes
+    assert _ids(served.list_videos_page(q="hibana")) == ["v002"]
+    assert [video.video_id for video in served.similar_videos("v001")] == ["v002"]
+    assert _ids(repository.list_videos_page(q="hibana")) == ["v003"]
+    assert [video.video_id for video in repository.similar_videos("v001")] == ["v003"]
+
+
+def test_etag_and_body_come_from_the_same_snapshot(monkeypatch):
+    source = FakeVideoSource([make_video(1)])
+    repository = catalog_repository(source)
+    repository.warm()
+    served = repository._snapshot
+    version = served.catalog_version
+
+    def swap_after_reading():
+        # A refresh lands between reading the version and building the body
+        source.put(make_video(1, video_title="Renamed"))
+        refresh(repository)
+        return version()
+
+    monkeypatch.setattr(served, "catalog_version", swap_after_reading)
+
+    with api_client(monkeypatch, repository) as client:
+        first = client.get("/videos/v001")
+        assert first.json()["video_title"] == "Title 1"
+
+        second = client.get("/videos/v001")
+        assert second.json()["video_title"] == "Renamed"
+        assert second.headers["ETag"] != first.headers["ETag"]
+        conditional = {"If-None-Match": first.headers["ETag"]}
+        assert client.get("/videos/v001", headers=conditional).status_code == 200
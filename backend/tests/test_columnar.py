@@ -0,0 +1,91 @@
+"""
+Test script for the columnar catalog store.
+"""
+
+from array import array
+
+from db.columnar import STATS_AXES, ColumnarCatalog
+from models import AIStats, CommentWord, Video
+
+FULL = Video(
+    video_id="v1",
+    video_title="【歌ってみた】Song",
+    channel_id="UC1",
+    description="description",
+    duration=215,
+    published_at="2024-05-01T12:00:00Z",
+    song_title="Song",
+    singers=["A", "B"],
+    tags=["cover", "anime"],
+    is_cover=False,
+    link="https://www.youtube.com/watch?v=v1",
+    game_title="Game",
+    genre="pop",
+    original_song_title="Song",
+    original_artist_name="Artist",
+    ai_stats=AIStats(cool=0, cute=20, energetic=40, surprising=60, emotional=100),
+    average_stats=AIStats(cool=50, cute=50, energetic=50, surprising=50, emotional=50),
+    comment_cloud=[
+        CommentWord(word="w1", importance=9),
+        CommentWord(word="w2", importance=1),
+    ],
+    chorus_start_time=0,
+    chorus_end_time=90,
+    thumbnail_url="https://i.ytimg.com/vi/v1/hqdefault.jpg",
+)
+EMPTY = Video(video_id="v2", video_title="title")
+
+
+def test_videos_round_trip():
+    catalog = ColumnarCatalog.from_videos([FULL, EMPTY, FULL])
+
+    assert len(catalog) == 3
+    assert catalog.video_ids == ["v1", "v2", "v1"]
+    assert [catalog.video(row) for row in range(3)] == [FULL, EMPTY, FULL]
+    assert catalog.singers(0) == ["A", "B"]
+    assert catalog.published_at(1) is None
+
+
+def test_missing_stats_are_stored_as_minus_one():
+    catalog = ColumnarCatalog.from_videos([EMPTY, FULL])
+
+    axes = len(STATS_AXES)
+    assert catalog.ai_stats[:axes] == array("h", [-1] * axes)
+    assert catalog.ai_stats[axes:] == array("h", [0, 20, 40, 60, 100])
+    assert catalog.video(0).ai_stats is None
+    assert catalog.video(0).comment_cloud is None
+
+
+def test_rows_from_decoded_items():
+    # Field values as the item codec decodes them: nested maps stay dicts
+    # and absent attributes are left out
+    catalog = ColumnarCatalog(
+        [
+            {
+                "video_id": "v1",
+                "video_title": "title",
+                "singers": ["A"],
+                "is_cover": True,
+                "ai_stats": dict(zip(STATS_AXES, (1, 2, 3, 4, 5))),
+                "comment_cloud": [{"word": "w", "importance": 3}],
+                "chorus_start_time": 60,
+            }
+        ]
+    )
+
+    assert catalog.video(0) == Video(
+        video_id="v1",
+        video_title="title",
+        singers=["A"],
+        is_cover=True,
+        ai_stats=AIStats(cool=1, cute=2, energetic=3, surprising=4, emotional=5),
+        comment_cloud=[CommentWord(word="w", importance=3)],
+        chorus_start_time=60,
+    )
+
+
+def test_strings_are_interned():
+    once = ColumnarCatalog.from_videos([FULL])
+    twice = ColumnarCatalog.from_videos([FULL, FULL])
+
+    assert len(twice.strings) == len(once.strings)
@@ -0,0 +1,136 @@
+"""
+Test script for the in-process n-gram search index.
+"""
+
+import pytest
+from db.dynamo import encode_cursor
+from db.search import SearchIndex, normalize_for_search, tokenize
+from fakes import FakeVideoSource, catalog_repository, make_video
+
+
+def _row(video_id, **fields):
+    return {"video_id": video_id, "video_title": "", "singers": [], **fields}
+
+
+def _ids(matches):
+    return [video_id for video_id, _ in matches]
+
+
+def test_tokenize_splits_words_into_unigrams_and_bigrams():
+    assert tokenize("Abc・歌") == {"a", "b", "c", "ab", "bc", "歌"}
+    assert tokenize("  ") == set()
+
+
+def test_normalize_folds_width_case_and_kana():
+    assert normalize_for_search("ＡＢＣ") == "abc"
+    assert normalize_for_search("カタカナ") == "かたかな"
+    assert normalize_for_search("ｶﾀｶﾅ") == "かたかな"
+
+
+def test_search_matches_every_query_gram():
+    index = SearchIndex()
+    index.sync(
+        [
+            _row("v1", song_title="ロキ"),
+            _row("v2", song_title="ロキとキロ"),
+            _row("v3", song_title="キロ"),
+        ]
+    )
+
+    assert set(_ids(index.search("ロキ"))) == {"v1", "v2"}
+    assert _ids(index.search("ロキ", candidates={"v2", "v3"})) == ["v2"]
+    assert index.search("存在しない") == []
+    assert index.search("・") == []
+
+
+def test_search_is_kana_and_width_insensitive():
+    index = SearchIndex()
+    index.sync([_row("v1", song_title="ヒバナ"), _row("v2", singers=["AZKi"])])
+
+    assert _ids(index.search("ひばな")) == ["v1"]
+    assert _ids(index.search("ﾋﾊﾞﾅ")) == ["v1"]
+    assert _ids(index.search("ａｚｋｉ")) == ["v2"]
+
+
+def test_field_weights_rank_matches():
+    index = SearchIndex()
+    index.sync(
+        [
+            _row("v1", video_title="【歌ってみた】ヒバナ"),
+            _row("v2", song_title="ヒバナ"),
+            _row("v3", original_song_title="ヒバナ"),
+        ]
+    )
+
+    assert _ids(index.search("ヒバナ")) == ["v2", "v3", "v1"]
+
+
+def test_sync_updates_changed_videos_only():
+    index = SearchIndex()
+    index.sync([_row("v1", song_title="ヒバナ"), _row("v2", song_title="ロキ")])
+    documents = dict(index._documents)
+
+    index.sync(
+        [
+            _row("v1", song_title="ヒバナ"),
+            _row("v2", song_title="シャルル"),
+            _row("v3", song_title="ロキ"),
+        ]
+    )
+
+    # The unchanged video keeps its indexed document
+    assert index._documents["v1"] is documents["v1"]
+    assert _ids(index.search("ロキ")) == ["v3"]
+    assert _ids(index.search("シャルル")) == ["v2"]
+
+    index.sync([_row("v3", song_title="ロキ")])
+
+    assert len(index) == 1
+    assert index.search("ヒバナ") == []
+    # Grams of removed videos leave no empty postings behind
+    assert "ひば" not in index._postings
+
+
+def test_copies_are_synced_without_changing_the_original():
+    index = SearchIndex()
+    index.sync([_row("v1", song_title="ヒバナ"), _row("v2", song_title="ロキ")])
+
+    copy = index.copy()
+    copy.sync([_row("v1", song_title="ヒバナ"), _row("v3", song_title="ロキ")])
+
+    assert _ids(index.search("ロキ")) == ["v2"]
+    assert _ids(copy.search("ロキ")) == ["v3"]
+    # Untouched postings stay shared; changed ones were copied
+    assert copy._postings["ひば"] is index._postings["ひば"]
+    assert copy._postings["ろき"] is not index._postings["ろき"]
+
+    # The original can still change without affecting the copy
+    index.sync([_row("v1", song_title="ヒバナ")])
+    assert _ids(copy.search("ヒバナ")) == ["v1"]
+    assert _ids(copy.search("ロキ")) == ["v3"]
+
+
+def test_query_pages_use_offset_cursors():
+    repository = catalog_repository(
+        FakeVideoSource(
+            make_video(number, song_title=f"ヒバナ {number}") for number in range(1, 6)
+        )
+    )
+
+    first = repository.list_videos_page(q="ひばな", limit=2)
+    second = repository.list_videos_page(q="ひばな", limit=2, cursor=first.next_cursor)
+    third = repository.list_videos_page(q="ひばな", limit=2, cursor=second.next_cursor)
+
+    assert first.next_cursor == encode_cursor({"offset": 2})
+    assert second.next_cursor == encode_cursor({"offset": 4})
+    assert third.next_cursor is None
+    ids = [video.video_id for page in (first, second, third) for video in page.items]
+    assert sorted(ids) == [f"v{n:03d}" for n in range(1, 6)]
+
+
+@pytest.mark.parametrize("offset", [-1, "2", None])
+def test_bad_offset_cursor_is_rejected(offset):
+    repository = catalog_repository(FakeVideoSource([make_video(1)]))
+
+    with pytest.raises(ValueError):
+        repository.list_videos_page(q="title", cursor=encode_cursor({"offset": offset}))
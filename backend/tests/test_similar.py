@@ -0,0 +1,151 @@
+"""
+Test script for the AI stats similarity index and the similar-videos endpoint.
+
+The index is fed plain rows and the endpoint is served from an in-memory
+catalog, so no AWS access is needed.
+"""
+
+import pytest
+from db.similar import COSINE, EUCLIDEAN, SimilarityIndex
+from fakes import FakeVideoSource, api_client, catalog_repository, make_video
+
+VIDEOS = [
+    make_video(1, ["A"], (80, 20, 80, 20, 80), is_cover=True),
+    # Closest by distance; shares singer A and is an original
+    make_video(2, ["A"], (78, 20, 80, 20, 80), is_cover=False),
+    make_video(3, ["B"], (80, 20, 80, 20, 70), is_cover=True),
+    # Same direction as v001 (cosine 1) but far away
+    make_video(4, ["C"], (40, 10, 40, 10, 40), is_cover=True),
+    make_video(5, ["D"], (10, 90, 10, 90, 10), is_cover=False),
+    make_video(6, ["A"]),
+]
+
+
+def _index(videos=VIDEOS):
+    index = SimilarityIndex()
+    index.sync(video.model_dump() for video in videos)
+    return index
+
+
+def _ids(matches):
+    return [video_id for video_id, _ in matches]
+
+
+def test_cosine_ranks_by_direction():
+    matches = _index().similar("v001", k=10, metric=COSINE)
+
+    assert _ids(matches) == ["v004", "v002", "v003", "v005"]
+    assert matches[0][1] == pytest.approx(1.0)
+    assert all(a[1] >= b[1] for a, b in zip(matches, matches[1:]))
+
+
+def test_euclidean_ranks_by_distance():
+    matches = _index().similar("v001", k=10, metric=EUCLIDEAN)
+
+    assert _ids(matches) == ["v002", "v003", "v004", "v005"]
+    # Scores are negated distances
+    assert matches[0][1] == pytest.approx(-2.0)
+    assert matches[1][1] == pytest.approx(-10.0)
+
+
+def test_k_limits_the_matches():
+    assert _ids(_index().similar("v001", k=2, metric=EUCLIDEAN)) == ["v002", "v003"]
+
+
+def test_filters():
+    index = _index()
+
+    assert _ids(index.similar("v001", 10, exclude_same_singer=True)) == [
+        "v004",
+        "v003",
+        "v005",
+    ]
+    assert _ids(index.similar("v001", 10, covers_only=True)) == ["v004", "v003"]
+    assert _ids(index.similar("v001", 10, EUCLIDEAN, True, True)) == ["v003", "v004"]
+
+
+def test_videos_without_stats():
+    index = _index()
+
+    assert index.similar("v006", 10) is None
+    assert index.similar("v404", 10) is None
+    assert len(index) == 5
+    with pytest.raises(ValueError):
+        index.similar("v001", 10, metric="manhattan")
+
+
+def test_sync_rewrites_changed_rows_and_reuses_removed_ones():
+    index = _index()
+    rows = dict(index._rows)
+
+    changed = make_video(5, ["D"], (80, 20, 80, 20, 79), is_cover=False)
+    added = make_video(7, ["E"], (0, 0, 0, 0, 100))
+    index.sync(video.model_dump() for video in [*VIDEOS[:3], changed, added])
+
+    assert _ids(index.similar("v001", 10, EUCLIDEAN)) == [
+        "v005",
+        "v002",
+        "v003",
+        "v007",
+    ]
+    # Rewritten videos keep their rows; v004's is freed for the next addition
+    assert all(index._rows[video_id] == rows[video_id] for video_id in ("v001", "v005"))
+    index.sync(
+        video.model_dump()
+        for video in [*VIDEOS[:3], changed, added, make_video(8, stats=(1, 1, 1, 1, 1))]
+    )
+    assert index._rows["v008"] == rows["v004"]
+    assert len(index) == 6
+    # Singers of removed videos no longer filter anything
+    assert "c" not in index._singer_rows
+
+
+def test_copies_are_independent():
+    index = _index()
+    copy = index.copy()
+
+    copy.sync(video.model_dump() for video in VIDEOS[:2])
+
+    assert _ids(copy.similar("v001", 10)) == ["v002"]
+    assert _ids(index.similar("v001", 10, EUCLIDEAN)) == [
+        "v002",
+        "v003",
+        "v004",
+        "v005",
+    ]
+
+
+def test_endpoint(monkeypatch):
+    repository = catalog_repository(FakeVideoSource(VIDEOS))
+
+    with api_client(monkeypatch, repository) as client:
+        response = client.get(
+            "/videos/v001/similar", params={"k": 2, "metric": "euclidean"}
+        )
+        assert response.status_code == 200
+        assert [video["video_id"] for video in response.json()] == ["v002", "v003"]
+
+        response = client.get(
+            "/videos/v001/similar",
+            params={"exclude_same_singer": True, "covers_only": True},
+        )
+        assert [video["video_id"] for video in response.json()] == ["v004", "v003"]
+
+        # In the catalog but without stats
+        assert client.get("/videos/v006/similar").json() == []
+
+
+def test_endpoint_errors(monkeypatch):
+    repository = catalog_repository(FakeVideoSource(VIDEOS))
+
+    with api_client(monkeypatch, repository) as client:
+        assert client.get("/videos/v404/similar").status_code == 404
+        for params in ({"metric": "manhattan"}, {"k": 0}, {"k": 101}):
+            response = client.get("/videos/v001/similar", params=params)
+            assert response.status_code == 422
+
+
+def test_endpoint_needs_the_catalog_snapshot(monkeypatch):
+    # Without the snapshot the app serves the DynamoDB repository directly
+    with api_client(monkeypatch, FakeVideoSource(VIDEOS)) as client:
+        assert client.get("/videos/v001/similar").status_code == 501
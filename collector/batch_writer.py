@@ -0,0 +1,278 @@
+"""
+Buffered DynamoDB writer.
+
+Collects put and delete requests per table and sends them with
+BatchWriteItem (25 requests per call), retrying UnprocessedItems with
+jittered exponential backoff. Partial updates, which BatchWriteItem can't
+express, go through PartiQL BatchExecuteStatement (also 25 per call).
+
+Batches are taken from the buffer under a lock but sent outside it, one
+sender at a time so they land in the order they were taken. Requests that
+stay unprocessed are reported by the next flush, whichever thread queued
+them.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import boto3
+
+# BatchWriteItem accepts at most 25 requests per call
+MAX_BATCH_SIZE = 25
+
+# BatchExecuteStatement accepts at most 25 statements per call
+MAX_STATEMENTS = 25
+
+# Per-statement BatchExecuteStatement errors that are worth retrying
+RETRYABLE_STATEMENT_ERRORS = {
+    "InternalServerError",
+    "ProvisionedThroughputExceeded",
+    "RequestLimitExceeded",
+    "ThrottlingError",
+    "TransactionConflict",
+}
+
+# Primary key attributes of each table kind, used to de-duplicate requests
+VIDEOS_KEY = ("channel_id", "video_id")
+SINGER_VIDEOS_KEY = ("singer_key", "sort_key")
+
+
+class BatchWriteError(Exception):
+    """Raised when requests stay unprocessed after all retries."""
+
+
+class BatchWriter:
+    """Buffers puts and deletes per table and flushes them in batches."""
+
+    def __init__(
+        self,
+        client,
+        max_attempts: int = 8,
+        base_delay: float = 0.05,
+        max_delay: float = 2.0,
+    ):
+        self._client = client
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        # table -> {primary key: write request}; a later request for the same
+        # key replaces the earlier one (BatchWriteItem rejects duplicate keys)
+        self._pending: Dict[str, Dict[Tuple, Dict[str, Any]]] = {}
+        # Full batches taken from _pending, waiting for the sender
+        self._ready: Deque[Dict[str, List[Dict]]] = deque()
+        # Set while a thread sends the ready batches; waited on by flushes
+        self._sending = False
+        # Requests left unprocessed since the last flush
+        self._failed = 0
+        # Repositories share one writer across pipeline worker threads
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+
+        self.items_written = 0
+        self.requests_sent = 0
+
+    @classmethod
+    def from_settings(cls, settings) -> "BatchWriter":
+        """Create a writer from collector settings."""
+        client = boto3.client("dynamodb", region_name=settings.aws_region)
+        return cls(client)
+
+    @property
+    def writes_saved(self) -> int:
+        """Round trips avoided compared to one request per item."""
+        return self.items_written - self.requests_sent
+
+    def put(self, table_name: str, item: Dict[str, Any], key: Tuple[str, ...]) -> None:
+        """
+        Queue a PutRequest.
+
+        Args:
+          table_name: Target table
+          item: Item in DynamoDB wire format
+          key: Names of the table's primary key attributes
+        """
+        self._queue(
+            table_name,
+            tuple(item[attr]["S"] for attr in key),
+            {"PutRequest": {"Item": item}},
+        )
+
+    def delete(
+        self, table_name: str, key_item: Dict[str, Any], key: Tuple[str, ...]
+    ) -> None:
+        """
+        Queue a DeleteRequest.
+
+        Args:
+          table_name: Target table
+          key_item: Primary key in DynamoDB wire format
+          key: Names of the table's primary key attributes
+        """
+        self._queue(
+            table_name,
+            tuple(key_item[attr]["S"] for attr in key),
+            {"DeleteRequest": {"Key": key_item}},
+        )
+
+    def flush(self) -> None:
+        """
+        Send every pending request.
+
+        Raises:
+          BatchWriteError: If requests stayed unprocessed, in this flush or
+            in a batch sent automatically since the last one
+        """
+        self._flush()
+
+    def flush_table(self, table_name: str) -> None:
+        """
+        Send pending requests for one table (e.g. before reading it back).
+
+        Raises:
+          BatchWriteError: As for flush
+        """
+        self._flush(table_name)
+
+    def execute_statements(
+        self, statements: List[Dict[str, Any]]
+    ) -> List[Optional[str]]:
+        """
+        Run PartiQL write statements with BatchExecuteStatement.
+
+        Statements are sent 25 per call; ones failing with a retryable error
+        (throttling, transaction conflicts) are retried with backoff. They
+        bypass the put/delete buffer, so flush first if both touch the same
+        items.
+
+        Args:
+          statements: {"Statement": ..., "Parameters": [...]} dicts
+
+        Returns:
+          Error code per statement (None on success), in input order, e.g.
+          "ConditionalCheckFailed" for an UPDATE of a missing item
+        """
+        errors: List[Optional[str]] = [None] * len(statements)
+
+        for start in range(0, len(statements), MAX_STATEMENTS):
+            pending = list(range(start, min(start + MAX_STATEMENTS, len(statements))))
+            with self._lock:
+                self.items_written += len(pending)
+
+            for attempt in range(self._max_attempts):
+                if attempt:
+                    # Exponential backoff with full jitter
+                    delay = min(self._max_delay, self._base_delay * 2**attempt)
+                    time.sleep(random.uniform(0, delay))
+
+                response = self._client.batch_execute_statement(
+                    Statements=[statements[index] for index in pending]
+                )
+                with self._lock:
+                    self.requests_sent += 1
+
+                retry = []
+                for index, result in zip(pending, response["Responses"]):
+                    code = result.get("Error", {}).get("Code")
+                    errors[index] = code
+                    if code in RETRYABLE_STATEMENT_ERRORS:
+                        retry.append(index)
+                pending = retry
+                if not pending:
+                    break
+
+        return errors
+
+    def _queue(self, table_name: str, key: Tuple, request: Dict[str, Any]) -> None:
+        with self._lock:
+            table = self._pending.setdefault(table_name, {})
+            # Re-insert so the request keeps its position relative to later ones
+            table.pop(key, None)
+            table[key] = request
+
+            pending = sum(len(requests) for requests in self._pending.values())
+            if pending >= MAX_BATCH_SIZE:
+                self._ready.append(self._take(MAX_BATCH_SIZE))
+            if not self._ready or self._sending:
+                return
+            self._sending = True
+        self._send_ready()
+
+    def _flush(self, table_name: str = "") -> None:
+        with self._lock:
+            while self._sending:
+                self._idle.wait()
+            while self._pending.get(table_name) if table_name else self._pending:
+                self._ready.append(self._take(MAX_BATCH_SIZE, table_name))
+            self._sending = True
+        self._send_ready()
+
+        with self._lock:
+            failed, self._failed = self._failed, 0
+        if failed:
+            raise BatchWriteError(
+                f"{failed} write requests still unprocessed after "
+                f"{self._max_attempts} attempts"
+            )
+
+    def _send_ready(self) -> None:
+        """Send ready batches in order; the caller must have set _sending."""
+        try:
+            while True:
+                with self._lock:
+                    if not self._ready:
+                        self._sending = False
+                        self._idle.notify_all()
+                        return
+                    batch = self._ready.popleft()
+                # Other threads keep queueing while the batch is in flight
+                self._send_batch(batch)
+        except BaseException:
+            with self._lock:
+                self._sending = False
+                self._idle.notify_all()
+            raise
+
+    def _take(self, count: int, table_name: str = "") -> Dict[str, List[Dict]]:
+        """Remove up to `count` pending requests, grouped by table."""
+        batch: Dict[str, List[Dict]] = {}
+        tables = [table_name] if table_name else list(self._pending)
+
+        for name in tables:
+            requests = self._pending.get(name, {})
+            while requests and count > 0:
+                key = next(iter(requests))
+                batch.setdefault(name, []).append(requests.pop(key))
+                count -= 1
+            if not requests:
+                self._pending.pop(name, None)
+            if count == 0:
+                break
+
+        return batch
+
+    def _send_batch(self, request_items: Dict[str, List[Dict]]) -> None:
+        with self._lock:
+            self.items_written += sum(
+                len(requests) for requests in request_items.values()
+            )
+
+        for attempt in range(self._max_attempts):
+            if attempt:
+                # Exponential backoff with full jitter
+                delay = min(self._max_delay, self._base_delay * 2**attempt)
+                time.sleep(random.uniform(0, delay))
+
+            response = self._client.batch_write_item(RequestItems=request_items)
+            with self._lock:
+                self.requests_sent += 1
+
+            request_items = response.get("UnprocessedItems") or {}
+            if not request_items:
+                return
+
+        # Reported by the next flush
+        with self._lock:
+            self._failed += sum(len(requests) for requests in request_items.values())
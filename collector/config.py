@@ -1,3 +1,5 @@
+import os
+import tempfile
 from functools import lru_cache
 from typing import List
 
@@ -17,6 +19,65 @@ class CollectorSettings(BaseSettings):
     dynamodb_table_singer_videos: str = Field(
         "vsxp-singer-videos", alias="SINGER_VIDEOS_TABLE_NAME"
     )
+    dynamodb_table_singer_summaries: str = Field(
+        "vsxp-singer-summaries", alias="SINGER_SUMMARIES_TABLE_NAME"
+    )
+    # Scheduled runs: only list uploads newer than each channel's high-water mark
+    incremental_crawl: bool = Field(False, alias="INCREMENTAL_CRAWL")
+    # Seconds between catalog version bumps while writes go on (the backend's
+    # ETags and snapshot reloads follow the version)
+    catalog_version_interval_seconds: float = Field(
+        30.0, alias="CATALOG_VERSION_INTERVAL_SECONDS", ge=0
+    )
+    # Channels collected at the same time by run_once and the Lambda handler
+    channel_concurrency: int = Field(3, alias="CHANNEL_CONCURRENCY", ge=1)
+    # Lambda: stop channel work this long before the timeout, leaving time for
+    # in-flight calls and the final flush; unfinished channels are continued
+    lambda_time_reserve_seconds: float = Field(
+        200.0, alias="LAMBDA_TIME_RESERVE_SECONDS", ge=0
+    )
+    # Lambda: invoke itself asynchronously with the continuation payload
+    self_reinvoke: bool = Field(False, alias="SELF_REINVOKE")
+    max_continuations: int = Field(10, alias="MAX_CONTINUATIONS", ge=0)
+    # Enrichment pipeline: worker threads per stage
+    pipeline_workers: int = Field(4, alias="PIPELINE_WORKERS", ge=1)
+    # Rate control ceilings; throttled calls back off below them and recover
+    gemini_requests_per_second: float = Field(
+        1.0, alias="GEMINI_REQUESTS_PER_SECOND", gt=0
+    )
+    gemini_burst: int = Field(4, alias="GEMINI_BURST", ge=1)
+    gemini_max_concurrency: int = Field(8, alias="GEMINI_MAX_CONCURRENCY", ge=1)
+    youtube_requests_per_second: float = Field(
+        5.0, alias="YOUTUBE_REQUESTS_PER_SECOND", gt=0
+    )
+    youtube_burst: int = Field(10, alias="YOUTUBE_BURST", ge=1)
+    youtube_max_concurrency: int = Field(8, alias="YOUTUBE_MAX_CONCURRENCY", ge=1)
+    # YouTube HTTP session: pooled keep-alive connections and timeouts
+    youtube_pool_size: int = Field(16, alias="YOUTUBE_POOL_SIZE", ge=1)
+    youtube_connect_timeout: float = Field(5.0, alias="YOUTUBE_CONNECT_TIMEOUT", gt=0)
+    youtube_read_timeout: float = Field(30.0, alias="YOUTUBE_READ_TIMEOUT", gt=0)
+    # Retries of throttled/transient failures (exponential backoff, full jitter)
+    api_max_attempts: int = Field(5, alias="API_MAX_ATTEMPTS", ge=1)
+    api_retry_base_delay: float = Field(1.0, alias="API_RETRY_BASE_DELAY", ge=0)
+    # Local pre-classifier: settle confident video types without Gemini
+    preclassifier_enabled: bool = Field(True, alias="PRECLASSIFIER_ENABLED")
+    preclassifier_confidence: float = Field(
+        0.9, alias="PRECLASSIFIER_CONFIDENCE", ge=0, le=1
+    )
+    # Gemini response cache: "sqlite", "dynamodb" (for Lambda) or "none"
+    gemini_cache_backend: str = Field("sqlite", alias="GEMINI_CACHE_BACKEND")
+    # Under the temp directory: Lambda's working directory is read-only
+    gemini_cache_path: str = Field(
+        os.path.join(tempfile.gettempdir(), "vsxp-gemini-cache.sqlite3"),
+        alias="GEMINI_CACHE_PATH",
+    )
+    gemini_cache_ttl_seconds: int = Field(
+        60 * 60 * 24 * 30, alias="GEMINI_CACHE_TTL_SECONDS", ge=0
+    )
+    gemini_cache_max_entries: int = Field(50000, alias="GEMINI_CACHE_MAX_ENTRIES", ge=0)
+    dynamodb_table_gemini_cache: str = Field(
+        "vsxp-gemini-cache", alias="GEMINI_CACHE_TABLE_NAME"
+    )
 
     model_config = SettingsConfigDict(
         env_file=".env",
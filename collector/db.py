@@ -1,8 +1,48 @@
-from typing import Any, Dict, List, Optional, Set
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import boto3
+from batch_writer import SINGER_VIDEOS_KEY, VIDEOS_KEY, BatchWriter
+from item_codec import SINGER_VIDEO_ITEM, VIDEO_ITEM
 from youtube_client import YouTubeVideo
 
+# Enrichment states of a video:
+#   pending -> classified -> song_extracted -> analyzed
+# Non-SONG videos are done once classified. Any step can move to failed.
+ENRICHMENT_PENDING = "pending"
+ENRICHMENT_CLASSIFIED = "classified"
+ENRICHMENT_SONG_EXTRACTED = "song_extracted"
+ENRICHMENT_ANALYZED = "analyzed"
+ENRICHMENT_FAILED = "failed"
+
+# Failed videos are retried until they have failed this many times
+MAX_ENRICHMENT_ATTEMPTS = 3
+
+# Sparse GSI over videos with enrichment work left. `enrichment_queue` holds
+# the channel ID while the video is unfinished and is removed when it's done.
+ENRICHMENT_INDEX = "GSI_ENRICHMENT_QUEUE"
+
+# Sort key of the per-channel metadata record in the videos table
+CHANNEL_INFO = "CHANNEL_INFO"
+
+# Sentinel videos-table record holding the catalog version counter
+CATALOG_VERSION_KEY = {
+    "channel_id": {"S": "CATALOG"},
+    "video_id": {"S": "CATALOG_VERSION"},
+}
+
+# BatchGetItem limits and retry of unprocessed keys
+BATCH_GET_MAX_KEYS = 100
+BATCH_GET_MAX_ATTEMPTS = 5
+
+# Count attributes refreshed from the YouTube statistics part
+STATISTICS_FIELDS = ("view_count", "like_count", "comment_count")
+
 
 class VideoRecord:
     """Simple video record for enrichment."""
@@ -21,6 +61,9 @@ class VideoRecord:
         like_count: int = 0,
         comment_count: int = 0,
         channel_title: str = "",
+        video_type: str = "",
+        enrichment_state: str = "",
+        enrichment_attempts: int = 0,
     ):
         self.video_id = video_id
         self.video_title = video_title
@@ -34,20 +77,199 @@ class VideoRecord:
         self.like_count = like_count
         self.comment_count = comment_count
         self.channel_title = channel_title
+        self.video_type = video_type
+        self.enrichment_state = enrichment_state
+        self.enrichment_attempts = enrichment_attempts
+
+    @classmethod
+    def from_item(cls, item: Dict[str, Any]) -> "VideoRecord":
+        """Build a record from a videos table item."""
+        return cls(**_RECORD_ITEM.decode(item))
+
+    @classmethod
+    def from_items(cls, items: List[Dict[str, Any]]) -> List["VideoRecord"]:
+        """Build records from a page of videos table items."""
+        return [cls(**values) for values in _RECORD_ITEM.decode_many(items)]
+
+
+# Videos table attributes read into a VideoRecord
+_RECORD_ITEM = VIDEO_ITEM.project(
+    "video_id",
+    "video_title",
+    "channel_id",
+    "description",
+    "duration",
+    "published_at",
+    "song_title",
+    "game_title",
+    "video_type",
+    "enrichment_state",
+    "enrichment_attempts",
+)
+
+
+class CatalogVersion:
+    """
+    Version counter of the served catalog, on a sentinel videos-table record.
+
+    Repositories touch it after each write the backend serves has landed.
+    The version is bumped at most once per `publish_interval` seconds while
+    writes go on, and once more by publish() at the end of a run, so a
+    reader that sees a version also sees every write made before it. The
+    backend derives ETags from it and skips catalog reloads while it is
+    unchanged.
+    """
+
+    def __init__(self, client, table_name: str, publish_interval: float = 30.0):
+        self._client = client
+        self._table_name = table_name
+        self.publish_interval = publish_interval
+        self._changed = False
+        self._published_at = float("-inf")
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings) -> "CatalogVersion":
+        """The process-wide counter of the configured videos table."""
+        return _shared_catalog_version(
+            settings.aws_region,
+            settings.dynamodb_table_videos,
+            settings.catalog_version_interval_seconds,
+        )
+
+    def touch(self) -> None:
+        """Record a landed write; publish if the last bump is old enough."""
+        with self._lock:
+            self._changed = True
+            due = time.monotonic() - self._published_at >= self.publish_interval
+        if due:
+            self.publish()
+
+    def publish(self) -> Optional[int]:
+        """
+        Bump the version if anything changed since the last bump.
+
+        A failed bump is logged and retried by the next publish; the writes
+        themselves already succeeded.
+
+        Returns:
+          The new version, or None if nothing changed or the bump failed
+        """
+        with self._lock:
+            if not self._changed:
+                return None
+            self._changed = False
+            self._published_at = time.monotonic()
+
+        try:
+            response = self._client.update_item(
+                TableName=self._table_name,
+                Key=CATALOG_VERSION_KEY,
+                UpdateExpression="ADD version :one SET updated_at = :now",
+                ExpressionAttributeValues={
+                    ":one": {"N": "1"},
+                    ":now": {"S": datetime.now(timezone.utc).isoformat()},
+                },
+                ReturnValues="UPDATED_NEW",
+            )
+        except Exception as e:
+            print(f"  ✗ Catalog version bump failed: {e}", file=sys.stderr)
+            with self._lock:
+                self._changed = True
+            return None
+        return int(response["Attributes"]["version"]["N"])
+
+
+@lru_cache
+def _shared_catalog_version(
+    region: str, table_name: str, publish_interval: float
+) -> CatalogVersion:
+    client = boto3.client("dynamodb", region_name=region)
+    return CatalogVersion(client, table_name, publish_interval)
+
+
+def _batch_get_items(
+    client,
+    table_name: str,
+    keys: List[Dict[str, Any]],
+    projection: str,
+    consistent_read: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Read the stored items among `keys` with BatchGetItem.
+
+    Keys are sent BATCH_GET_MAX_KEYS at a time; unprocessed keys are retried
+    with backoff.
+
+    Raises:
+      RuntimeError: Keys were still unprocessed after retrying
+    """
+    items: List[Dict[str, Any]] = []
+
+    for start in range(0, len(keys), BATCH_GET_MAX_KEYS):
+        request_items: Dict[str, Any] = {
+            table_name: {
+                "Keys": keys[start : start + BATCH_GET_MAX_KEYS],
+                "ProjectionExpression": projection,
+                "ConsistentRead": consistent_read,
+            }
+        }
+
+        for attempt in range(BATCH_GET_MAX_ATTEMPTS):
+            if attempt:
+                # Exponential backoff with full jitter
+                time.sleep(random.uniform(0, min(2.0, 0.05 * 2**attempt)))
+
+            response = client.batch_get_item(RequestItems=request_items)
+            items += response.get("Responses", {}).get(table_name, [])
+
+            request_items = response.get("UnprocessedKeys") or {}
+            if not request_items:
+                break
+        else:
+            raise RuntimeError(
+                f"BatchGetItem left keys unprocessed after "
+                f"{BATCH_GET_MAX_ATTEMPTS} attempts"
+            )
+
+    return items
 
 
 class VideoRepository:
     """Repository for managing videos in DynamoDB."""
 
-    def __init__(self, client, table_name: str):
+    def __init__(
+        self,
+        client,
+        table_name: str,
+        writer: Optional[BatchWriter] = None,
+        catalog_version: Optional[CatalogVersion] = None,
+    ):
         self._client = client
         self._table_name = table_name
+        self._writer = writer or BatchWriter(client)
+        self._catalog_version = catalog_version
 
     @classmethod
-    def from_settings(cls, settings) -> "VideoRepository":
+    def from_settings(
+        cls, settings, writer: Optional[BatchWriter] = None
+    ) -> "VideoRepository":
         """Create repository from collector settings."""
         client = boto3.client("dynamodb", region_name=settings.aws_region)
-        return cls(client, settings.dynamodb_table_videos)
+        return cls(
+            client,
+            settings.dynamodb_table_videos,
+            writer,
+            CatalogVersion.from_settings(settings),
+        )
+
+    def _catalog_changed(self) -> None:
+        if self._catalog_version is not None:
+            self._catalog_version.touch()
+
+    def flush(self) -> None:
+        """Send buffered writes for the videos table."""
+        self._writer.flush_table(self._table_name)
 
     def list_existing_video_ids(self, channel_id: str) -> Set[str]:
         """
@@ -81,6 +303,31 @@ class VideoRepository:
 
         return video_ids
 
+    def existing_video_ids(self, channel_id: str, video_ids: List[str]) -> Set[str]:
+        """
+        Check which of the given videos are stored, with BatchGetItem.
+
+        Args:
+          channel_id: YouTube channel ID
+          video_ids: Video IDs to look up
+
+        Returns:
+          The stored subset of `video_ids`
+
+        Raises:
+          RuntimeError: Keys were still unprocessed after retrying
+        """
+        items = _batch_get_items(
+            self._client,
+            self._table_name,
+            [
+                {"channel_id": {"S": channel_id}, "video_id": {"S": video_id}}
+                for video_id in video_ids
+            ],
+            "video_id",
+        )
+        return {item["video_id"]["S"] for item in items}
+
     def upsert_video(self, video: YouTubeVideo) -> None:
         """
         Insert or update a video record in DynamoDB.
@@ -92,34 +339,31 @@ class VideoRepository:
         if video.duration == 0:
             return
 
-        item: Dict[str, Any] = {
-            "channel_id": {"S": video.channel_id},
-            "video_id": {"S": video.video_id},
-            "video_title": {"S": video.title},
-            "description": {"S": video.description},
-            "duration": {"N": str(video.duration)},
-            "published_at": {"S": video.published_at},
-            "view_count": {"N": str(video.view_count)},
-            "like_count": {"N": str(video.like_count)},
-            "comment_count": {"N": str(video.comment_count)},
-            "channel_title": {"S": video.channel_title},
-        }
-
-        # Add thumbnail URL if available
-        if video.thumbnail_url:
-            item["thumbnail_url"] = {"S": video.thumbnail_url}
-
-        self._client.put_item(TableName=self._table_name, Item=item)
+        self._client.put_item(TableName=self._table_name, Item=_video_item(video))
+        self._catalog_changed()
 
-    def batch_upsert_videos(self, videos: List[YouTubeVideo]) -> None:
+    def batch_upsert_videos(self, videos: List[YouTubeVideo]) -> List[VideoRecord]:
         """
-        Batch insert/update multiple videos.
+        Batch insert/update multiple videos with BatchWriteItem.
 
         Args:
           videos: List of YouTubeVideo objects
+
+        Returns:
+          Records of the stored videos, as get_video would read them back
         """
+        records = []
         for video in videos:
-            self.upsert_video(video)
+            # Skip live streams (duration == 0)
+            if video.duration == 0:
+                continue
+            item = _video_item(video)
+            self._writer.put(self._table_name, item, VIDEOS_KEY)
+            records.append(VideoRecord.from_item(item))
+
+        self.flush()
+        self._catalog_changed()
+        return records
 
     def upsert_channel_info(
         self,
@@ -131,21 +375,85 @@ class VideoRepository:
         """
         Store channel metadata (name, icon URL, and subscriber count).
 
+        Updates the attributes in place so the crawl high-water mark kept on
+        the same record survives.
+
         Args:
           channel_id: YouTube channel ID
           channel_name: Channel name
           channel_icon_url: Channel icon/avatar URL
           subscriber_count: Number of subscribers
         """
-        item: Dict[str, Any] = {
-            "channel_id": {"S": channel_id},
-            "video_id": {"S": "CHANNEL_INFO"},
-            "channel_name": {"S": channel_name},
-            "channel_icon_url": {"S": channel_icon_url},
-            "subscriber_count": {"N": str(subscriber_count)},
-        }
+        self._client.update_item(
+            TableName=self._table_name,
+            Key={"channel_id": {"S": channel_id}, "video_id": {"S": CHANNEL_INFO}},
+            UpdateExpression=(
+                "SET channel_name = :channel_name, "
+                "channel_icon_url = :channel_icon_url, "
+                "subscriber_count = :subscriber_count"
+            ),
+            ExpressionAttributeValues={
+                ":channel_name": {"S": channel_name},
+                ":channel_icon_url": {"S": channel_icon_url},
+                ":subscriber_count": {"N": str(subscriber_count)},
+            },
+        )
+        self._catalog_changed()
 
-        self._client.put_item(TableName=self._table_name, Item=item)
+    def get_high_water_mark(self, channel_id: str) -> Optional[Tuple[str, str]]:
+        """
+        Read the newest upload recorded by a completed crawl of the channel.
+
+        Returns:
+          (published_at, video_id), or None if no crawl has completed yet
+        """
+        response = self._client.get_item(
+            TableName=self._table_name,
+            Key={"channel_id": {"S": channel_id}, "video_id": {"S": CHANNEL_INFO}},
+            ProjectionExpression="latest_published_at, latest_video_id",
+        )
+        item = response.get("Item", {})
+        if "latest_published_at" not in item or "latest_video_id" not in item:
+            return None
+        return item["latest_published_at"]["S"], item["latest_video_id"]["S"]
+
+    def advance_high_water_mark(
+        self, channel_id: str, published_at: str, video_id: str
+    ) -> None:
+        """
+        Record the newest upload of a completed crawl.
+
+        The mark only moves forward, so an older concurrent crawl can't
+        rewind it.
+
+        Args:
+          channel_id: YouTube channel ID
+          published_at: Publish time of the newest upload (ISO 8601, UTC)
+          video_id: Its video ID
+        """
+        try:
+            self._client.update_item(
+                TableName=self._table_name,
+                Key={
+                    "channel_id": {"S": channel_id},
+                    "video_id": {"S": CHANNEL_INFO},
+                },
+                UpdateExpression=(
+                    "SET latest_published_at = :published_at, "
+                    "latest_video_id = :video_id"
+                ),
+                ConditionExpression=(
+                    "attribute_not_exists(latest_published_at) "
+                    "OR latest_published_at <= :published_at"
+                ),
+                ExpressionAttributeValues={
+                    ":published_at": {"S": published_at},
+                    ":video_id": {"S": video_id},
+                },
+            )
+        except self._client.exceptions.ConditionalCheckFailedException:
+            # A newer upload is already recorded
+            pass
 
     def get_video(self, channel_id: str, video_id: str) -> Optional[VideoRecord]:
         """
@@ -167,16 +475,7 @@ class VideoRepository:
         if not item:
             return None
 
-        return VideoRecord(
-            video_id=item["video_id"]["S"],
-            video_title=item["video_title"]["S"],
-            channel_id=item.get("channel_id", {}).get("S", ""),
-            description=item.get("description", {}).get("S", ""),
-            duration=int(item["duration"]["N"]) if "duration" in item else None,
-            published_at=item.get("published_at", {}).get("S", ""),
-            song_title=item.get("song_title", {}).get("S", ""),
-            game_title=item.get("game_title", {}).get("S", ""),
-        )
+        return VideoRecord.from_item(item)
 
     def list_videos_by_channel(self, channel_id: str) -> List[VideoRecord]:
         """
@@ -196,23 +495,57 @@ class VideoRepository:
             "ExpressionAttributeValues": {":channel_id": {"S": channel_id}},
         }
 
+        while True:
+            response = self._client.query(**query_kwargs)
+
+            videos.extend(VideoRecord.from_items(response.get("Items", [])))
+
+            if "LastEvaluatedKey" in response:
+                query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+            else:
+                break
+
+        return videos
+
+    def list_statistics_targets(self, channel_id: str) -> List[Dict[str, Any]]:
+        """
+        List a channel's videos for a statistics refresh, newest first.
+
+        Only the attributes needed to address the videos table and
+        singer-videos index records are read.
+
+        Args:
+          channel_id: YouTube channel ID
+
+        Returns:
+          Dicts with "video_id", "published_at" and "singers" (empty for
+          videos without index records)
+        """
+        targets: List[Dict[str, Any]] = []
+
+        query_kwargs = {
+            "TableName": self._table_name,
+            "KeyConditionExpression": "channel_id = :channel_id",
+            "ExpressionAttributeValues": {":channel_id": {"S": channel_id}},
+            "ProjectionExpression": "video_id, published_at, singers",
+        }
+
         while True:
             response = self._client.query(**query_kwargs)
 
             for item in response.get("Items", []):
-                videos.append(
-                    VideoRecord(
-                        video_id=item["video_id"]["S"],
-                        video_title=item["video_title"]["S"],
-                        channel_id=item.get("channel_id", {}).get("S", ""),
-                        description=item.get("description", {}).get("S", ""),
-                        duration=(
-                            int(item["duration"]["N"]) if "duration" in item else None
-                        ),
-                        published_at=item.get("published_at", {}).get("S", ""),
-                        song_title=item.get("song_title", {}).get("S", ""),
-                        game_title=item.get("game_title", {}).get("S", ""),
-                    )
+                video_id = item["video_id"]["S"]
+                if video_id == CHANNEL_INFO:
+                    continue
+                targets.append(
+                    {
+                        "video_id": video_id,
+                        "published_at": item.get("published_at", {}).get("S", ""),
+                        "singers": [
+                            singer["S"]
+                            for singer in item.get("singers", {}).get("L", [])
+                        ],
+                    }
                 )
 
             if "LastEvaluatedKey" in response:
@@ -220,8 +553,174 @@ class VideoRepository:
             else:
                 break
 
+        # Recent uploads' counts change fastest
+        targets.sort(key=lambda target: target["published_at"], reverse=True)
+        return targets
+
+    def update_statistics(
+        self, channel_id: str, statistics: Dict[str, Dict[str, int]]
+    ) -> int:
+        """
+        Write refreshed counts, leaving every other attribute untouched.
+
+        Args:
+          channel_id: YouTube channel ID
+          statistics: video_id -> {"view_count", "like_count", "comment_count"}
+
+        Returns:
+          Number of videos updated
+        """
+        refreshed_at = datetime.now(timezone.utc).isoformat()
+        statements = [
+            {
+                "Statement": f'UPDATE "{self._table_name}" '
+                + _set_statistics_clause()
+                + " SET stats_updated_at = ?"
+                " WHERE channel_id = ? AND video_id = ?",
+                "Parameters": _statistics_parameters(counts)
+                + [{"S": refreshed_at}, {"S": channel_id}, {"S": video_id}],
+            }
+            for video_id, counts in statistics.items()
+        ]
+        errors = self._writer.execute_statements(statements)
+        if None in errors:
+            self._catalog_changed()
+        return errors.count(None)
+
+    def count_video_types(self, channel_id: str) -> Dict[str, int]:
+        """
+        Count the stored video types of a channel.
+
+        Args:
+          channel_id: YouTube channel ID
+
+        Returns:
+          Dict of video_type -> number of videos
+        """
+        counts: Dict[str, int] = {}
+
+        query_kwargs = {
+            "TableName": self._table_name,
+            "KeyConditionExpression": "channel_id = :channel_id",
+            "FilterExpression": "attribute_exists(video_type)",
+            "ExpressionAttributeValues": {":channel_id": {"S": channel_id}},
+            "ProjectionExpression": "video_type",
+        }
+
+        while True:
+            response = self._client.query(**query_kwargs)
+
+            for item in response.get("Items", []):
+                video_type = item["video_type"]["S"]
+                counts[video_type] = counts.get(video_type, 0) + 1
+
+            if "LastEvaluatedKey" in response:
+                query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+            else:
+                break
+
+        return counts
+
+    def list_pending_videos(self, channel_id: str, limit: int = 0) -> List[VideoRecord]:
+        """
+        List videos of a channel that still need enrichment.
+
+        Reads the sparse enrichment GSI, so finished videos are never read.
+
+        Args:
+          channel_id: YouTube channel ID
+          limit: Maximum number of videos to return (0 = no limit)
+
+        Returns:
+          List of VideoRecord objects
+        """
+        videos: List[VideoRecord] = []
+
+        query_kwargs = {
+            "TableName": self._table_name,
+            "IndexName": ENRICHMENT_INDEX,
+            "KeyConditionExpression": "enrichment_queue = :channel_id",
+            "ExpressionAttributeValues": {":channel_id": {"S": channel_id}},
+        }
+        if limit > 0:
+            query_kwargs["Limit"] = limit
+
+        while True:
+            response = self._client.query(**query_kwargs)
+
+            videos.extend(VideoRecord.from_items(response.get("Items", [])))
+
+            if limit > 0 and len(videos) >= limit:
+                return videos[:limit]
+            if "LastEvaluatedKey" in response:
+                query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+            else:
+                break
+
         return videos
 
+    def mark_enrichment(
+        self,
+        channel_id: str,
+        video_id: str,
+        state: str,
+        done: bool = False,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Record the enrichment state of a video.
+
+        Args:
+          channel_id: YouTube channel ID
+          video_id: YouTube video ID
+          state: One of the ENRICHMENT_* states
+          done: Whether enrichment is finished (removes the video from the
+            enrichment GSI)
+          error: Error message, for the failed state
+        """
+        key = {"channel_id": {"S": channel_id}, "video_id": {"S": video_id}}
+        attr_values: Dict[str, Any] = {
+            ":state": {"S": state},
+            ":updated_at": {"S": datetime.now(timezone.utc).isoformat()},
+        }
+        set_parts = ["enrichment_state = :state", "enrichment_updated_at = :updated_at"]
+        remove_parts: List[str] = []
+
+        if done:
+            remove_parts += ["enrichment_queue", "enrichment_error"]
+        else:
+            set_parts.append("enrichment_queue = :channel_id")
+            attr_values[":channel_id"] = {"S": channel_id}
+
+        update_expr = ""
+        if state == ENRICHMENT_FAILED:
+            set_parts.append("enrichment_error = :error")
+            attr_values[":error"] = {"S": (error or "")[:1000]}
+            update_expr = " ADD enrichment_attempts :one"
+            attr_values[":one"] = {"N": "1"}
+
+        update_expr = "SET " + ", ".join(set_parts) + update_expr
+        if remove_parts:
+            update_expr += " REMOVE " + ", ".join(remove_parts)
+
+        response = self._client.update_item(
+            TableName=self._table_name,
+            Key=key,
+            UpdateExpression=update_expr,
+            ExpressionAttributeValues=attr_values,
+            ReturnValues="UPDATED_NEW",
+        )
+
+        if state == ENRICHMENT_FAILED:
+            attempts = int(response["Attributes"]["enrichment_attempts"]["N"])
+            if attempts >= MAX_ENRICHMENT_ATTEMPTS:
+                # Give up: drop the video from the enrichment GSI
+                self._client.update_item(
+                    TableName=self._table_name,
+                    Key=key,
+                    UpdateExpression="REMOVE enrichment_queue",
+                )
+
     def update_video_type(
         self, channel_id: str, video_id: str, video_type: str
     ) -> None:
@@ -239,6 +738,7 @@ class VideoRepository:
             UpdateExpression="SET video_type = :video_type",
             ExpressionAttributeValues={":video_type": {"S": video_type}},
         )
+        self._catalog_changed()
 
     def update_song_info(
         self,
@@ -275,7 +775,7 @@ class VideoRepository:
         attr_values = {
             ":video_type": {"S": "SONG"},
             ":song_title": {"S": song_title},
-            ":singers": {"L": [{"S": singer} for singer in singers]},
+            ":singers": VIDEO_ITEM.encode_value("singers", singers),
             ":is_cover": {"BOOL": is_cover},
         }
 
@@ -285,29 +785,13 @@ class VideoRepository:
 
         if ai_stats:
             update_expr += ", ai_stats = :ai_stats"
-            attr_values[":ai_stats"] = {
-                "M": {
-                    "cool": {"N": str(ai_stats["cool"])},
-                    "cute": {"N": str(ai_stats["cute"])},
-                    "energetic": {"N": str(ai_stats["energetic"])},
-                    "surprising": {"N": str(ai_stats["surprising"])},
-                    "emotional": {"N": str(ai_stats["emotional"])},
-                }
-            }
+            attr_values[":ai_stats"] = VIDEO_ITEM.encode_value("ai_stats", ai_stats)
 
         if comment_cloud:
             update_expr += ", comment_cloud = :comment_cloud"
-            attr_values[":comment_cloud"] = {
-                "L": [
-                    {
-                        "M": {
-                            "word": {"S": kw["word"]},
-                            "importance": {"N": str(kw["importance"])},
-                        }
-                    }
-                    for kw in comment_cloud
-                ]
-            }
+            attr_values[":comment_cloud"] = VIDEO_ITEM.encode_value(
+                "comment_cloud", comment_cloud
+            )
 
         if chorus_start_time is not None and chorus_end_time is not None:
             update_expr += ", chorus_start_time = :chorus_start_time"
@@ -321,6 +805,38 @@ class VideoRepository:
             UpdateExpression=update_expr,
             ExpressionAttributeValues=attr_values,
         )
+        self._catalog_changed()
+
+
+def _video_item(video: YouTubeVideo) -> Dict[str, Any]:
+    """Build the videos table item for a fetched video."""
+    return VIDEO_ITEM.encode(
+        {
+            "channel_id": video.channel_id,
+            "video_id": video.video_id,
+            "video_title": video.title,
+            "description": video.description,
+            "duration": video.duration,
+            "published_at": video.published_at,
+            "view_count": video.view_count,
+            "like_count": video.like_count,
+            "comment_count": video.comment_count,
+            "channel_title": video.channel_title,
+            "thumbnail_url": video.thumbnail_url or None,
+            # Newly stored videos wait for enrichment
+            "enrichment_state": ENRICHMENT_PENDING,
+            "enrichment_queue": video.channel_id,
+        }
+    )
+
+
+def _set_statistics_clause() -> str:
+    """PartiQL SET clauses for the count attributes (one SET per attribute)."""
+    return " ".join(f"SET {field} = ?" for field in STATISTICS_FIELDS)
+
+
+def _statistics_parameters(counts: Dict[str, int]) -> List[Dict[str, str]]:
+    return [{"N": str(counts.get(field, 0))} for field in STATISTICS_FIELDS]
 
 
 def normalize(text: str) -> str:
@@ -339,15 +855,53 @@ def normalize(text: str) -> str:
 class SingerVideoIndexRepository:
     """Repository for managing the singer-videos index table."""
 
-    def __init__(self, client, table_name: str):
+    def __init__(
+        self,
+        client,
+        table_name: str,
+        summaries_table_name: Optional[str] = None,
+        writer: Optional[BatchWriter] = None,
+        catalog_version: Optional[CatalogVersion] = None,
+    ):
         self._client = client
         self._table_name = table_name
+        self._summaries_table_name = summaries_table_name
+        self._writer = writer or BatchWriter(client)
+        self._catalog_version = catalog_version
 
     @classmethod
-    def from_settings(cls, settings) -> "SingerVideoIndexRepository":
+    def from_settings(
+        cls, settings, writer: Optional[BatchWriter] = None
+    ) -> "SingerVideoIndexRepository":
         """Create repository from collector settings."""
         client = boto3.client("dynamodb", region_name=settings.aws_region)
-        return cls(client, settings.dynamodb_table_singer_videos)
+        return cls(
+            client,
+            settings.dynamodb_table_singer_videos,
+            settings.dynamodb_table_singer_summaries,
+            writer,
+            CatalogVersion.from_settings(settings),
+        )
+
+    def _catalog_changed(self) -> None:
+        if self._catalog_version is not None:
+            self._catalog_version.touch()
+
+    def flush(self) -> None:
+        """Send buffered writes for the singer-videos table."""
+        self._writer.flush_table(self._table_name)
+
+    def _query_index_items(self, video_id: str) -> List[Dict[str, Any]]:
+        """Query GSI_VIDEO_ID for all singer records of a video."""
+        # Buffered writes must land first so the query sees them
+        self.flush()
+        response = self._client.query(
+            TableName=self._table_name,
+            IndexName="GSI_VIDEO_ID",
+            KeyConditionExpression="video_id = :video_id",
+            ExpressionAttributeValues={":video_id": {"S": video_id}},
+        )
+        return response.get("Items", [])
 
     def delete_singer_video_index(self, video_id: str) -> None:
         """
@@ -357,24 +911,70 @@ class SingerVideoIndexRepository:
           video_id: YouTube video ID
         """
         # Query GSI_VIDEO_ID to find all records for this video
-        response = self._client.query(
+        items = self._query_index_items(video_id)
+
+        # Delete each record
+        for item in items:
+            self._delete_index_item(item)
+        self.flush()
+        self._catalog_changed()
+
+    def _delete_index_item(self, item: Dict[str, Any]) -> None:
+        """
+        Delete a singer-video record and uncount it from the summary.
+
+        The delete is not batched: only the request that actually removed
+        the record (DeleteItem returned it) uncounts it, so racing replaces
+        and retried deletes can't decrement twice.
+        """
+        response = self._client.delete_item(
             TableName=self._table_name,
-            IndexName="GSI_VIDEO_ID",
-            KeyConditionExpression="video_id = :video_id",
-            ExpressionAttributeValues={":video_id": {"S": video_id}},
+            Key={"singer_key": item["singer_key"], "sort_key": item["sort_key"]},
+            ReturnValues="ALL_OLD",
         )
+        if "Attributes" in response:
+            self._remove_from_summary(item["singer_key"]["S"], item["sort_key"]["S"])
 
-        items = response.get("Items", [])
+    def update_statistics(
+        self,
+        targets: List[Dict[str, Any]],
+        statistics: Dict[str, Dict[str, int]],
+    ) -> int:
+        """
+        Write refreshed counts to the index records of the given videos.
 
-        # Delete each record
-        for item in items:
-            self._client.delete_item(
-                TableName=self._table_name,
-                Key={
-                    "singer_key": item["singer_key"],
-                    "sort_key": item["sort_key"],
-                },
-            )
+        Record keys are derived from the videos table attributes (one
+        record per singer, sorted by "published_at#video_id"), so no
+        GSI_VIDEO_ID queries are needed. Records that don't exist are
+        skipped; UPDATE never creates items.
+
+        Args:
+          targets: Dicts from VideoRepository.list_statistics_targets
+          statistics: video_id -> {"view_count", "like_count", "comment_count"}
+
+        Returns:
+          Number of index records updated
+        """
+        statements = [
+            {
+                "Statement": f'UPDATE "{self._table_name}" '
+                + _set_statistics_clause()
+                + " WHERE singer_key = ? AND sort_key = ?",
+                "Parameters": _statistics_parameters(statistics[target["video_id"]])
+                + [
+                    {"S": singer_key},
+                    {"S": f"{target['published_at']}#{target['video_id']}"},
+                ],
+            }
+            for target in targets
+            if target["video_id"] in statistics
+            # Collabs can list the same singer under several spellings
+            for singer_key in {normalize(singer) for singer in target["singers"]}
+        ]
+        errors = self._writer.execute_statements(statements)
+        if None in errors:
+            self._catalog_changed()
+        return errors.count(None)
 
     def upsert_singer_video_index(
         self,
@@ -387,6 +987,7 @@ class SingerVideoIndexRepository:
         is_cover: bool,
         link: Optional[str] = None,
         thumbnail_url: Optional[str] = None,
+        avatar_url: Optional[str] = None,
         original_song_title: Optional[str] = None,
         original_artist_name: Optional[str] = None,
         ai_stats: Optional[Dict[str, int]] = None,
@@ -398,11 +999,17 @@ class SingerVideoIndexRepository:
         comment_count: int = 0,
         channel_title: str = "",
         subscriber_count: int = 0,
+        replace: bool = False,
     ) -> None:
         """
         Create or update singer-video index records.
 
-        Creates one record per singer for the given video.
+        Creates one record per singer for the given video and flushes
+        before returning. Records known to exist (from the GSI query when
+        replacing, otherwise from one BatchGetItem) are overwritten through
+        the batch writer. The others are put conditionally, and only a
+        record that didn't exist yet is counted in the singer's summary, so
+        concurrent upserts of one video can't count it twice.
 
         Args:
           video_id: YouTube video ID
@@ -414,6 +1021,7 @@ class SingerVideoIndexRepository:
           is_cover: Whether this is a cover song
           link: Link to original song (optional)
           thumbnail_url: Video thumbnail URL (optional)
+          avatar_url: Channel icon URL stored on the singer summary (optional)
           original_song_title: Original song title (optional)
           original_artist_name: Original artist name (optional)
           ai_stats: Optional AI characteristics (cool, cute, energetic, surprising, emotional)
@@ -425,6 +1033,8 @@ class SingerVideoIndexRepository:
           comment_count: Comment count (default: 0)
           channel_title: Channel title (default: "")
           subscriber_count: Subscriber count (default: 0)
+          replace: Also delete existing records of singers no longer listed
+            (default: False)
         """
         # Build song_key from original song info
         if original_song_title and original_artist_name:
@@ -437,63 +1047,215 @@ class SingerVideoIndexRepository:
 
         sort_key = f"{published_at}#{video_id}"
 
+        singer_keys = {normalize(singer_name): singer_name for singer_name in singers}
+        if replace:
+            existing = {
+                (item["singer_key"]["S"], item["sort_key"]["S"]): item
+                for item in self._query_index_items(video_id)
+            }
+        else:
+            existing = self._existing_records(list(singer_keys), sort_key)
+
+        # Attributes shared by every singer's record
+        video_attributes = SINGER_VIDEO_ITEM.encode(
+            {
+                "sort_key": sort_key,
+                "song_key": song_key,
+                "video_id": video_id,
+                "song_title": song_title,
+                "video_title": video_title,
+                "channel_id": channel_id,
+                "published_at": published_at,
+                "is_cover": is_cover,
+                "link": link or None,
+                "thumbnail_url": thumbnail_url or None,
+                "original_song_title": original_song_title or None,
+                "original_artist_name": original_artist_name or None,
+                "ai_stats": ai_stats or None,
+                "comment_cloud": comment_cloud or None,
+                "chorus_start_time": chorus_start_time,
+                "chorus_end_time": chorus_end_time,
+                "view_count": view_count,
+                "like_count": like_count,
+                "comment_count": comment_count,
+                "channel_title": channel_title,
+                "subscriber_count": subscriber_count,
+            }
+        )
+
         # Create one record per singer
-        for singer_name in singers:
-            singer_key = normalize(singer_name)
-
-            item: Dict[str, Any] = {
-                "singer_key": {"S": singer_key},
-                "sort_key": {"S": sort_key},
-                "singer_name": {"S": singer_name},
-                "song_key": {"S": song_key},
-                "video_id": {"S": video_id},
-                "song_title": {"S": song_title},
-                "video_title": {"S": video_title},
-                "channel_id": {"S": channel_id},
-                "published_at": {"S": published_at},
-                "is_cover": {"BOOL": is_cover},
+        for singer_key, singer_name in singer_keys.items():
+            item = {
+                **SINGER_VIDEO_ITEM.encode(
+                    {"singer_key": singer_key, "singer_name": singer_name}
+                ),
+                **video_attributes,
             }
 
-            if link:
-                item["link"] = {"S": link}
-            if thumbnail_url:
-                item["thumbnail_url"] = {"S": thumbnail_url}
-            if original_song_title:
-                item["original_song_title"] = {"S": original_song_title}
-            if original_artist_name:
-                item["original_artist_name"] = {"S": original_artist_name}
-            if ai_stats:
-                item["ai_stats"] = {
-                    "M": {
-                        "cool": {"N": str(ai_stats["cool"])},
-                        "cute": {"N": str(ai_stats["cute"])},
-                        "energetic": {"N": str(ai_stats["energetic"])},
-                        "surprising": {"N": str(ai_stats["surprising"])},
-                        "emotional": {"N": str(ai_stats["emotional"])},
-                    }
-                }
-            if comment_cloud:
-                item["comment_cloud"] = {
-                    "L": [
-                        {
-                            "M": {
-                                "word": {"S": kw["word"]},
-                                "importance": {"N": str(kw["importance"])},
-                            }
-                        }
-                        for kw in comment_cloud
-                    ]
-                }
-            if chorus_start_time is not None:
-                item["chorus_start_time"] = {"N": str(chorus_start_time)}
-            if chorus_end_time is not None:
-                item["chorus_end_time"] = {"N": str(chorus_end_time)}
-
-            # Add statistics fields
-            item["view_count"] = {"N": str(view_count)}
-            item["like_count"] = {"N": str(like_count)}
-            item["comment_count"] = {"N": str(comment_count)}
-            item["channel_title"] = {"S": channel_title}
-            item["subscriber_count"] = {"N": str(subscriber_count)}
-
-            self._client.put_item(TableName=self._table_name, Item=item)
+            # Already counted records only change their attributes; a put
+            # losing the race to create the record falls back to that too
+            if (singer_key, sort_key) in existing or not self._put_if_new(item):
+                self._writer.put(self._table_name, item, SINGER_VIDEOS_KEY)
+            else:
+                self._add_to_summary(
+                    singer_key, singer_name, sort_key, video_id, channel_id, avatar_url
+                )
+
+        if replace:
+            for (singer_key, item_sort_key), item in existing.items():
+                if singer_key not in singer_keys or item_sort_key != sort_key:
+                    self._delete_index_item(item)
+
+        self.flush()
+        self._catalog_changed()
+
+    def _existing_records(
+        self, singer_keys: List[str], sort_key: str
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Stored records among the given singers' keys for one sort key."""
+        # Buffered writes must land first so the read sees them
+        self.flush()
+        items = _batch_get_items(
+            self._client,
+            self._table_name,
+            [
+                {"singer_key": {"S": singer_key}, "sort_key": {"S": sort_key}}
+                for singer_key in singer_keys
+            ],
+            "singer_key, sort_key",
+            consistent_read=True,
+        )
+        return {
+            (item["singer_key"]["S"], item["sort_key"]["S"]): item for item in items
+        }
+
+    def _put_if_new(self, item: Dict[str, Any]) -> bool:
+        """
+        Write a singer-video record unless one exists for its key.
+
+        Returns:
+          True if the record was created
+        """
+        try:
+            self._client.put_item(
+                TableName=self._table_name,
+                Item=item,
+                ConditionExpression="attribute_not_exists(singer_key)",
+            )
+        except self._client.exceptions.ConditionalCheckFailedException:
+            return False
+        return True
+
+    def _add_to_summary(
+        self,
+        singer_key: str,
+        singer_name: str,
+        sort_key: str,
+        video_id: str,
+        channel_id: str,
+        avatar_url: Optional[str],
+    ) -> None:
+        """
+        Count a new singer-video record in the singer's summary item.
+
+        video_count is changed with an atomic ADD; the latest video (and the
+        channel it was published on) only moves forward in sort_key order.
+        """
+        if not self._summaries_table_name:
+            return
+
+        update_expr = (
+            "SET singer_name = :singer_name, "
+            "channel_id = if_not_exists(channel_id, :channel_id) "
+            "ADD video_count :one"
+        )
+        self._client.update_item(
+            TableName=self._summaries_table_name,
+            Key={"singer_key": {"S": singer_key}},
+            UpdateExpression=update_expr,
+            ExpressionAttributeValues={
+                ":singer_name": {"S": singer_name},
+                ":channel_id": {"S": channel_id},
+                ":one": {"N": "1"},
+            },
+        )
+
+        latest_expr = (
+            "SET latest_sort_key = :sort_key, latest_video_id = :video_id, "
+            "channel_id = :channel_id"
+        )
+        attr_values = {
+            ":sort_key": {"S": sort_key},
+            ":video_id": {"S": video_id},
+            ":channel_id": {"S": channel_id},
+        }
+        if avatar_url:
+            latest_expr += ", avatar_url = :avatar_url"
+            attr_values[":avatar_url"] = {"S": avatar_url}
+
+        try:
+            self._client.update_item(
+                TableName=self._summaries_table_name,
+                Key={"singer_key": {"S": singer_key}},
+                UpdateExpression=latest_expr,
+                ConditionExpression=(
+                    "attribute_not_exists(latest_sort_key) "
+                    "OR latest_sort_key <= :sort_key"
+                ),
+                ExpressionAttributeValues=attr_values,
+            )
+        except self._client.exceptions.ConditionalCheckFailedException:
+            # A newer video is already recorded as latest
+            pass
+
+    def _remove_from_summary(self, singer_key: str, sort_key: str) -> None:
+        """Uncount a deleted singer-video record from the singer's summary."""
+        if not self._summaries_table_name:
+            return
+
+        try:
+            response = self._client.update_item(
+                TableName=self._summaries_table_name,
+                Key={"singer_key": {"S": singer_key}},
+                UpdateExpression="ADD video_count :delta",
+                ConditionExpression="video_count > :zero",
+                ExpressionAttributeValues={":delta": {"N": "-1"}, ":zero": {"N": "0"}},
+                ReturnValues="ALL_NEW",
+            )
+        except self._client.exceptions.ConditionalCheckFailedException:
+            # No summary yet (e.g. records written before summaries existed),
+            # or nothing left to uncount
+            return
+
+        summary = response["Attributes"]
+        if summary.get("latest_sort_key", {}).get("S") != sort_key:
+            return
+
+        # The latest video was removed: fall back to the newest remaining one
+        self.flush()
+        newest = self._client.query(
+            TableName=self._table_name,
+            KeyConditionExpression="singer_key = :singer_key",
+            ExpressionAttributeValues={":singer_key": {"S": singer_key}},
+            ScanIndexForward=False,
+            Limit=1,
+        ).get("Items", [])
+
+        if newest:
+            self._client.update_item(
+                TableName=self._summaries_table_name,
+                Key={"singer_key": {"S": singer_key}},
+                UpdateExpression=(
+                    "SET latest_sort_key = :sort_key, latest_video_id = :video_id"
+                ),
+                ExpressionAttributeValues={
+                    ":sort_key": newest[0]["sort_key"],
+                    ":video_id": newest[0]["video_id"],
+                },
+            )
+        else:
+            self._client.update_item(
+                TableName=self._summaries_table_name,
+                Key={"singer_key": {"S": singer_key}},
+                UpdateExpression="REMOVE latest_sort_key, latest_video_id",
+            )
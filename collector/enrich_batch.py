@@ -10,82 +10,109 @@ import sys
 import time
 from typing import List
 
+from batch_writer import BatchWriter
 from config import get_collector_settings
-from db import SingerVideoIndexRepository, VideoRepository
+from db import (
+    ENRICHMENT_CLASSIFIED,
+    ENRICHMENT_SONG_EXTRACTED,
+    CatalogVersion,
+    SingerVideoIndexRepository,
+    VideoRepository,
+)
 from enricher import VideoEnricher
 from gemini_client import GeminiClient
+from more_itertools import chunked
+from preclassifier import PreClassifier
+from run_once import finish_run
 from youtube_client import YouTubeClient
 
+# SONG videos whose classification is already stored; they resume at song
+# extraction. Extracted song info is only stored with the analysis results,
+# so song_extracted videos repeat extraction too.
+_CLASSIFIED_SONG_STATES = (ENRICHMENT_CLASSIFIED, ENRICHMENT_SONG_EXTRACTED)
+
 
 def enrich_channel(
     channel_id: str,
-    gemini_client: GeminiClient,
+    enricher: VideoEnricher,
     video_repo: VideoRepository,
-    index_repo: SingerVideoIndexRepository,
-    youtube_client,
     max_videos: int = 0,
-    sleep_seconds: float = 1.0,
+    sleep_seconds: float = 0.0,
 ) -> None:
     """
     Enrich videos from a single channel.
 
+    Each video resumes from its recorded enrichment state: SONG videos
+    classified by an earlier run skip classification.
+
     Args:
       channel_id: YouTube channel ID
-      gemini_client: Gemini API client
+      enricher: VideoEnricher shared by all channels
       video_repo: DynamoDB repository
-      index_repo: SingerVideoIndexRepository
-      youtube_client: YouTube API client
       max_videos: Maximum number of videos to process (0 = no limit)
-      sleep_seconds: Sleep time between API calls (rate limit)
+      sleep_seconds: Extra sleep between videos (Gemini calls are already
+        rate limited by the client's token bucket)
     """
     print(f"\n{'='*60}")
     print(f"Enriching videos from channel: {channel_id}")
     print(f"{'='*60}\n")
 
-    enricher = VideoEnricher(gemini_client, video_repo, index_repo, youtube_client)
-
-    # Get all videos from channel (unenriched videos have no song_title)
-    videos = video_repo.list_videos_by_channel(channel_id)
-
-    if not videos:
-        print(f"No videos found for channel {channel_id}")
-        return
-
-    print(f"Found {len(videos)} total videos")
-
-    # Filter videos that haven't been enriched yet
-    unenriched = [v for v in videos if not v.song_title and not v.game_title]
+    # Read only videos with enrichment work left (sparse enrichment GSI):
+    # new, partially enriched, or failed fewer than MAX_ENRICHMENT_ATTEMPTS times
+    unenriched = video_repo.list_pending_videos(channel_id, limit=max_videos)
     print(f"Unenriched videos: {len(unenriched)}")
 
     if not unenriched:
         print("All videos already enriched!")
         return
 
-    # Apply limit if specified
-    if max_videos > 0:
-        unenriched = unenriched[:max_videos]
-        print(f"Processing first {len(unenriched)} videos")
-
-    # Process each video
+    # Process in chunks of 50: classification is batched per chunk, then each
+    # SONG video goes through song extraction and analysis
     success_count = 0
     error_count = 0
-
-    for i, video in enumerate(unenriched, 1):
-        print(f"\n[{i}/{len(unenriched)}] Processing {video.video_id}...")
-
-        try:
-            success = enricher.enrich_video(channel_id, video.video_id)
-            if success:
+    done = 0
+
+    for chunk in chunked(unenriched, 50):
+        chunk = list(chunk)
+        print(f"\n[{done + 1}-{done + len(chunk)}/{len(unenriched)}] Classifying...")
+        done += len(chunk)
+
+        video_types = {
+            video.video_id: "SONG"
+            for video in chunk
+            if video.enrichment_state in _CLASSIFIED_SONG_STATES
+        }
+        to_classify = [video for video in chunk if video.video_id not in video_types]
+        if video_types:
+            print(f"  {len(video_types)} SONG videos already classified")
+        if to_classify:
+            try:
+                video_types.update(enricher.classify_many(channel_id, to_classify))
+            except Exception as e:
+                # Counted as errors below; classified SONG videos go on
+                print(f"  ✗ Error: {e}")
+
+        for video in chunk:
+            video_type = video_types.get(video.video_id, "")
+            if video_type != "SONG":
+                if video_type:
+                    success_count += 1
+                else:
+                    error_count += 1
+                continue
+
+            print(f"\nProcessing SONG {video.video_id}...")
+            try:
+                song_info = enricher.extract_song(channel_id, video)
+                if song_info:
+                    enricher.analyze_and_store(channel_id, video, song_info)
                 success_count += 1
-            else:
+            except Exception as e:
+                print(f"  ✗ Error: {e}")
                 error_count += 1
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-            error_count += 1
 
-        # Rate limit: sleep between requests
-        if i < len(unenriched):
-            time.sleep(sleep_seconds)
+            if sleep_seconds > 0:
+                time.sleep(sleep_seconds)
 
     print(f"\n{'='*60}")
     print(f"Enrichment complete!")
@@ -104,19 +131,36 @@ def main(channel_ids: List[str], max_videos: int = 0) -> None:
     """
     settings = get_collector_settings()
 
-    gemini_client = GeminiClient(settings.gemini_api_key)
-    youtube_client = YouTubeClient(settings.youtube_api_key)
-    video_repo = VideoRepository.from_settings(settings)
-    index_repo = SingerVideoIndexRepository.from_settings(settings)
-
-    for channel_id in channel_ids:
-        try:
-            enrich_channel(
-                channel_id, gemini_client, video_repo, index_repo, youtube_client, max_videos
-            )
-        except Exception as e:
-            print(f"\nError processing channel {channel_id}: {e}", file=sys.stderr)
-            continue
+    gemini_client = GeminiClient.from_settings(settings)
+    youtube_client = YouTubeClient.from_settings(settings)
+    writer = BatchWriter.from_settings(settings)
+    video_repo = VideoRepository.from_settings(settings, writer)
+    index_repo = SingerVideoIndexRepository.from_settings(settings, writer)
+    enricher = VideoEnricher(
+        gemini_client,
+        video_repo,
+        index_repo,
+        youtube_client,
+        preclassifier=PreClassifier.from_settings(settings),
+    )
+
+    try:
+        for channel_id in channel_ids:
+            try:
+                enrich_channel(channel_id, enricher, video_repo, max_videos)
+            except Exception as e:
+                print(f"\nError processing channel {channel_id}: {e}", file=sys.stderr)
+                continue
+    finally:
+        finish_run(writer, CatalogVersion.from_settings(settings), enricher)
+    print(
+        f"\nBatched writes: {writer.items_written} items in "
+        f"{writer.requests_sent} requests ({writer.writes_saved} round trips saved)"
+    )
+    if gemini_client.cache is not None:
+        print(f"Gemini cache: {gemini_client.cache.stats()}")
+    print(f"YouTube rate control:\n{youtube_client.rate_control.stats()}")
+    print(f"Gemini rate control:\n{gemini_client.rate_control.stats()}")
 
 
 if __name__ == "__main__":
@@ -8,16 +8,31 @@ Enriches video metadata with:
 4. Comment keyword extraction
 """
 
-from typing import Optional
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from db import SingerVideoIndexRepository
+from db import (
+    ENRICHMENT_ANALYZED,
+    ENRICHMENT_CLASSIFIED,
+    ENRICHMENT_FAILED,
+    ENRICHMENT_SONG_EXTRACTED,
+    SingerVideoIndexRepository,
+)
 from gemini_client import GeminiClient
+from preclassifier import PreClassifier
+from rate_limiter import ThrottledError
 from youtube_client import YouTubeClient
 
 # Duration thresholds (in seconds)
 DURATION_MIN = 60  # Exclude Shorts (< 1 minute)
 DURATION_MAX = 60 * 20  # Exclude live streams (> 20 minutes)
 
+# Overall deadline for the concurrent AI analysis calls of one video
+ANALYSIS_TIMEOUT = 180.0
+
 
 class VideoEnricher:
     """Enriches video metadata using Gemini API."""
@@ -28,14 +43,34 @@ class VideoEnricher:
         video_repo,
         index_repo: Optional[SingerVideoIndexRepository] = None,
         youtube_client: Optional[YouTubeClient] = None,
+        analysis_workers: int = 8,
+        analysis_timeout: float = ANALYSIS_TIMEOUT,
+        preclassifier: Optional[PreClassifier] = None,
     ):
         self.gemini = gemini_client
         self.repo = video_repo
         self.index_repo = index_repo
         self.youtube = youtube_client
+        self.analysis_timeout = analysis_timeout
+        self.preclassifier = preclassifier
+        # channel_id -> video type counts, the pre-classifier's channel prior
+        self._channel_history: Dict[str, Dict[str, int]] = {}
+        self._history_lock = threading.Lock()
+        # Shared by all videos; the independent analysis calls run here
+        self._analysis_pool = ThreadPoolExecutor(
+            max_workers=analysis_workers, thread_name_prefix="analysis"
+        )
+
+    def close(self) -> None:
+        """Shut down the analysis thread pool once no more videos are enriched."""
+        self._analysis_pool.shutdown(wait=True)
 
     def enrich_video(
-        self, channel_id: str, video_id: str, channel_name: Optional[str] = None
+        self,
+        channel_id: str,
+        video_id: str,
+        channel_name: Optional[str] = None,
+        channel_icon_url: Optional[str] = None,
     ) -> str:
         """
         Enrich a single video with AI-generated metadata.
@@ -44,6 +79,7 @@ class VideoEnricher:
           channel_id: YouTube channel ID
           video_id: YouTube video ID
           channel_name: Optional channel name for better extraction
+          channel_icon_url: Optional channel icon, stored as the singers' avatar
 
         Returns:
           Video type string: "SONG", "GAME", or "UNKNOWN". Empty string on error.
@@ -54,9 +90,108 @@ class VideoEnricher:
             print(f"Video not found: {video_id}")
             return ""
 
+        video_type = self.classify(channel_id, video)
+        if video_type != "SONG":
+            return video_type
+
+        song_info = self.extract_song(channel_id, video, channel_name)
+        if song_info:
+            self.analyze_and_store(channel_id, video, song_info, channel_icon_url)
+        return "SONG"
+
+    def classify(self, channel_id: str, video) -> str:
+        """
+        Filter by duration and classify the video type.
+
+        The type is stored for non-SONG videos; SONG videos are stored by the
+        later steps.
+
+        Args:
+          channel_id: YouTube channel ID
+          video: VideoRecord read from DynamoDB
+
+        Returns:
+          Video type string: "SONG", "GAME", or "UNKNOWN". Empty string if the
+          video can't be classified.
+        """
+        settled = self._classify_locally(channel_id, video)
+        if settled is not None:
+            return settled
+
+        # 3b. Ask Gemini
+        print(f"Classifying {video.video_id}: {video.video_title[:50]}...")
+        with self._recording_failure(channel_id, video.video_id):
+            video_type_result = self.gemini.classify_video_type(
+                video.video_title, video.description or ""
+            )
+        return self._store_classification(channel_id, video, video_type_result)
+
+    def classify_many(self, channel_id: str, videos: List[Any]) -> Dict[str, str]:
+        """
+        Classify a chunk of videos, batching the Gemini requests.
+
+        Same per-video behavior as classify; videos the pre-classifier can't
+        settle are sent to GeminiClient.classify_video_types together.
+
+        Args:
+          channel_id: YouTube channel ID
+          videos: VideoRecords read from DynamoDB
+
+        Returns:
+          video_id -> video type ("" for videos that couldn't be classified)
+        """
+        video_types: Dict[str, str] = {}
+        remaining = []
+        for video in videos:
+            settled = self._classify_locally(channel_id, video)
+            if settled is None:
+                remaining.append(video)
+            else:
+                video_types[video.video_id] = settled
+
+        if not remaining:
+            return video_types
+
+        print(f"Classifying {len(remaining)} videos with Gemini (batched)...")
+        try:
+            results = self.gemini.classify_video_types(
+                [
+                    {
+                        "video_id": video.video_id,
+                        "title": video.video_title,
+                        "description": video.description or "",
+                    }
+                    for video in remaining
+                ]
+            )
+        except Exception as e:
+            for video in remaining:
+                self._record_failure(channel_id, video.video_id, e)
+            raise
+
+        for video in remaining:
+            print(f"{video.video_id}: {video.video_title[:50]}")
+            video_types[video.video_id] = self._store_classification(
+                channel_id, video, results[video.video_id]
+            )
+        return video_types
+
+    def _classify_locally(self, channel_id: str, video) -> Optional[str]:
+        """
+        Settle the type without Gemini if possible.
+
+        Returns:
+          The stored video type ("" if the video can't be classified), or
+          None if Gemini has to decide
+        """
+        video_id = video.video_id
+
         # 2. Filter by duration
         if video.duration is None:
             print(f"Skipping {video_id}: no duration")
+            self.repo.mark_enrichment(
+                channel_id, video_id, ENRICHMENT_FAILED, error="no duration"
+            )
             return ""
 
         if not (DURATION_MIN <= video.duration <= DURATION_MAX):
@@ -66,14 +201,31 @@ class VideoEnricher:
             )
             # Update with UNKNOWN type to mark as processed
             self.repo.update_video_type(channel_id, video_id, "UNKNOWN")
+            self.repo.mark_enrichment(
+                channel_id, video_id, ENRICHMENT_CLASSIFIED, done=True
+            )
             return "UNKNOWN"
 
-        # 3. Classify video type
-        print(f"Classifying {video_id}: {video.video_title[:50]}...")
-        video_type_result = self.gemini.classify_video_type(
-            video.video_title, video.description or ""
+        # 3a. Classify locally if the pre-classifier is confident
+        if not self.preclassifier:
+            return None
+        video_type_result = self.preclassifier.classify(
+            video.video_title,
+            video.description or "",
+            video.duration,
+            self._history(channel_id),
         )
+        if not video_type_result:
+            return None
+
+        print(f"Classifying {video_id}: {video.video_title[:50]}...")
+        return self._store_classification(channel_id, video, video_type_result)
 
+    def _store_classification(
+        self, channel_id: str, video, video_type_result: Dict[str, Any]
+    ) -> str:
+        """Store a classification result and return the video type."""
+        video_id = video.video_id
         video_type = video_type_result["type"]
         confidence = video_type_result["confidence"]
 
@@ -85,107 +237,100 @@ class VideoEnricher:
         if video_type != "SONG":
             # Not a song video, just update type
             self.repo.update_video_type(channel_id, video_id, video_type)
-            return video_type
+        self._record_history(channel_id, video_type)
+
+        # Non-SONG videos are done; SONG videos go on to song extraction
+        self.repo.mark_enrichment(
+            channel_id, video_id, ENRICHMENT_CLASSIFIED, done=video_type != "SONG"
+        )
+        return video_type
+
+    def extract_song(
+        self, channel_id: str, video, channel_name: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Extract song information for a SONG video.
+
+        Args:
+          channel_id: YouTube channel ID
+          video: VideoRecord read from DynamoDB
+          channel_name: Optional channel name for better extraction
+
+        Returns:
+          Song info dict, or None if no song title was found (the video is
+          then stored as SONG without details)
+        """
+        video_id = video.video_id
 
         # 4. Extract song information
         print(f"Extracting song info for {video_id}...")
-        song_info = self.gemini.extract_song_info(
-            video.video_title, video.description or "", channel_name or ""
-        )
+        with self._recording_failure(channel_id, video_id):
+            song_info = self.gemini.extract_song_info(
+                video.video_title, video.description or "", channel_name or ""
+            )
 
         if not song_info.get("song_title"):
             print(f"  → Failed to extract song title")
             # Mark as SONG but without detailed info
             self.repo.update_video_type(channel_id, video_id, "SONG")
-            return "SONG"
+            self.repo.mark_enrichment(
+                channel_id, video_id, ENRICHMENT_FAILED, error="no song title"
+            )
+            return None
+
+        self.repo.mark_enrichment(channel_id, video_id, ENRICHMENT_SONG_EXTRACTED)
 
         print(f"  → Song: {song_info['song_title']}")
         print(f"  → Singers: {', '.join(song_info['singers'])}")
         print(f"  → Cover: {song_info['is_cover']}")
+        return song_info
 
-        # 4.5. Analyze AI characteristics and extract comment keywords
-        ai_stats = None
-        comment_cloud = None
-        chorus_info = None
+    def analyze_and_store(
+        self,
+        channel_id: str,
+        video,
+        song_info: Dict[str, Any],
+        channel_icon_url: Optional[str] = None,
+    ) -> None:
+        """
+        Run the AI analysis calls and store the enriched SONG video.
 
-        if self.youtube:
-            try:
-                # Fetch comments
-                print(f"  → Fetching comments...")
-                comments = self.youtube.fetch_video_comments(video_id, max_results=100)
-                print(f"  → Found {len(comments)} comments")
-
-                if comments:
-                    # Analyze video characteristics (5-axis)
-                    print(f"  → Analyzing AI characteristics...")
-                    ai_stats = self.gemini.analyze_video_characteristics(
-                        video_id, comments
-                    )
-                    print(
-                        f"  → AI Stats: Cool={ai_stats['cool']}, Cute={ai_stats['cute']}, "
-                        f"Energetic={ai_stats['energetic']}, Surprising={ai_stats['surprising']}, "
-                        f"Emotional={ai_stats['emotional']}"
-                    )
-
-                    # Extract comment keywords
-                    print(f"  → Extracting comment keywords...")
-                    keywords = self.gemini.extract_comment_keywords(comments)
-                    comment_cloud = [
-                        {"word": kw["word"], "importance": kw["importance"]}
-                        for kw in keywords
-                    ]
-                    print(
-                        f"  → Extracted {len(comment_cloud)} keywords: "
-                        f"{', '.join([kw['word'] for kw in comment_cloud[:5]])}"
-                    )
-
-                # Extract chorus timestamps
-                print(f"  → Extracting chorus timestamps...")
-                chorus_result = self.gemini.extract_chorus_time(video_id)
-
-                if chorus_result["confidence"] > 0.5:  # Only use if confidence > 50%
-                    chorus_info = {
-                        "start": chorus_result["chorus_start_time"],
-                        "end": chorus_result["chorus_end_time"],
-                    }
-                    print(
-                        f"  → Chorus: {chorus_info['start']}s - {chorus_info['end']}s "
-                        f"(confidence: {chorus_result['confidence']:.2f})"
-                    )
-                else:
-                    print(
-                        f"  → Chorus detection failed (low confidence: {chorus_result['confidence']:.2f})"
-                    )
+        Args:
+          channel_id: YouTube channel ID
+          video: VideoRecord read from DynamoDB
+          song_info: Result of extract_song
+          channel_icon_url: Optional channel icon, stored as the singers' avatar
+        """
+        video_id = video.video_id
 
-            except Exception as e:
-                print(f"  ⚠ AI analysis failed: {e}")
-                # Continue without AI stats
+        # 4.5. Analyze AI characteristics, comment keywords and chorus
+        with self._recording_failure(channel_id, video_id):
+            ai_stats, comment_cloud, chorus_info = self._analyze(video_id)
 
         # 5. Update DynamoDB with enriched information
-        self.repo.update_song_info(
-            channel_id=channel_id,
-            video_id=video_id,
-            song_title=song_info["song_title"],
-            singers=song_info["singers"],
-            is_cover=song_info["is_cover"],
-            link=song_info.get("original_url"),
-            ai_stats=ai_stats,
-            comment_cloud=comment_cloud,
-            chorus_start_time=chorus_info["start"] if chorus_info else None,
-            chorus_end_time=chorus_info["end"] if chorus_info else None,
-        )
+        with self._recording_failure(channel_id, video_id):
+            self.repo.update_song_info(
+                channel_id=channel_id,
+                video_id=video_id,
+                song_title=song_info["song_title"],
+                singers=song_info["singers"],
+                is_cover=song_info["is_cover"],
+                link=song_info.get("original_url"),
+                ai_stats=ai_stats,
+                comment_cloud=comment_cloud,
+                chorus_start_time=chorus_info["start"] if chorus_info else None,
+                chorus_end_time=chorus_info["end"] if chorus_info else None,
+            )
 
-        # 6. Sync to singer-videos index table
+        # 6. Sync to singer-videos index table; the video leaves the queue
+        # only once its index records are in place, otherwise it is retried
         if self.index_repo:
-            try:
-                # Delete existing index entries for this video
-                self.index_repo.delete_singer_video_index(video_id)
-
+            with self._recording_failure(channel_id, video_id):
                 # Extract original artist name (first artist from list)
                 original_artists = song_info.get("original_artists", [])
                 original_artist_name = original_artists[0] if original_artists else None
 
-                # Create new index entries
+                # Replace the index entries for this video
                 self.index_repo.upsert_singer_video_index(
                     video_id=video_id,
                     channel_id=channel_id,
@@ -196,6 +341,7 @@ class VideoEnricher:
                     is_cover=song_info["is_cover"],
                     link=song_info.get("original_url"),
                     thumbnail_url=getattr(video, "thumbnail_url", None),
+                    avatar_url=channel_icon_url,
                     original_song_title=song_info[
                         "song_title"
                     ],  # Use song_title as original
@@ -209,10 +355,152 @@ class VideoEnricher:
                     comment_count=getattr(video, "comment_count", 0),
                     channel_title=getattr(video, "channel_title", ""),
                     subscriber_count=0,  # TODO: Fetch from channel info
+                    replace=True,
                 )
                 print(f"  → Synced to index table")
+
+        self.repo.mark_enrichment(channel_id, video_id, ENRICHMENT_ANALYZED, done=True)
+
+    def _history(self, channel_id: str) -> Dict[str, int]:
+        """Video type counts of a channel, loaded once per run."""
+        with self._history_lock:
+            if channel_id not in self._channel_history:
+                self._channel_history[channel_id] = self.repo.count_video_types(
+                    channel_id
+                )
+            return dict(self._channel_history[channel_id])
+
+    def _record_history(self, channel_id: str, video_type: str) -> None:
+        with self._history_lock:
+            counts = self._channel_history.get(channel_id)
+            if counts is not None:
+                counts[video_type] = counts.get(video_type, 0) + 1
+
+    @contextmanager
+    def _recording_failure(self, channel_id: str, video_id: str) -> Iterator[None]:
+        """Mark the video as failed (and re-raise) if the block raises."""
+        try:
+            yield
+        except Exception as e:
+            self._record_failure(channel_id, video_id, e)
+            raise
+
+    def _record_failure(self, channel_id: str, video_id: str, error: Exception) -> None:
+        if isinstance(error, ThrottledError):
+            # Says nothing about the video: it stays queued in its current
+            # state and is retried without using up an attempt
+            return
+        try:
+            self.repo.mark_enrichment(
+                channel_id, video_id, ENRICHMENT_FAILED, error=str(error)
+            )
+        except Exception as mark_error:
+            print(f"  ⚠ Failed to record enrichment error: {mark_error}")
+
+    def _analyze(self, video_id: str) -> Tuple[
+        Optional[Dict[str, int]],
+        Optional[List[Dict[str, Any]]],
+        Optional[Dict[str, int]],
+    ]:
+        """
+        Run the AI analysis calls for a SONG video concurrently.
+
+        Characteristics, comment keywords and chorus detection don't depend
+        on each other, so they are dispatched together and share one
+        deadline. A call that fails or misses the deadline only leaves its
+        own result empty.
+
+        Returns:
+          (ai_stats, comment_cloud, chorus_info), each None if unavailable
+        """
+        if not self.youtube:
+            return None, None, None
+
+        deadline = time.monotonic() + self.analysis_timeout
+        futures: Dict[str, Future] = {}
+
+        # Chorus detection reads the video itself and can start right away
+        print(f"  → Extracting chorus timestamps...")
+        futures["chorus"] = self._analysis_pool.submit(
+            self.gemini.extract_chorus_time, video_id
+        )
+
+        try:
+            print(f"  → Fetching comments...")
+            comments = self.youtube.fetch_video_comments(video_id, max_results=100)
+            print(f"  → Found {len(comments)} comments")
+        except ThrottledError:
+            for future in futures.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            print(f"  ⚠ Comment fetch failed: {e}")
+            comments = []
+
+        if comments:
+            print(f"  → Analyzing AI characteristics and comment keywords...")
+            futures["ai_stats"] = self._analysis_pool.submit(
+                self.gemini.analyze_video_characteristics, video_id, comments
+            )
+            futures["keywords"] = self._analysis_pool.submit(
+                self.gemini.extract_comment_keywords, comments
+            )
+
+        wait(futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+
+        results: Dict[str, Any] = {}
+        throttled: Optional[ThrottledError] = None
+        for name, future in futures.items():
+            if not future.done():
+                # The call keeps running in the pool; its result is dropped
+                future.cancel()
+                print(f"  ⚠ {name} timed out after {self.analysis_timeout:g}s")
+                continue
+            try:
+                results[name] = future.result()
+            except ThrottledError as e:
+                print(f"  ⚠ {name} throttled: {e}")
+                throttled = e
             except Exception as e:
-                print(f"  ✗ Index sync failed: {e}")
-                # Don't fail the whole enrichment if index sync fails
+                print(f"  ⚠ {name} failed: {e}")
 
-        return "SONG"
+        if throttled:
+            raise throttled
+
+        ai_stats = results.get("ai_stats")
+        if ai_stats:
+            print(
+                f"  → AI Stats: Cool={ai_stats['cool']}, Cute={ai_stats['cute']}, "
+                f"Energetic={ai_stats['energetic']}, Surprising={ai_stats['surprising']}, "
+                f"Emotional={ai_stats['emotional']}"
+            )
+
+        comment_cloud = None
+        if "keywords" in results:
+            comment_cloud = [
+                {"word": kw["word"], "importance": kw["importance"]}
+                for kw in results["keywords"]
+            ]
+            print(
+                f"  → Extracted {len(comment_cloud)} keywords: "
+                f"{', '.join([kw['word'] for kw in comment_cloud[:5]])}"
+            )
+
+        chorus_info = None
+        chorus_result = results.get("chorus")
+        if chorus_result:
+            if chorus_result["confidence"] > 0.5:  # Only use if confidence > 50%
+                chorus_info = {
+                    "start": chorus_result["chorus_start_time"],
+                    "end": chorus_result["chorus_end_time"],
+                }
+                print(
+                    f"  → Chorus: {chorus_info['start']}s - {chorus_info['end']}s "
+                    f"(confidence: {chorus_result['confidence']:.2f})"
+                )
+            else:
+                print(
+                    f"  → Chorus detection failed (low confidence: {chorus_result['confidence']:.2f})"
+                )
+
+        return ai_stats, comment_cloud, chorus_info
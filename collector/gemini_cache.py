@@ -0,0 +1,230 @@
+"""
+Persistent cache for Gemini responses.
+
+Entries are content-addressed: the key is a SHA-256 of the calling method,
+the model and the full request (prompt, attached video URL and generation
+config), so a re-run on unchanged inputs reuses the stored response and an
+edited prompt or input misses naturally.
+
+Backends:
+- SQLiteResponseCache: local file; TTL plus least-recently-used eviction
+  once `max_entries` is exceeded. Eviction runs every few puts rather than
+  on each one, so the file can briefly hold up to 5% more entries.
+- DynamoResponseCache: shared table for Lambda; expiry uses DynamoDB TTL
+  on `expires_at`, so the table needs no explicit eviction.
+"""
+
+import abc
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+import boto3
+
+# Puts between SQLite evictions, as a fraction of max_entries
+_EVICTION_INTERVAL_FRACTION = 0.05
+
+
+def cache_key(method: str, model: str, contents: Any, config: Any) -> str:
+    """Hash the inputs of a generate_content call into a cache key."""
+    payload = json.dumps(
+        [method, model, _serializable(contents), _serializable(config)],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _serializable(value: Any) -> Any:
+    # genai request types are pydantic models
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json", exclude_none=True)
+    return value
+
+
+class ResponseCache(abc.ABC):
+    """Base class keeping hit/miss counters; backends implement _get/_put."""
+
+    def __init__(self, ttl_seconds: int = 0):
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text, or None on a miss or expiry."""
+        try:
+            value = self._get(key)
+        except Exception as e:
+            # The cache must never fail an enrichment
+            print(f"Gemini cache read failed: {e}")
+            value = None
+
+        with self._counter_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        try:
+            self._put(key, value)
+        except Exception as e:
+            print(f"Gemini cache write failed: {e}")
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return f"{self.hits} hits, {self.misses} misses ({rate:.0%} hit rate)"
+
+    def _expires_at(self, now: float) -> float:
+        return now + self.ttl_seconds if self.ttl_seconds > 0 else 0
+
+    @abc.abstractmethod
+    def _get(self, key: str) -> Optional[str]: ...
+
+    @abc.abstractmethod
+    def _put(self, key: str, value: str) -> None: ...
+
+
+class SQLiteResponseCache(ResponseCache):
+    """Cache stored in a local SQLite file."""
+
+    def __init__(self, path: str, ttl_seconds: int = 0, max_entries: int = 0):
+        super().__init__(ttl_seconds)
+        self.max_entries = max_entries
+        self._eviction_interval = max(1, int(max_entries * _EVICTION_INTERVAL_FRACTION))
+        self._puts_since_eviction = 0
+        # One connection shared by the pipeline's worker threads
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed_at"
+                " ON responses (accessed_at)"
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, expires_at = row
+            if expires_at and expires_at <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            return value
+
+    def _put(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, value, self._expires_at(now), now),
+            )
+            self._puts_since_eviction += 1
+            if (
+                self.max_entries > 0
+                and self._puts_since_eviction >= self._eviction_interval
+            ):
+                self._evict(now)
+                self._puts_since_eviction = 0
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute(
+            "DELETE FROM responses WHERE expires_at > 0 AND expires_at <= ?", (now,)
+        )
+        # Drop the least recently used entries beyond the size bound
+        self._conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            " SELECT key FROM responses ORDER BY accessed_at DESC"
+            " LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+
+class DynamoResponseCache(ResponseCache):
+    """Cache stored in a DynamoDB table keyed by `cache_key`."""
+
+    def __init__(self, client, table_name: str, ttl_seconds: int = 0):
+        super().__init__(ttl_seconds)
+        self._client = client
+        self._table_name = table_name
+
+    def _get(self, key: str) -> Optional[str]:
+        response = self._client.get_item(
+            TableName=self._table_name,
+            Key={"cache_key": {"S": key}},
+        )
+        item = response.get("Item")
+        if not item:
+            return None
+
+        # DynamoDB TTL deletes lazily, so check expiry here as well
+        expires_at = float(item.get("expires_at", {}).get("N", "0"))
+        if expires_at and expires_at <= time.time():
+            return None
+        return item["response"]["S"]
+
+    def _put(self, key: str, value: str) -> None:
+        item = {
+            "cache_key": {"S": key},
+            "response": {"S": value},
+        }
+        expires_at = self._expires_at(time.time())
+        if expires_at:
+            item["expires_at"] = {"N": str(int(expires_at))}
+        self._client.put_item(TableName=self._table_name, Item=item)
+
+
+def create_response_cache(settings) -> Optional[ResponseCache]:
+    """
+    Create the cache backend selected by GEMINI_CACHE_BACKEND.
+
+    Returns:
+      The cache, or None when disabled or when the backend can't be set up
+      (e.g. an unwritable cache path); Gemini is then called uncached
+    """
+    backend = settings.gemini_cache_backend.lower()
+    try:
+        if backend == "sqlite":
+            return SQLiteResponseCache(
+                settings.gemini_cache_path,
+                settings.gemini_cache_ttl_seconds,
+                settings.gemini_cache_max_entries,
+            )
+        if backend == "dynamodb":
+            client = boto3.client("dynamodb", region_name=settings.aws_region)
+            return DynamoResponseCache(
+                client,
+                settings.dynamodb_table_gemini_cache,
+                settings.gemini_cache_ttl_seconds,
+            )
+    except Exception as e:
+        # The cache must never fail an enrichment
+        print(f"Gemini cache unavailable ({backend}), continuing without it: {e}")
+    return None
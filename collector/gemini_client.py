@@ -9,18 +9,122 @@ Uses Gemini API with Google Search grounding to:
 """
 
 import json
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
+import httpx  # installed with google-genai, which sends requests through it
+from gemini_cache import ResponseCache, cache_key, create_response_cache
 from google import genai
-from google.genai import types
+from google.genai import errors, types
+from rate_limiter import (
+    THROTTLED,
+    TRANSIENT,
+    RateController,
+    RetryPolicy,
+    ThrottledError,
+)
+
+# Videos per batched classification request; matches the 50-video chunks of
+# run_once and enrich_batch, so each chunk is classified in one request
+CLASSIFY_BATCH_SIZE = 50
+# Descriptions are truncated in batched prompts to keep requests small
+BATCH_DESCRIPTION_CHARS = 1000
+
+VIDEO_TYPES = ("SONG", "GAME", "UNKNOWN")
+
+# Structured output of a batched classification: one entry per video
+CLASSIFICATION_BATCH_SCHEMA = types.Schema(
+    type=types.Type.ARRAY,
+    items=types.Schema(
+        type=types.Type.OBJECT,
+        properties={
+            "video_id": types.Schema(type=types.Type.STRING),
+            "type": types.Schema(type=types.Type.STRING, enum=list(VIDEO_TYPES)),
+            "confidence": types.Schema(type=types.Type.NUMBER),
+            "reason": types.Schema(type=types.Type.STRING),
+        },
+        required=["video_id", "type", "confidence", "reason"],
+    ),
+)
+
+
+class CachedResponse:
+    """Stands in for a generate_content response restored from the cache."""
+
+    def __init__(self, text: str):
+        self.text = text
 
 
 class GeminiClient:
     """Client for Gemini API with Google Search grounding."""
 
-    def __init__(self, api_key: str, model: str = "gemini-3-pro-preview"):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gemini-3-pro-preview",
+        rate_control: Optional[RateController] = None,
+        cache: Optional[ResponseCache] = None,
+    ):
         self.client = genai.Client(api_key=api_key)
         self.model = model
+        self.rate_control = rate_control
+        self.cache = cache
+
+    @classmethod
+    def from_settings(cls, settings) -> "GeminiClient":
+        """Create a rate-controlled client from collector settings."""
+        return cls(
+            settings.gemini_api_key,
+            rate_control=RateController(
+                settings.gemini_requests_per_second,
+                settings.gemini_burst,
+                settings.gemini_max_concurrency,
+                RetryPolicy(settings.api_max_attempts, settings.api_retry_base_delay),
+            ),
+            cache=create_response_cache(settings),
+        )
+
+    def _generate(
+        self,
+        method: str,
+        contents,
+        config: types.GenerateContentConfig,
+        usable: Callable[[Any], bool] = lambda answer: True,
+    ):
+        """
+        Call generate_content under rate control, if configured.
+
+        Responses are looked up in and stored to the cache (if configured),
+        keyed by `method`, the model and the request inputs. Only JSON
+        answers that `usable` accepts are stored, so an answer the caller
+        treats as a failure is asked for again on the next attempt instead
+        of being replayed.
+
+        Raises:
+          ThrottledError: Still throttled after all retries. The public
+            methods let it through instead of returning their defaults.
+        """
+        key = None
+        if self.cache is not None:
+            key = cache_key(method, self.model, contents, config)
+            text = self.cache.get(key)
+            if text is not None:
+                return CachedResponse(text)
+
+        def request():
+            return self.client.models.generate_content(
+                model=self.model, contents=contents, config=config
+            )
+
+        if self.rate_control is None:
+            response = request()
+        else:
+            # Gemini quotas are per model, so the model is the endpoint
+            response = self.rate_control.call(self.model, request, _classify_error)
+
+        if key and _is_usable(response.text, usable):
+            # Errors raise before here
+            self.cache.put(key, response.text)
+        return response
 
     def classify_video_type(self, title: str, description: str) -> Dict[str, Any]:
         """
@@ -55,8 +159,8 @@ class GeminiClient:
 }}"""
 
         try:
-            response = self.client.models.generate_content(
-                model=self.model,
+            response = self._generate(
+                "classify_video_type",
                 contents=prompt,
                 config=types.GenerateContentConfig(
                     response_mime_type="application/json",
@@ -70,10 +174,123 @@ class GeminiClient:
                 "confidence": result.get("confidence", 0.0),
                 "reason": result.get("reason", ""),
             }
+        except ThrottledError:
+            raise
         except Exception as e:
             print(f"Error classifying video type: {e}")
             return {"type": "UNKNOWN", "confidence": 0.0, "reason": f"Error: {e}"}
 
+    def classify_video_types(
+        self, videos: List[Dict[str, str]], batch_size: int = CLASSIFY_BATCH_SIZE
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Classify many videos with batched requests.
+
+        Videos are sent `batch_size` at a time in one structured-output
+        request each. Videos missing from (or malformed in) a batch answer
+        are classified one by one with classify_video_type.
+
+        Args:
+          videos: Dicts with "video_id", "title" and "description"
+          batch_size: Videos per request
+
+        Returns:
+          video_id -> same shape as classify_video_type
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(videos), batch_size):
+            results.update(self._classify_batch(videos[start : start + batch_size]))
+
+        dropped = [video for video in videos if video["video_id"] not in results]
+        if dropped:
+            print(
+                f"  → {len(dropped)} videos missing from batch answer, retrying singly"
+            )
+        for video in dropped:
+            results[video["video_id"]] = self.classify_video_type(
+                video["title"], video["description"]
+            )
+
+        return results
+
+    def _classify_batch(
+        self, videos: List[Dict[str, str]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Classify one batch; returns only the valid entries of the answer."""
+        if len(videos) == 1:
+            video = videos[0]
+            return {
+                video["video_id"]: self.classify_video_type(
+                    video["title"], video["description"]
+                )
+            }
+
+        items = json.dumps(
+            [
+                {
+                    "video_id": video["video_id"],
+                    "title": video["title"],
+                    "description": video["description"][:BATCH_DESCRIPTION_CHARS],
+                }
+                for video in videos
+            ],
+            ensure_ascii=False,
+            indent=1,
+        )
+        prompt = f"""以下の{len(videos)}件のYouTube動画それぞれについて、動画のタイプを判定してください。
+
+動画一覧（JSON）:
+{items}
+
+判定基準:
+- SONG: VTuber/歌い手が楽曲をカバー・歌唱している「歌ってみた」動画
+- GAME: ゲーム実況やプレイ動画
+- UNKNOWN: その他（雑談、配信アーカイブ、企画動画など）
+
+すべての動画について、video_idをそのまま使って以下のJSON配列で回答してください:
+[
+  {{
+    "video_id": "入力と同じvideo_id",
+    "type": "SONG" | "GAME" | "UNKNOWN",
+    "confidence": 0.0-1.0,
+    "reason": "判定理由の簡潔な説明"
+  }}
+]"""
+
+        try:
+            response = self._generate(
+                "classify_video_types",
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    response_mime_type="application/json",
+                    response_schema=CLASSIFICATION_BATCH_SCHEMA,
+                    temperature=1,
+                ),
+                # An empty answer sends every video to single classification
+                usable=lambda answer: isinstance(answer, list) and bool(answer),
+            )
+            answer = json.loads(response.text)
+        except ThrottledError:
+            raise
+        except Exception as e:
+            print(f"Error classifying video batch: {e}")
+            return {}
+
+        requested = {video["video_id"] for video in videos}
+        results: Dict[str, Dict[str, Any]] = {}
+        for entry in answer if isinstance(answer, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            video_id = entry.get("video_id")
+            if video_id not in requested or entry.get("type") not in VIDEO_TYPES:
+                continue
+            results[video_id] = {
+                "type": entry["type"],
+                "confidence": entry.get("confidence", 0.0),
+                "reason": entry.get("reason", ""),
+            }
+        return results
+
     def extract_song_info(
         self, title: str, description: str, channel_name: str = ""
     ) -> Dict[str, Any]:
@@ -124,8 +341,8 @@ class GeminiClient:
 - original_url が見つからない場合は null を返してください"""
 
         try:
-            response = self.client.models.generate_content(
-                model=self.model,
+            response = self._generate(
+                "extract_song_info",
                 contents=prompt,
                 config=types.GenerateContentConfig(
                     # Enable Google Search grounding
@@ -133,6 +350,9 @@ class GeminiClient:
                     response_mime_type="application/json",
                     temperature=1,
                 ),
+                # Without a song title the enricher records a failed attempt
+                usable=lambda answer: isinstance(answer, dict)
+                and bool(answer.get("song_title")),
             )
 
             result = json.loads(response.text)
@@ -144,6 +364,8 @@ class GeminiClient:
                 "original_artists": result.get("original_artists", []),
                 "original_url": result.get("original_url"),
             }
+        except ThrottledError:
+            raise
         except Exception as e:
             print(f"Error extracting song info: {e}")
             return {
@@ -226,8 +448,8 @@ class GeminiClient:
 
         try:
             # Analyze YouTube video directly using Video Understanding API
-            response = self.client.models.generate_content(
-                model=self.model,
+            response = self._generate(
+                "analyze_video_characteristics",
                 contents=types.Content(
                     parts=[
                         types.Part(file_data=types.FileData(file_uri=youtube_url)),
@@ -248,6 +470,8 @@ class GeminiClient:
                 "surprising": result.get("surprising", 50),
                 "emotional": result.get("emotional", 50),
             }
+        except ThrottledError:
+            raise
         except Exception as e:
             print(f"Error analyzing video characteristics: {e}")
             # Return neutral defaults on error
@@ -315,8 +539,8 @@ class GeminiClient:
 - 固有名詞は絶対に含めない"""
 
         try:
-            response = self.client.models.generate_content(
-                model=self.model,
+            response = self._generate(
+                "extract_comment_keywords",
                 contents=prompt,
                 config=types.GenerateContentConfig(
                     response_mime_type="application/json",
@@ -336,6 +560,8 @@ class GeminiClient:
                 :20
             ]  # Limit to top 20
 
+        except ThrottledError:
+            raise
         except Exception as e:
             print(f"Error extracting comment keywords: {e}")
             return []
@@ -388,8 +614,8 @@ class GeminiClient:
 
         try:
             # Analyze YouTube video directly using Video Understanding API
-            response = self.client.models.generate_content(
-                model=self.model,
+            response = self._generate(
+                "extract_chorus_time",
                 contents=types.Content(
                     parts=[
                         types.Part(file_data=types.FileData(file_uri=youtube_url)),
@@ -409,6 +635,8 @@ class GeminiClient:
                 "confidence": result.get("confidence", 0.0),
                 "description": result.get("description", ""),
             }
+        except ThrottledError:
+            raise
         except Exception as e:
             print(f"Error extracting chorus time: {e}")
             return {
@@ -417,3 +645,25 @@ class GeminiClient:
                 "confidence": 0.0,
                 "description": f"Error: {e}",
             }
+
+
+def _classify_error(error: Exception) -> Optional[str]:
+    """Decide whether a failed generate_content call is worth retrying."""
+    if isinstance(error, errors.APIError):
+        if error.code in (429, 503):  # RESOURCE_EXHAUSTED / UNAVAILABLE
+            return THROTTLED
+        if error.code in (500, 502, 504):
+            return TRANSIENT
+        return None
+    if isinstance(error, httpx.TransportError):
+        return TRANSIENT
+    return None
+
+
+def _is_usable(text: Optional[str], usable: Callable[[Any], bool]) -> bool:
+    """Whether `text` is a JSON answer that `usable` accepts."""
+    try:
+        answer = json.loads(text or "")
+    except ValueError:
+        return False
+    return usable(answer)
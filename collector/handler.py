@@ -6,12 +6,22 @@ This handler can be invoked by EventBridge on a schedule or manually.
 Event format:
   {
     "channelUrl": "https://www.youtube.com/@handle",  // Optional: channel/video URL/handle/ID
+    "channelUrls": ["@handle1", "UC1234..."],          // Optional: several channels (default: TARGET_CHANNEL_IDS)
     "channelId": "UC1234...",                          // Optional: deprecated, use channelUrl
     "maxVideos": 100,                                  // Optional: limit number of videos fetched
     "maxSongVideos": 50,                               // Optional: limit SONG videos processed
-    "overwrite": true                                  // Optional: re-process existing videos (default: false)
+    "overwrite": true,                                 // Optional: re-process existing videos (default: false)
+    "incremental": true,                               // Optional: only list uploads newer than the last crawl (default: INCREMENTAL_CRAWL)
+    "resumeChannelUrls": ["@handle1"],                 // Set in continuations: channels to resume
+    "continuationDepth": 1                             // Set in continuations: runs since the first one
   }
 
+Channels are collected concurrently (CHANNEL_CONCURRENCY at a time). Work
+stops LAMBDA_TIME_RESERVE_SECONDS before the Lambda timeout; channels left
+unfinished are returned in the response's "continuation" event, which
+resumes them (first enriching videos the interrupted run already stored).
+With SELF_REINVOKE=true the function invokes itself with that event.
+
 Supported formats for channelUrl:
   - https://www.youtube.com/watch?v=VIDEO_ID (video URL - collects entire channel)
   - https://youtu.be/VIDEO_ID (short video URL - collects entire channel)
@@ -25,11 +35,15 @@ Supported formats for channelUrl:
 import json
 from typing import Any, Dict
 
+import boto3
+from batch_writer import BatchWriter
 from config import get_collector_settings
-from db import SingerVideoIndexRepository, VideoRepository
+from db import CatalogVersion, SingerVideoIndexRepository, VideoRepository
 from enricher import VideoEnricher
 from gemini_client import GeminiClient
-from run_once import collect_channel
+from preclassifier import PreClassifier
+from run_once import channel_collector, finish_run
+from scheduler import ChannelScheduler, TimeBudget, unfinished_channels
 from youtube_client import YouTubeClient
 
 
@@ -47,15 +61,24 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     print("Event:", json.dumps(event))
 
     settings = get_collector_settings()
-    youtube_client = YouTubeClient(settings.youtube_api_key)
-    video_repo = VideoRepository.from_settings(settings)
-    index_repo = SingerVideoIndexRepository.from_settings(settings)
-    gemini_client = GeminiClient(settings.gemini_api_key)
-    enricher = VideoEnricher(gemini_client, video_repo, index_repo, youtube_client)
+    youtube_client = YouTubeClient.from_settings(settings)
+    writer = BatchWriter.from_settings(settings)
+    video_repo = VideoRepository.from_settings(settings, writer)
+    index_repo = SingerVideoIndexRepository.from_settings(settings, writer)
+    gemini_client = GeminiClient.from_settings(settings)
+    enricher = VideoEnricher(
+        gemini_client,
+        video_repo,
+        index_repo,
+        youtube_client,
+        preclassifier=PreClassifier.from_settings(settings),
+    )
 
     # Determine which channels to collect
     channel_urls = []
-    if "channelUrl" in event and event["channelUrl"]:
+    if event.get("channelUrls"):
+        channel_urls = event["channelUrls"]
+    elif "channelUrl" in event and event["channelUrl"]:
         # Prefer new channelUrl parameter
         channel_urls = [event["channelUrl"]]
     elif "channelId" in event and event["channelId"]:
@@ -76,44 +99,73 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     max_videos = event.get("maxVideos", 0)
     max_song_videos = event.get("maxSongVideos", 0)
     overwrite = event.get("overwrite", False)
-
-    results = []
-    for channel_url in channel_urls:
-        try:
-            # Resolve URL/handle to canonical channel ID
-            print(f"Resolving channel: {channel_url}")
-            channel_id = youtube_client.resolve_channel_id(channel_url)
-            print(f"  → Channel ID: {channel_id}")
-
-            collect_channel(
-                channel_id,
-                youtube_client,
-                video_repo,
-                enricher,
-                max_videos,
-                max_song_videos,
-                overwrite,
-            )
-            results.append(
-                {
-                    "channel_url": channel_url,
-                    "channel_id": channel_id,
-                    "status": "success",
-                }
-            )
-        except ValueError as e:
-            # Invalid format or custom URL
-            print(f"Error resolving channel {channel_url}: {e}")
-            results.append(
-                {"channel_url": channel_url, "status": "error", "error": str(e)}
-            )
-        except Exception as e:
-            print(f"Error collecting channel {channel_url}: {e}")
-            results.append(
-                {"channel_url": channel_url, "status": "error", "error": str(e)}
-            )
+    incremental = event.get("incremental", settings.incremental_crawl)
+    resume = event.get("resumeChannelUrls", [])
+    depth = event.get("continuationDepth", 0)
+
+    scheduler = ChannelScheduler(
+        channel_collector(
+            youtube_client,
+            video_repo,
+            enricher,
+            max_videos,
+            max_song_videos,
+            overwrite,
+            settings.pipeline_workers,
+            incremental,
+        ),
+        settings.channel_concurrency,
+        TimeBudget.from_lambda_context(context, settings.lambda_time_reserve_seconds),
+    )
+    try:
+        results = scheduler.run(channel_urls, resume)
+    finally:
+        finish_run(writer, CatalogVersion.from_settings(settings), enricher)
+    print(
+        f"Batched writes: {writer.items_written} items in "
+        f"{writer.requests_sent} requests ({writer.writes_saved} round trips saved)"
+    )
+    if gemini_client.cache is not None:
+        print(f"Gemini cache: {gemini_client.cache.stats()}")
+    print(f"YouTube rate control:\n{youtube_client.rate_control.stats()}")
+    print(f"Gemini rate control:\n{gemini_client.rate_control.stats()}")
+
+    continuation = None
+    remaining, resume = unfinished_channels(results, resume)
+    if remaining:
+        continuation = {
+            "channelUrls": remaining,
+            "resumeChannelUrls": resume,
+            "maxVideos": max_videos,
+            "maxSongVideos": max_song_videos,
+            "overwrite": overwrite,
+            "incremental": incremental,
+            "continuationDepth": depth + 1,
+        }
+        print(f"Unfinished channels: {len(remaining)}")
+        if settings.self_reinvoke and depth < settings.max_continuations:
+            reinvoke(context, continuation, settings.aws_region)
 
     return {
         "statusCode": 200,
-        "body": json.dumps({"message": "Collection complete", "results": results}),
+        "body": json.dumps(
+            {
+                "message": (
+                    "Collection incomplete" if continuation else "Collection complete"
+                ),
+                "results": results,
+                "continuation": continuation,
+            }
+        ),
     }
+
+
+def reinvoke(context: Any, event: Dict[str, Any], region: str) -> None:
+    """Invoke this function asynchronously with `event`."""
+    client = boto3.client("lambda", region_name=region)
+    client.invoke(
+        FunctionName=context.invoked_function_arn,
+        InvocationType="Event",
+        Payload=json.dumps(event).encode(),
+    )
+    print(f"Continuing in a new invocation (depth {event['continuationDepth']})")
@@ -0,0 +1,139 @@
+"""
+Staged worker pipeline.
+
+Each stage has its own bounded pool of worker threads and a bounded input
+queue, so a slow stage (e.g. Gemini calls) applies backpressure to the ones
+before it instead of buffering the whole channel in memory. Stages hand
+results downstream as soon as they are ready, so fetching, storing,
+classification and analysis of different videos overlap.
+"""
+
+import sys
+import threading
+from queue import Queue
+from typing import Any, Callable, Iterable, List, Optional
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+class Stage:
+    """
+    One pipeline step.
+
+    `func` takes an item and returns an iterable of items for the next stage
+    (empty to drop the item, several to fan out, e.g. a chunk into videos).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], Optional[Iterable[Any]]],
+        workers: int = 1,
+    ):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+
+
+class Pipeline:
+    """Runs items through a sequence of stages on worker threads."""
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        queue_size: int = 0,
+        stop_event: Optional[threading.Event] = None,
+    ):
+        """
+        Args:
+          stages: Steps in order
+          queue_size: Input queue bound per stage (default: 2x its workers)
+          stop_event: Event that cancels the run when set, to stop several
+            pipelines together or from another thread (default: a new one)
+        """
+        self._stages = stages
+        self._queue_size = queue_size
+        self._stop = stop_event or threading.Event()
+
+    def stop(self) -> None:
+        """
+        Cancel the run: no new items are taken from the source, and items
+        still queued are discarded. Items already being processed finish.
+        """
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def run(self, items: Iterable[Any]) -> None:
+        """Feed `items` through every stage and wait until all are done."""
+        queues = [
+            Queue(maxsize=self._queue_size or stage.workers * 2)
+            for stage in self._stages
+        ]
+        threads: List[threading.Thread] = []
+
+        for index, stage in enumerate(self._stages):
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            remaining = [stage.workers]
+            lock = threading.Lock()
+
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(stage, queues[index], outbox, remaining, lock),
+                    name=f"{stage.name}-{n}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        try:
+            for item in items:
+                if self._stop.is_set():
+                    break
+                queues[0].put(item)
+        finally:
+            for _ in range(self._stages[0].workers):
+                queues[0].put(_DONE)
+
+        for thread in threads:
+            thread.join()
+
+    def _work(
+        self,
+        stage: Stage,
+        inbox: Queue,
+        outbox: Optional[Queue],
+        remaining: List[int],
+        lock: threading.Lock,
+    ) -> None:
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+            if self._stop.is_set():
+                continue
+
+            try:
+                results = stage.func(item) or ()
+                for result in results:
+                    if outbox is not None:
+                        outbox.put(result)
+            except Exception as e:
+                print(f"  ✗ {stage.name} failed: {e}", file=sys.stderr)
+
+        # The last worker of a stage closes the next stage's input
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last and outbox is not None:
+            next_workers = self._next_workers(stage)
+            for _ in range(next_workers):
+                outbox.put(_DONE)
+
+    def _next_workers(self, stage: Stage) -> int:
+        index = self._stages.index(stage)
+        return self._stages[index + 1].workers
@@ -0,0 +1,214 @@
+"""
+Local rule-based video type pre-classifier.
+
+Scores SONG / GAME / UNKNOWN from title and description keywords, the video
+duration and the channel's earlier classifications. Confident cases are
+settled without calling Gemini; ambiguous ones return None and go to
+GeminiClient.classify_video_type.
+
+Use scripts/preclassifier_report.py to compare predictions with stored
+video_type values before changing weights or the confidence threshold.
+"""
+
+import math
+import unicodedata
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+VIDEO_TYPES = ("SONG", "GAME", "UNKNOWN")
+
+# Keyword -> weight, matched case- and width-insensitively
+KEYWORDS: Dict[str, Dict[str, float]] = {
+    "SONG": {
+        "歌ってみた": 3.0,
+        "うたってみた": 3.0,
+        "covered by": 3.0,
+        "cover": 2.5,
+        "カバー": 2.0,
+        "オリジナル曲": 2.5,
+        "original song": 2.5,
+        "music video": 2.0,
+        "弾き語り": 2.0,
+        "mv": 1.5,
+        "歌唱": 1.0,
+    },
+    "GAME": {
+        "実況": 3.0,
+        "gameplay": 3.0,
+        "攻略": 2.5,
+        "ホラゲ": 2.5,
+        "マイクラ": 2.5,
+        "minecraft": 2.5,
+        "ゲーム": 1.5,
+        "プレイ": 1.5,
+    },
+    "UNKNOWN": {
+        "雑談": 3.0,
+        "切り抜き": 2.5,
+        "凸待ち": 2.5,
+        "歌枠": 2.5,
+        "#shorts": 2.5,
+        "告知": 2.0,
+        "生放送": 2.0,
+        "vlog": 2.0,
+        "配信": 1.5,
+        "アーカイブ": 1.5,
+    },
+}
+
+# Descriptions carry boilerplate (links, credits), so they count for less
+DESCRIPTION_WEIGHT = 0.3
+
+# Channel history only counts once it has this many classified videos
+MIN_HISTORY = 5
+
+
+def _normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+class PreClassifier:
+    """Settles confident video type cases locally."""
+
+    def __init__(self, confidence: float = 0.9, history_weight: float = 1.0):
+        self.confidence = confidence
+        self.history_weight = history_weight
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["PreClassifier"]:
+        """Create the pre-classifier, or None if disabled in settings."""
+        if not settings.preclassifier_enabled:
+            return None
+        return cls(settings.preclassifier_confidence)
+
+    def scores(
+        self,
+        title: str,
+        description: str,
+        duration: Optional[int],
+        channel_history: Optional[Mapping[str, int]] = None,
+    ) -> Tuple[Dict[str, float], List[str]]:
+        """
+        Score each video type.
+
+        Returns:
+          (score per type, matched keywords)
+        """
+        scores = dict.fromkeys(VIDEO_TYPES, 0.0)
+        matched: List[str] = []
+        title = _normalize(title)
+        description = _normalize(description)
+
+        for video_type, keywords in KEYWORDS.items():
+            for keyword, weight in keywords.items():
+                if keyword in title:
+                    scores[video_type] += weight
+                    matched.append(keyword)
+                elif keyword in description:
+                    scores[video_type] += weight * DESCRIPTION_WEIGHT
+                    matched.append(keyword)
+
+        # Covers are mostly 1.5-7 minutes; longer uploads are rarely songs
+        if duration is not None:
+            if 90 <= duration <= 420:
+                scores["SONG"] += 1.0
+            elif duration > 600:
+                scores["SONG"] -= 1.5
+
+        # The channel's earlier classifications as a prior
+        total = sum(channel_history.values()) if channel_history else 0
+        if total >= MIN_HISTORY:
+            for video_type in VIDEO_TYPES:
+                share = (channel_history.get(video_type, 0) + 1) / (total + 3)
+                scores[video_type] += self.history_weight * math.log(share * 3)
+
+        return scores, matched
+
+    def classify(
+        self,
+        title: str,
+        description: str,
+        duration: Optional[int],
+        channel_history: Optional[Mapping[str, int]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Classify a video if the rules are confident enough.
+
+        Args:
+          title: Video title
+          description: Video description
+          duration: Duration in seconds
+          channel_history: Counts of earlier video types on the channel
+
+        Returns:
+          Same shape as GeminiClient.classify_video_type, or None if the
+          case is ambiguous
+        """
+        scores, matched = self.scores(title, description, duration, channel_history)
+        # Never settle on duration and history alone
+        if not matched:
+            return None
+
+        # Softmax over the scores
+        top = max(scores.values())
+        weights = {t: math.exp(score - top) for t, score in scores.items()}
+        total = sum(weights.values())
+        video_type = max(weights, key=weights.get)
+        confidence = weights[video_type] / total
+
+        if confidence < self.confidence:
+            return None
+
+        return {
+            "type": video_type,
+            "confidence": confidence,
+            "reason": f"pre-classified ({', '.join(matched)})",
+        }
+
+
+def confusion_matrix(
+    pairs: Iterable[Tuple[str, Optional[str]]],
+) -> Dict[str, Dict[str, int]]:
+    """
+    Count (actual, predicted) pairs. Deferred predictions (None) are counted
+    in the "GEMINI" column.
+    """
+    matrix = {
+        actual: dict.fromkeys(VIDEO_TYPES + ("GEMINI",), 0) for actual in VIDEO_TYPES
+    }
+    for actual, predicted in pairs:
+        if actual not in matrix:
+            continue
+        matrix[actual][predicted or "GEMINI"] += 1
+    return matrix
+
+
+def format_report(matrix: Dict[str, Dict[str, int]]) -> str:
+    """Render a confusion matrix with coverage and precision figures."""
+    columns = VIDEO_TYPES + ("GEMINI",)
+    lines = ["actual \\ predicted".ljust(20) + "".join(c.rjust(9) for c in columns)]
+    for actual in VIDEO_TYPES:
+        row = matrix[actual]
+        lines.append(actual.ljust(20) + "".join(str(row[c]).rjust(9) for c in columns))
+
+    total = sum(sum(row.values()) for row in matrix.values())
+    settled = sum(matrix[a][p] for a in VIDEO_TYPES for p in VIDEO_TYPES)
+    correct = sum(matrix[t][t] for t in VIDEO_TYPES)
+
+    lines.append("")
+    if total:
+        lines.append(
+            f"Settled locally: {settled}/{total} ({settled / total:.1%}) "
+            f"- Gemini calls saved"
+        )
+    if settled:
+        lines.append(
+            f"Accuracy of settled: {correct}/{settled} ({correct / settled:.1%})"
+        )
+    for predicted in VIDEO_TYPES:
+        column = sum(matrix[a][predicted] for a in VIDEO_TYPES)
+        if column:
+            precision = matrix[predicted][predicted] / column
+            lines.append(
+                f"  {predicted} precision: {precision:.1%} ({column} predicted)"
+            )
+    return "\n".join(lines)
@@ -0,0 +1,292 @@
+"""
+Client-side rate control shared by API clients running on worker threads.
+
+- TokenBucket: fixed-rate limiter with bursts.
+- AdaptiveLimiter: token bucket plus an AIMD concurrency limit for one
+  endpoint. Throttle responses (429/503) halve the concurrency limit and
+  the request rate; successes ramp them back up to the configured ceiling.
+- RateController: per-endpoint AdaptiveLimiters, exponential retry with
+  full jitter and throttle/retry counters. Calls still failing after the
+  last attempt raise ThrottledError, so callers never mistake a throttled
+  call for an empty answer.
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Error kinds returned by the classify function passed to RateController.call
+THROTTLED = "throttled"  # The server asked us to slow down
+TRANSIENT = "transient"  # Worth retrying, but not a rate signal
+
+# AIMD tuning: multiplicative decrease on throttle, rate floor, rate step
+DECREASE_FACTOR = 0.5
+MIN_RATE_FRACTION = 0.05
+RATE_INCREASE_FRACTION = 0.05
+
+
+class TokenBucket:
+    """
+    Allows `rate` acquisitions per second on average, with bursts of up to
+    `capacity`. `acquire` blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def set_rate(self, rate: float) -> None:
+        """Change the sustained rate; tokens accrued so far are kept."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available without waiting."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until `tokens` are available and take them.
+
+        Returns:
+          Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+
+class ThrottledError(RuntimeError):
+    """A call was still throttled or failing transiently after all retries."""
+
+    def __init__(self, endpoint: str, attempts: int, last_error: Exception):
+        super().__init__(
+            f"{endpoint}: giving up after {attempts} attempts: {last_error}"
+        )
+        self.endpoint = endpoint
+        self.attempts = attempts
+        self.last_error = last_error
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    def __init__(
+        self, max_attempts: int = 5, base_delay: float = 1.0, max_delay: float = 60.0
+    ):
+        self.max_attempts = max(max_attempts, 1)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after failed attempt number `attempt` (1-based)."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+
+class AdaptiveLimiter:
+    """
+    Token bucket and AIMD concurrency limit for one endpoint.
+
+    Both start at the configured ceiling. A throttle halves the concurrency
+    limit and the rate; each success adds 1/limit to the concurrency limit
+    (about +1 per round of calls) and a small step to the rate.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0, max_concurrency: int = 4):
+        self.max_rate = rate
+        self.max_concurrency = max(max_concurrency, 1)
+        self.bucket = TokenBucket(rate, burst)
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self) -> Iterator[float]:
+        """
+        Hold a concurrency slot and one token for the duration of a call.
+
+        Yields:
+          Monotonic time the call started, to pass to on_throttle
+        """
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+        try:
+            self.bucket.acquire()
+            yield time.monotonic()
+        finally:
+            with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+
+    def on_success(self) -> None:
+        with self._cond:
+            if self.limit < self.max_concurrency:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+                self._cond.notify_all()
+            rate = self.bucket.rate
+        if rate < self.max_rate:
+            self.bucket.set_rate(
+                min(self.max_rate, rate + self.max_rate * RATE_INCREASE_FRACTION)
+            )
+
+    def on_throttle(self, started: float) -> None:
+        """
+        Back off after a throttle response.
+
+        Calls that started before the previous decrease were sent at the old
+        limit, so their throttles don't cut it again.
+        """
+        with self._cond:
+            if started < self._last_decrease:
+                return
+            self._last_decrease = time.monotonic()
+            self.limit = max(1.0, self.limit * DECREASE_FACTOR)
+            rate = self.bucket.rate
+        self.bucket.set_rate(
+            max(self.max_rate * MIN_RATE_FRACTION, rate * DECREASE_FACTOR)
+        )
+
+
+class RateController:
+    """
+    Rate control for one API: a limiter per endpoint, created on first use
+    with the same ceiling, plus retries and per-endpoint counters.
+    """
+
+    COUNTERS = ("calls", "throttled", "transient", "retries", "gave_up")
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1.0,
+        max_concurrency: int = 4,
+        retry: Optional[RetryPolicy] = None,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.retry = retry or RetryPolicy()
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, endpoint: str) -> AdaptiveLimiter:
+        with self._lock:
+            if endpoint not in self._limiters:
+                self._limiters[endpoint] = AdaptiveLimiter(
+                    self.rate, self.burst, self.max_concurrency
+                )
+                self._metrics[endpoint] = dict.fromkeys(self.COUNTERS + ("waited",), 0)
+            return self._limiters[endpoint]
+
+    def call(
+        self,
+        endpoint: str,
+        func: Callable[[], T],
+        classify: Callable[[Exception], Optional[str]],
+    ) -> T:
+        """
+        Run `func` under the endpoint's limiter, retrying retryable errors.
+
+        Args:
+          endpoint: Limiter and metrics key
+          func: The request
+          classify: Maps an exception to THROTTLED, TRANSIENT or None
+            (not retryable; re-raised as is)
+
+        Raises:
+          ThrottledError: The last attempt was still throttled or failing
+        """
+        limiter = self.limiter(endpoint)
+        last_error: Optional[Exception] = None
+
+        for attempt in range(1, self.retry.max_attempts + 1):
+            requested = time.monotonic()
+            with limiter.slot() as started:
+                self._count(endpoint, "waited", started - requested)
+                self._count(endpoint, "calls")
+                try:
+                    result = func()
+                except Exception as e:
+                    kind = classify(e)
+                    if kind is None:
+                        raise
+                    last_error = e
+                else:
+                    limiter.on_success()
+                    return result
+
+            if kind == THROTTLED:
+                self._count(endpoint, "throttled")
+                limiter.on_throttle(started)
+            else:
+                self._count(endpoint, "transient")
+
+            if attempt < self.retry.max_attempts:
+                self._count(endpoint, "retries")
+                # Sleep outside the slot so other calls can use it
+                time.sleep(self.retry.delay(attempt))
+
+        self._count(endpoint, "gave_up")
+        raise ThrottledError(endpoint, self.retry.max_attempts, last_error) from (
+            last_error
+        )
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Counters per endpoint, plus the current limits."""
+        with self._lock:
+            snapshot = {
+                endpoint: dict(counters) for endpoint, counters in self._metrics.items()
+            }
+            limiters = dict(self._limiters)
+        for endpoint, limiter in limiters.items():
+            snapshot[endpoint]["concurrency"] = limiter.limit
+            snapshot[endpoint]["rate"] = limiter.bucket.rate
+        return snapshot
+
+    def stats(self) -> str:
+        lines = []
+        for endpoint, m in sorted(self.metrics().items()):
+            lines.append(
+                f"  {endpoint}: {m['calls']:.0f} calls, {m['throttled']:.0f} throttled, "
+                f"{m['transient']:.0f} transient errors, {m['retries']:.0f} retries, "
+                f"{m['gave_up']:.0f} gave up, waited {m['waited']:.1f}s "
+                f"(now {m['concurrency']:.1f} concurrent, {m['rate']:.2f} req/s)"
+            )
+        return "\n".join(lines) or "  no calls"
+
+    def _count(self, endpoint: str, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._metrics[endpoint][name] += amount
@@ -0,0 +1,135 @@
+"""
+Statistics-only refresh of view/like/comment counts.
+
+Re-reads the counts of stored videos with `videos?part=statistics`
+(50 videos per request, 1 quota unit each) and writes only the count
+attributes to the videos table and the singer-videos index, without
+touching enrichment. Recent uploads are refreshed first, since their counts
+change fastest.
+
+Usage:
+  uv run python -m collector.refresh_stats --channel-id UC1234... --max-videos 500
+"""
+
+import argparse
+import sys
+from typing import Dict, List
+
+from batch_writer import BatchWriter
+from config import get_collector_settings
+from db import CatalogVersion, SingerVideoIndexRepository, VideoRepository
+from more_itertools import chunked
+from run_once import finish_run
+from youtube_client import YouTubeClient
+
+# videos.list accepts at most 50 IDs per request
+STATISTICS_BATCH_SIZE = 50
+
+
+def refresh_channel(
+    channel_id: str,
+    youtube_client: YouTubeClient,
+    video_repo: VideoRepository,
+    index_repo: SingerVideoIndexRepository,
+    max_videos: int = 0,
+) -> Dict[str, int]:
+    """
+    Refresh the counts of a channel's stored videos.
+
+    Args:
+      channel_id: YouTube channel ID
+      youtube_client: YouTube API client
+      video_repo: DynamoDB repository
+      index_repo: SingerVideoIndexRepository
+      max_videos: Refresh only the newest N videos (0 = no limit)
+
+    Returns:
+      Counts of "videos" updated, "index_records" updated and "missing"
+      videos (deleted or private on YouTube)
+    """
+    targets = video_repo.list_statistics_targets(channel_id)
+    if max_videos > 0:
+        targets = targets[:max_videos]
+    print(f"Refreshing statistics of {len(targets)} videos in {channel_id}")
+
+    totals = {"videos": 0, "index_records": 0, "missing": 0}
+    for chunk in chunked(targets, STATISTICS_BATCH_SIZE):
+        statistics = youtube_client.fetch_video_statistics(
+            [target["video_id"] for target in chunk]
+        )
+        totals["missing"] += len(chunk) - len(statistics)
+        totals["videos"] += video_repo.update_statistics(channel_id, statistics)
+        totals["index_records"] += index_repo.update_statistics(
+            [target for target in chunk if target["singers"]], statistics
+        )
+
+    print(
+        f"  ✓ {totals['videos']} videos, {totals['index_records']} index records "
+        f"updated ({totals['missing']} no longer available)"
+    )
+    return totals
+
+
+def main(channel_ids: List[str], max_videos: int = 0) -> None:
+    """
+    Main entry point for the statistics refresh.
+
+    Args:
+      channel_ids: List of YouTube channel IDs to refresh
+      max_videos: Newest videos to refresh per channel (0 = no limit)
+    """
+    settings = get_collector_settings()
+
+    youtube_client = YouTubeClient.from_settings(settings)
+    writer = BatchWriter.from_settings(settings)
+    video_repo = VideoRepository.from_settings(settings, writer)
+    index_repo = SingerVideoIndexRepository.from_settings(settings, writer)
+
+    try:
+        for channel_id in channel_ids:
+            try:
+                refresh_channel(
+                    channel_id, youtube_client, video_repo, index_repo, max_videos
+                )
+            except Exception as e:
+                print(f"\nError refreshing channel {channel_id}: {e}", file=sys.stderr)
+                continue
+    finally:
+        finish_run(writer, CatalogVersion.from_settings(settings))
+    print(
+        f"\nBatched writes: {writer.items_written} items in "
+        f"{writer.requests_sent} requests ({writer.writes_saved} round trips saved)"
+    )
+    print(f"YouTube rate control:\n{youtube_client.rate_control.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Refresh view/like/comment counts of stored videos"
+    )
+    parser.add_argument(
+        "--channel-id",
+        type=str,
+        action="append",
+        dest="channel_ids",
+        help="YouTube channel ID to refresh (can be specified multiple times)",
+    )
+    parser.add_argument(
+        "--max-videos",
+        type=int,
+        default=0,
+        help="Refresh only the newest N videos per channel (default: no limit)",
+    )
+
+    args = parser.parse_args()
+
+    if not args.channel_ids:
+        # Use target channels from config if none specified
+        settings = get_collector_settings()
+        if not settings.target_channel_ids:
+            print("Error: No channel IDs specified", file=sys.stderr)
+            print("Use --channel-id or set TARGET_CHANNEL_IDS in .env", file=sys.stderr)
+            sys.exit(1)
+        args.channel_ids = settings.target_channel_ids
+
+    main(args.channel_ids, args.max_videos)
@@ -16,15 +16,53 @@ Supported URL formats:
 
 import argparse
 import sys
-import time
-from typing import List
+import threading
+from contextlib import closing
+from typing import Any, Callable, Dict, List, Optional
 
+from batch_writer import BatchWriter
 from config import get_collector_settings
-from db import SingerVideoIndexRepository, VideoRepository
+from db import CatalogVersion, SingerVideoIndexRepository, VideoRepository
 from enricher import VideoEnricher
 from gemini_client import GeminiClient
+from pipeline import Pipeline, Stage
 from more_itertools import chunked
-from youtube_client import YouTubeClient
+from preclassifier import PreClassifier
+from scheduler import INTERRUPTED, ChannelScheduler
+from youtube_client import AsyncYouTubeClient, CrawlProgress, YouTubeClient
+
+
+class SongQuota:
+    """
+    Enforces --max-song-videos across concurrent workers.
+
+    A SONG video reserves a slot when it is classified and completes it once
+    enriched; slots of videos that fail are released for later videos.
+    """
+
+    def __init__(self, limit: int = 0):
+        self.limit = limit
+        self._completed = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> bool:
+        with self._lock:
+            if self.limit > 0 and self._completed + self._in_flight >= self.limit:
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def complete(self) -> bool:
+        """Count a finished SONG video; True when the limit was just reached."""
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+            return self.limit > 0 and self._completed == self.limit
 
 
 def collect_channel(
@@ -35,10 +73,20 @@ def collect_channel(
     max_videos: int = 0,
     max_song_videos: int = 0,
     overwrite: bool = False,
-) -> None:
+    workers: int = 4,
+    incremental: bool = False,
+    resume_pending: bool = False,
+    stop: Optional[threading.Event] = None,
+) -> bool:
     """
     Collect videos from a single channel, store in DynamoDB, and enrich.
 
+    Video details are discovered with AsyncYouTubeClient, which overlaps
+    playlist paging with detail fetching, and flow through a staged
+    pipeline (store, classify, extract song info, AI analysis) with
+    `workers` threads for each Gemini stage; the clients' rate control
+    paces the requests.
+
     Args:
       channel_id: YouTube channel ID
       youtube_client: YouTube API client
@@ -47,6 +95,18 @@ def collect_channel(
       max_videos: Maximum number of videos to fetch (0 = no limit)
       max_song_videos: Maximum number of SONG videos to process (0 = no limit)
       overwrite: Re-process existing videos (default: False)
+      workers: Worker threads per enrichment stage (default: 4)
+      incremental: List only uploads newer than the channel's high-water
+        mark instead of the whole playlist (default: False). The mark is
+        advanced after every crawl that lists and stores all new videos.
+      resume_pending: First enrich the channel's stored videos that still
+        have enrichment work left, e.g. after an interrupted run
+      stop: Event that interrupts the collection when set (e.g. by
+        ChannelScheduler when the time budget runs out). Videos already
+        stored stay pending and are picked up with `resume_pending`
+
+    Returns:
+      False if the collection was interrupted by `stop`, True otherwise
     """
     print(f"Fetching channel info: {channel_id}")
 
@@ -64,103 +124,242 @@ def collect_channel(
         print(f"  ✗ Failed to fetch channel info: {e}", file=sys.stderr)
         channel_info = {"channel_name": "", "subscriber_count": 0}
 
-    print(f"\nFetching video IDs from channel: {channel_id}")
-
-    # Fetch all video IDs from the channel
-    all_video_ids = youtube_client.fetch_video_ids_from_channel(
-        channel_id, max_videos=max_videos
-    )
-    print(f"Found {len(all_video_ids)} videos in channel")
-
     # Determine which videos to process
+    mark = None
+    if incremental and not overwrite:
+        mark = video_repo.get_high_water_mark(channel_id)
+        if not mark:
+            print("Incremental mode: no high-water mark yet, listing all videos")
+
     if overwrite:
         # Overwrite mode: process all videos
-        videos_to_process = list(all_video_ids)
-        print(
-            f"Overwrite mode: Processing all {len(videos_to_process)} videos (including existing)"
-        )
+        existing_video_ids = set()
+        print("Overwrite mode: Processing all videos (including existing)")
+    elif mark:
+        # Incremental mode: stop at the newest video of the last crawl and
+        # check the few IDs above it per page instead of listing the table
+        existing_video_ids = set()
+        print(f"Incremental mode: listing uploads after {mark[1]} ({mark[0]})")
     else:
         # Normal mode: only new videos
         existing_video_ids = video_repo.list_existing_video_ids(channel_id)
         print(f"Already stored: {len(existing_video_ids)} videos")
 
-        videos_to_process = list(all_video_ids - existing_video_ids)
-        print(f"New videos to collect: {len(videos_to_process)}")
-
-    if not videos_to_process:
-        print("No videos to process")
-        return
-
-    # Fetch videos in chunks of 50 (YouTube API limit)
-    enriched_count = 0
-    song_count = 0
-    game_count = 0
-    unknown_count = 0
-    should_stop = False
-
-    for i, chunk in enumerate(chunked(videos_to_process, 50)):
-        if should_stop:
-            break
-
-        chunk_list = list(chunk)
-        print(f"\nProcessing chunk {i+1}: {len(chunk_list)} videos")
-
-        videos = youtube_client.fetch_videos(chunk_list)
-        print(f"Fetched {len(videos)} video details")
-
-        # Store and enrich each video
-        for video in videos:
-            try:
-                video_repo.upsert_video(video)
-                print(f"  ✓ Stored: {video.video_id} - {video.title[:50]}")
-
-                # Enrich the video immediately after storing
-                try:
-                    video_type = enricher.enrich_video(
-                        channel_id, video.video_id, channel_info.get("channel_name", "")
-                    )
-
-                    if video_type:
-                        enriched_count += 1
-                        # Count by type
-                        if video_type == "SONG":
-                            song_count += 1
-                            if max_song_videos > 0:
-                                print(f"    [SONG {song_count}/{max_song_videos}]")
-                            else:
-                                print(f"    [SONG {song_count}]")
-
-                            # Check if we reached the SONG limit
-                            if max_song_videos > 0 and song_count >= max_song_videos:
-                                print(
-                                    f"\n  → Reached limit of {max_song_videos} SONG videos"
-                                )
-                                print(f"  → Skipping remaining videos")
-                                should_stop = True
-                                break
-                        elif video_type == "GAME":
-                            game_count += 1
-                            print(f"    [GAME]")
-                        elif video_type == "UNKNOWN":
-                            unknown_count += 1
-                            print(f"    [UNKNOWN]")
-
-                    # Rate limit: 1 request per second
-                    time.sleep(1.0)
-                except Exception as enrich_error:
-                    print(
-                        f"  ✗ Enrichment failed for {video.video_id}: {enrich_error}",
-                        file=sys.stderr,
-                    )
-
-            except Exception as e:
-                print(f"  ✗ Failed to store {video.video_id}: {e}", file=sys.stderr)
+    print(f"\nFetching videos from channel: {channel_id}")
+
+    quota = SongQuota(max_song_videos)
+    stop = stop or threading.Event()
+    limit_reached = threading.Event()
+    counts = {"enriched": 0, "SONG": 0, "GAME": 0, "UNKNOWN": 0}
+    counts_lock = threading.Lock()
+
+    def count(video_type: str) -> int:
+        with counts_lock:
+            counts["enriched"] += 1
+            counts[video_type] = counts.get(video_type, 0) + 1
+            return counts[video_type]
+
+    def finish_song(video_id: str) -> None:
+        song_number = count("SONG")
+        if max_song_videos > 0:
+            print(f"    [SONG {song_number}/{max_song_videos}] {video_id}")
+        else:
+            print(f"    [SONG {song_number}] {video_id}")
+
+        if quota.complete():
+            print(f"\n  → Reached limit of {max_song_videos} SONG videos")
+            print(f"  → Skipping remaining videos")
+            limit_reached.set()
+            stop.set()
+
+    failed_stores = [0]
+
+    # Stage 1: store the whole chunk with batched writes; the stored records
+    # go on to classification without being read back
+    def store(videos):
+        try:
+            records = video_repo.batch_upsert_videos(videos)
+        except Exception:
+            with counts_lock:
+                failed_stores[0] += 1
+            raise
+        print(f"  ✓ Stored {len(records)} videos")
+        return [records]
+
+    # Stage 2: classify the chunk with batched Gemini requests
+    def classify_records(records):
+        video_types = enricher.classify_many(channel_id, records)
+
+        songs = []
+        for record in records:
+            video_type = video_types.get(record.video_id, "")
+            if video_type == "SONG":
+                # Skipped when SONG videos in flight already fill the limit
+                if quota.reserve():
+                    songs.append(record)
+            elif video_type:
+                count(video_type)
+                print(f"    [{video_type}] {record.video_id}")
+        return songs
+
+    # Stage 3: extract song information
+    def extract_song(record):
+        try:
+            song_info = enricher.extract_song(
+                channel_id, record, channel_info.get("channel_name", "")
+            )
+        except Exception:
+            quota.release()
+            raise
+
+        if not song_info:
+            finish_song(record.video_id)
+            return []
+        return [(record, song_info)]
+
+    # Stage 4: AI analysis, then store the enriched video and index records
+    def analyze(args):
+        record, song_info = args
+        try:
+            enricher.analyze_and_store(
+                channel_id, record, song_info, channel_info.get("channel_icon_url")
+            )
+        except Exception:
+            quota.release()
+            raise
+        finish_song(record.video_id)
+        return []
+
+    enrich_stages = [
+        Stage("extract_song", extract_song, workers),
+        Stage("analyze", analyze, workers),
+    ]
+
+    if resume_pending:
+        # Videos stored by an interrupted run, read from the enrichment GSI
+        pending = video_repo.list_pending_videos(channel_id)
+        print(f"Resuming enrichment of {len(pending)} pending videos")
+        Pipeline(
+            [Stage("classify", classify_records, workers)] + enrich_stages,
+            stop_event=stop,
+        ).run(chunked(pending, 50))
+
+    pipeline = Pipeline(
+        [Stage("store", store), Stage("classify", classify_records, workers)]
+        + enrich_stages,
+        stop_event=stop,
+    )
+    # New videos' details, one chunk per playlist page (50 IDs, the API limit)
+    progress = CrawlProgress()
+    chunks = AsyncYouTubeClient(youtube_client).channel_video_chunks(
+        channel_id,
+        max_videos=max_videos,
+        skip_ids=existing_video_ids,
+        since=mark,
+        known_ids=(
+            (lambda video_ids: video_repo.existing_video_ids(channel_id, video_ids))
+            if mark
+            else None
+        ),
+        progress=progress,
+    )
+    # Closing the source cancels discovery once the pipeline stops early
+    with closing(chunks):
+        if not stop.is_set():
+            pipeline.run(chunks)
+    print(f"Listed {progress.listed} videos in channel")
+
+    # Only a crawl that stored everything newer than the old mark moves it;
+    # otherwise the next incremental run would skip the unstored videos
+    if progress.complete and not pipeline.stopped and not failed_stores[0]:
+        if progress.newest:
+            video_repo.advance_high_water_mark(channel_id, *progress.newest)
+    elif incremental:
+        print("  → Crawl incomplete, high-water mark not advanced")
+
+    interrupted = stop.is_set() and not limit_reached.is_set()
+    if interrupted:
+        print("  → Interrupted, stored videos stay pending for the next run")
+
+    enriched_count = counts["enriched"]
+    song_count = counts["SONG"]
+    game_count = counts["GAME"]
+    unknown_count = counts["UNKNOWN"]
 
     print(f"\nCollection complete!")
     print(f"  Total videos processed: {enriched_count}")
     print(f"  SONG videos: {song_count}")
     print(f"  GAME videos: {game_count}")
     print(f"  UNKNOWN videos: {unknown_count}")
+    return not interrupted
+
+
+def channel_collector(
+    youtube_client: YouTubeClient,
+    video_repo: VideoRepository,
+    enricher: VideoEnricher,
+    max_videos: int = 0,
+    max_song_videos: int = 0,
+    overwrite: bool = False,
+    workers: int = 4,
+    incremental: bool = False,
+) -> Callable[[str, bool, threading.Event], Dict[str, Any]]:
+    """
+    Build the per-channel job for ChannelScheduler: resolve the channel
+    URL/handle, then collect_channel with the given options.
+    """
+
+    def collect(
+        channel_url: str, resume: bool, stop: threading.Event
+    ) -> Dict[str, Any]:
+        # Resolve URL/handle to canonical channel ID
+        print(f"Resolving channel: {channel_url}")
+        channel_id = youtube_client.resolve_channel_id(channel_url)
+        print(f"  → Channel ID: {channel_id}\n")
+
+        finished = collect_channel(
+            channel_id,
+            youtube_client,
+            video_repo,
+            enricher,
+            max_videos,
+            max_song_videos,
+            overwrite,
+            workers,
+            incremental,
+            resume_pending=resume,
+            stop=stop,
+        )
+        return {
+            "channel_id": channel_id,
+            "status": "success" if finished else INTERRUPTED,
+        }
+
+    return collect
+
+
+def finish_run(
+    writer: BatchWriter,
+    catalog_version: CatalogVersion,
+    enricher: Optional[VideoEnricher] = None,
+) -> None:
+    """
+    Wind down a collector run, whether it finished or raised: stop the
+    enricher (if any), send the buffered writes and bump the catalog version.
+
+    Each step runs even if the one before it raises; in particular the
+    version is published even if the flush reports failed batches, so the
+    backend still picks up the writes that did land.
+    """
+    try:
+        if enricher is not None:
+            enricher.close()
+    finally:
+        try:
+            writer.flush()
+        finally:
+            # Bump the catalog version once all writes have landed
+            catalog_version.publish()
 
 
 def main(
@@ -168,6 +367,7 @@ def main(
     max_videos: int = 0,
     max_song_videos: int = 0,
     overwrite: bool = False,
+    incremental: bool = False,
 ) -> None:
     """
     Main entry point for the collector.
@@ -177,38 +377,50 @@ def main(
       max_videos: Maximum videos per channel (0 = no limit)
       max_song_videos: Maximum SONG videos per channel (0 = no limit)
       overwrite: Re-process existing videos (default: False)
+      incremental: Only list uploads newer than each channel's high-water mark
     """
     settings = get_collector_settings()
 
-    youtube_client = YouTubeClient(settings.youtube_api_key)
-    video_repo = VideoRepository.from_settings(settings)
-    index_repo = SingerVideoIndexRepository.from_settings(settings)
-    gemini_client = GeminiClient(settings.gemini_api_key)
-    enricher = VideoEnricher(gemini_client, video_repo, index_repo, youtube_client)
+    youtube_client = YouTubeClient.from_settings(settings)
+    # One writer shared by both repositories so their writes batch together
+    writer = BatchWriter.from_settings(settings)
+    video_repo = VideoRepository.from_settings(settings, writer)
+    index_repo = SingerVideoIndexRepository.from_settings(settings, writer)
+    gemini_client = GeminiClient.from_settings(settings)
+    enricher = VideoEnricher(
+        gemini_client,
+        video_repo,
+        index_repo,
+        youtube_client,
+        preclassifier=PreClassifier.from_settings(settings),
+    )
 
-    for channel_url in channel_urls:
-        try:
-            # Resolve URL/handle to canonical channel ID
-            print(f"Resolving channel: {channel_url}")
-            channel_id = youtube_client.resolve_channel_id(channel_url)
-            print(f"  → Channel ID: {channel_id}\n")
-
-            collect_channel(
-                channel_id,
-                youtube_client,
-                video_repo,
-                enricher,
-                max_videos,
-                max_song_videos,
-                overwrite,
-            )
-        except ValueError as e:
-            # Invalid format or custom URL
-            print(f"Error: {e}", file=sys.stderr)
-            continue
-        except Exception as e:
-            print(f"Error collecting channel {channel_url}: {e}", file=sys.stderr)
-            continue
+    # CHANNEL_CONCURRENCY channels at a time; no time budget locally
+    scheduler = ChannelScheduler(
+        channel_collector(
+            youtube_client,
+            video_repo,
+            enricher,
+            max_videos,
+            max_song_videos,
+            overwrite,
+            settings.pipeline_workers,
+            incremental,
+        ),
+        settings.channel_concurrency,
+    )
+    try:
+        scheduler.run(channel_urls)
+    finally:
+        finish_run(writer, CatalogVersion.from_settings(settings), enricher)
+    print(
+        f"\nBatched writes: {writer.items_written} items in "
+        f"{writer.requests_sent} requests ({writer.writes_saved} round trips saved)"
+    )
+    if gemini_client.cache is not None:
+        print(f"Gemini cache: {gemini_client.cache.stats()}")
+    print(f"YouTube rate control:\n{youtube_client.rate_control.stats()}")
+    print(f"Gemini rate control:\n{gemini_client.rate_control.stats()}")
 
 
 if __name__ == "__main__":
@@ -245,6 +457,15 @@ if __name__ == "__main__":
         "WARNING: This will consume YouTube and Gemini API quota for all videos.",
     )
 
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        default=False,
+        help="Only list uploads newer than the newest video of the last complete "
+        "crawl (kept in the channel's CHANNEL_INFO record), instead of the whole "
+        "uploads playlist",
+    )
+
     args = parser.parse_args()
 
     if not args.channel_urls:
@@ -258,4 +479,10 @@ if __name__ == "__main__":
             sys.exit(1)
         args.channel_urls = settings.target_channel_ids
 
-    main(args.channel_urls, args.max_videos, args.max_song_videos, args.overwrite)
+    main(
+        args.channel_urls,
+        args.max_videos,
+        args.max_song_videos,
+        args.overwrite,
+        args.incremental,
+    )
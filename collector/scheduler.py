@@ -0,0 +1,147 @@
+"""
+Concurrent multi-channel collection under a time budget.
+
+Channels run on a bounded thread pool and share the API clients, so the
+clients' rate control paces the combined requests. When the time budget
+runs out (on Lambda: the remaining invocation time minus a reserve for
+in-flight work and the final flush), every running channel is stopped and
+channels that haven't started are skipped. Both are reported as unfinished
+so the next run can continue with them.
+
+Progress of an interrupted channel is kept in DynamoDB: stored videos stay
+in the enrichment GSI until they are enriched, and the incremental
+high-water mark only moves after a complete crawl.
+"""
+
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Result statuses of channels to continue in the next run
+INTERRUPTED = "interrupted"
+SKIPPED = "skipped"
+
+
+class TimeBudget:
+    """Seconds left for starting and running channel work."""
+
+    def __init__(
+        self, remaining_seconds: Callable[[], float], reserve_seconds: float = 0.0
+    ):
+        self._remaining_seconds = remaining_seconds
+        self.reserve_seconds = reserve_seconds
+
+    @classmethod
+    def from_lambda_context(
+        cls, context: Any, reserve_seconds: float
+    ) -> Optional["TimeBudget"]:
+        """Budget of a Lambda invocation, or None without a Lambda context."""
+        if not hasattr(context, "get_remaining_time_in_millis"):
+            return None
+        return cls(
+            lambda: context.get_remaining_time_in_millis() / 1000, reserve_seconds
+        )
+
+    def remaining(self) -> float:
+        return self._remaining_seconds() - self.reserve_seconds
+
+
+class ChannelScheduler:
+    """
+    Runs a collection job per channel, `max_concurrency` channels at a time.
+
+    `collect(channel_url, resume, stop)` collects one channel and returns a
+    result dict with at least "status" ("success", or INTERRUPTED if it
+    returned early because `stop` was set); `resume` is True for channels an
+    earlier run interrupted.
+    """
+
+    def __init__(
+        self,
+        collect: Callable[[str, bool, threading.Event], Dict[str, Any]],
+        max_concurrency: int = 1,
+        budget: Optional[TimeBudget] = None,
+    ):
+        self._collect = collect
+        self.max_concurrency = max(1, max_concurrency)
+        self.budget = budget
+
+    def run(
+        self, channel_urls: Iterable[str], resume: Iterable[str] = ()
+    ) -> List[Dict[str, Any]]:
+        """
+        Collect every channel, stopping them all when the budget runs out.
+
+        Args:
+          channel_urls: Channel URLs, handles or IDs, in priority order
+          resume: Channels interrupted by an earlier run
+
+        Returns:
+          One result per channel, in input order, with "channel_url" and
+          "status" ("success", "error", INTERRUPTED or SKIPPED)
+        """
+        channel_urls = list(dict.fromkeys(channel_urls))
+        resume = set(resume)
+        stops = {url: threading.Event() for url in channel_urls}
+        out_of_time = False
+
+        with ThreadPoolExecutor(
+            self.max_concurrency, thread_name_prefix="channel"
+        ) as executor:
+            futures = {
+                url: executor.submit(self._run_channel, url, url in resume, stops[url])
+                for url in channel_urls
+            }
+            pending = set(futures.values())
+            while pending:
+                timeout = None
+                if self.budget is not None and not out_of_time:
+                    timeout = max(0.0, self.budget.remaining())
+                _, pending = wait(pending, timeout, FIRST_COMPLETED)
+
+                if pending and timeout is not None and self.budget.remaining() <= 0:
+                    print(
+                        f"\nTime budget reached, stopping {len(pending)} channels",
+                        file=sys.stderr,
+                    )
+                    out_of_time = True
+                    for stop in stops.values():
+                        stop.set()
+
+        return [futures[url].result() for url in channel_urls]
+
+    def _run_channel(
+        self, channel_url: str, resume: bool, stop: threading.Event
+    ) -> Dict[str, Any]:
+        out_of_time = self.budget is not None and self.budget.remaining() <= 0
+        if stop.is_set() or out_of_time:
+            return {"channel_url": channel_url, "status": SKIPPED}
+        try:
+            result = self._collect(channel_url, resume, stop)
+        except Exception as e:
+            print(f"Error collecting channel {channel_url}: {e}", file=sys.stderr)
+            return {"channel_url": channel_url, "status": "error", "error": str(e)}
+        return {"channel_url": channel_url, **result}
+
+
+def unfinished_channels(
+    results: List[Dict[str, Any]], resume: Iterable[str] = ()
+) -> Tuple[List[str], List[str]]:
+    """
+    Channels for the next run.
+
+    Args:
+      results: ChannelScheduler.run results
+      resume: Channels the run was asked to resume
+
+    Returns:
+      (channels to collect, interrupted first; the subset to resume)
+    """
+    resume = set(resume)
+    interrupted = [r["channel_url"] for r in results if r["status"] == INTERRUPTED]
+    skipped = [r["channel_url"] for r in results if r["status"] == SKIPPED]
+    return (
+        interrupted + skipped,
+        interrupted + [url for url in skipped if url in resume],
+    )
@@ -0,0 +1,93 @@
+"""
+Script to derive the enrichment state of videos stored before it was tracked.
+
+Videos that already have an enrichment_state are left alone. For the rest:
+- song_title set                -> analyzed (done)
+- video_type other than SONG    -> classified (done)
+- video_type SONG, no song info -> classified (queued for song extraction)
+- no video_type                 -> pending (queued)
+
+Usage:
+  uv run python scripts/backfill_enrichment_state.py
+"""
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import boto3
+from config import get_collector_settings
+from db import (
+    ENRICHMENT_ANALYZED,
+    ENRICHMENT_CLASSIFIED,
+    ENRICHMENT_PENDING,
+    VideoRepository,
+)
+
+
+def derive_state(item: Dict[str, Any]) -> Tuple[str, bool]:
+    """
+    Work out (state, done) from the attributes enrichment has written so far.
+
+    Args:
+      item: Videos table item
+
+    Returns:
+      Enrichment state and whether enrichment is finished
+    """
+    if item.get("song_title", {}).get("S"):
+        return ENRICHMENT_ANALYZED, True
+
+    video_type = item.get("video_type", {}).get("S", "")
+    if video_type == "SONG":
+        return ENRICHMENT_CLASSIFIED, False
+    if video_type:
+        return ENRICHMENT_CLASSIFIED, True
+
+    return ENRICHMENT_PENDING, False
+
+
+def main() -> None:
+    """Set enrichment_state on every video that lacks one."""
+    settings = get_collector_settings()
+    client = boto3.client("dynamodb", region_name=settings.aws_region)
+    repo = VideoRepository(client, settings.dynamodb_table_videos)
+
+    scan_kwargs = {
+        "TableName": settings.dynamodb_table_videos,
+        "ProjectionExpression": "channel_id, video_id, video_type, song_title, "
+        "enrichment_state",
+    }
+    counts: Dict[str, int] = {}
+
+    print(f"Scanning {settings.dynamodb_table_videos}...")
+    while True:
+        response = client.scan(**scan_kwargs)
+
+        for item in response.get("Items", []):
+            video_id = item["video_id"]["S"]
+            if video_id in ("CHANNEL_INFO", "CATALOG_VERSION"):
+                continue
+            if "enrichment_state" in item:
+                continue
+
+            state, done = derive_state(item)
+            repo.mark_enrichment(item["channel_id"]["S"], video_id, state, done)
+            key = f"{state} ({'done' if done else 'queued'})"
+            counts[key] = counts.get(key, 0) + 1
+
+        if "LastEvaluatedKey" in response:
+            scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        else:
+            break
+
+    for key, count in sorted(counts.items()):
+        print(f"  ✓ {key}: {count} videos")
+    print("\n✓ Enrichment state backfilled")
+
+
+if __name__ == "__main__":
+    main()
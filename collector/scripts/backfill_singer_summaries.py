@@ -0,0 +1,115 @@
+"""
+Script to rebuild the singer summaries table from the singer-videos table.
+
+The collector keeps summaries up to date as it writes index records; run this
+once after creating the summaries table, or to repair drift.
+
+Usage:
+  uv run python scripts/backfill_singer_summaries.py
+"""
+
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import boto3
+from config import get_collector_settings
+from db import CatalogVersion
+
+
+def aggregate_singers(client, table_name: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Scan the singer-videos table and aggregate per-singer summaries.
+
+    Args:
+      client: DynamoDB client
+      table_name: Singer-videos table name
+
+    Returns:
+      Dict of singer_key -> summary attributes
+    """
+    summaries: Dict[str, Dict[str, Any]] = {}
+    scan_kwargs = {
+        "TableName": table_name,
+        "ProjectionExpression": "singer_key, sort_key, singer_name, video_id, channel_id",
+    }
+
+    while True:
+        response = client.scan(**scan_kwargs)
+
+        for item in response.get("Items", []):
+            singer_key = item["singer_key"]["S"]
+            sort_key = item["sort_key"]["S"]
+            summary = summaries.setdefault(
+                singer_key,
+                {
+                    "singer_name": item.get("singer_name", {}).get("S", ""),
+                    "video_count": 0,
+                    "latest_sort_key": "",
+                },
+            )
+            summary["video_count"] += 1
+            if sort_key > summary["latest_sort_key"]:
+                summary["latest_sort_key"] = sort_key
+                summary["latest_video_id"] = item["video_id"]["S"]
+                summary["channel_id"] = item.get("channel_id", {}).get("S", "")
+
+        if "LastEvaluatedKey" in response:
+            scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        else:
+            break
+
+    return summaries
+
+
+def fetch_channel_icon(client, videos_table: str, channel_id: str) -> str:
+    """Read the icon URL from a channel's CHANNEL_INFO record."""
+    response = client.get_item(
+        TableName=videos_table,
+        Key={"channel_id": {"S": channel_id}, "video_id": {"S": "CHANNEL_INFO"}},
+        ProjectionExpression="channel_icon_url",
+    )
+    return response.get("Item", {}).get("channel_icon_url", {}).get("S", "")
+
+
+def main() -> None:
+    """Rebuild all singer summary items."""
+    settings = get_collector_settings()
+    client = boto3.client("dynamodb", region_name=settings.aws_region)
+
+    print(f"Scanning {settings.dynamodb_table_singer_videos}...")
+    summaries = aggregate_singers(client, settings.dynamodb_table_singer_videos)
+    print(f"Found {len(summaries)} singers")
+
+    icons: Dict[str, str] = {}
+    for singer_key, summary in summaries.items():
+        channel_id = summary.get("channel_id", "")
+        if channel_id and channel_id not in icons:
+            icons[channel_id] = fetch_channel_icon(
+                client, settings.dynamodb_table_videos, channel_id
+            )
+
+        item: Dict[str, Any] = {
+            "singer_key": {"S": singer_key},
+            "singer_name": {"S": summary["singer_name"]},
+            "video_count": {"N": str(summary["video_count"])},
+            "latest_sort_key": {"S": summary["latest_sort_key"]},
+            "latest_video_id": {"S": summary["latest_video_id"]},
+            "channel_id": {"S": channel_id},
+        }
+        if icons.get(channel_id):
+            item["avatar_url"] = {"S": icons[channel_id]}
+
+        client.put_item(TableName=settings.dynamodb_table_singer_summaries, Item=item)
+        print(f"  ✓ {summary['singer_name']}: {summary['video_count']} videos")
+
+    # Let the backend reload its catalog snapshot
+    CatalogVersion.from_settings(settings).touch()
+    print("\n✓ Singer summaries rebuilt")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,12 +13,27 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import boto3
 from config import get_collector_settings
+from db import ENRICHMENT_INDEX
+
+ENRICHMENT_INDEX_SPEC = {
+    "IndexName": ENRICHMENT_INDEX,
+    "KeySchema": [
+        {"AttributeName": "enrichment_queue", "KeyType": "HASH"},
+        {"AttributeName": "video_id", "KeyType": "RANGE"},
+    ],
+    "Projection": {"ProjectionType": "ALL"},
+}
 
 
 def create_videos_table(client, table_name: str) -> None:
     """
     Create the videos table with channel_id (partition) and video_id (sort key).
 
+    Table structure:
+    - PK: channel_id
+    - SK: video_id
+    - GSI_ENRICHMENT_QUEUE (sparse): PK=enrichment_queue, SK=video_id
+
     Args:
       client: DynamoDB client
       table_name: Name of the table to create
@@ -33,17 +48,43 @@ def create_videos_table(client, table_name: str) -> None:
             AttributeDefinitions=[
                 {"AttributeName": "channel_id", "AttributeType": "S"},
                 {"AttributeName": "video_id", "AttributeType": "S"},
+                {"AttributeName": "enrichment_queue", "AttributeType": "S"},
             ],
+            GlobalSecondaryIndexes=[ENRICHMENT_INDEX_SPEC],
             BillingMode="PAY_PER_REQUEST",
         )
         print(f"✓ Created table: {table_name}")
     except client.exceptions.ResourceInUseException:
         print(f"✓ Table already exists: {table_name}")
+        ensure_enrichment_index(client, table_name)
     except Exception as e:
         print(f"✗ Error creating table {table_name}: {e}")
         raise
 
 
+def ensure_enrichment_index(client, table_name: str) -> None:
+    """
+    Add the enrichment GSI to a videos table created before it existed.
+
+    Run scripts/backfill_enrichment_state.py afterwards so existing videos
+    get their enrichment state.
+    """
+    table = client.describe_table(TableName=table_name)["Table"]
+    index_names = {gsi["IndexName"] for gsi in table.get("GlobalSecondaryIndexes", [])}
+    if ENRICHMENT_INDEX in index_names:
+        return
+
+    client.update_table(
+        TableName=table_name,
+        AttributeDefinitions=[
+            {"AttributeName": "enrichment_queue", "AttributeType": "S"},
+            {"AttributeName": "video_id", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexUpdates=[{"Create": ENRICHMENT_INDEX_SPEC}],
+    )
+    print(f"✓ Added index {ENRICHMENT_INDEX} to {table_name}")
+
+
 def create_singer_videos_table(client, table_name: str) -> None:
     """
     Create the singer-videos index table for optimized search.
@@ -99,6 +140,74 @@ def create_singer_videos_table(client, table_name: str) -> None:
         raise
 
 
+def create_singer_summaries_table(client, table_name: str) -> None:
+    """
+    Create the singer summaries table maintained by the collector.
+
+    Table structure:
+    - PK: singer_key (normalized singer name)
+    - Attributes: singer_name, video_count, latest_video_id, latest_sort_key,
+      channel_id, avatar_url
+
+    Args:
+      client: DynamoDB client
+      table_name: Name of the table to create
+    """
+    try:
+        client.create_table(
+            TableName=table_name,
+            KeySchema=[
+                {"AttributeName": "singer_key", "KeyType": "HASH"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "singer_key", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        print(f"✓ Created table: {table_name}")
+    except client.exceptions.ResourceInUseException:
+        print(f"✓ Table already exists: {table_name}")
+    except Exception as e:
+        print(f"✗ Error creating table {table_name}: {e}")
+        raise
+
+
+def create_gemini_cache_table(client, table_name: str) -> None:
+    """
+    Create the Gemini response cache table (GEMINI_CACHE_BACKEND=dynamodb).
+
+    Table structure:
+    - PK: cache_key (SHA-256 of method, model and request inputs)
+    - Attributes: response, expires_at (DynamoDB TTL attribute)
+
+    Args:
+      client: DynamoDB client
+      table_name: Name of the table to create
+    """
+    try:
+        client.create_table(
+            TableName=table_name,
+            KeySchema=[
+                {"AttributeName": "cache_key", "KeyType": "HASH"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "cache_key", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        client.get_waiter("table_exists").wait(TableName=table_name)
+        client.update_time_to_live(
+            TableName=table_name,
+            TimeToLiveSpecification={"Enabled": True, "AttributeName": "expires_at"},
+        )
+        print(f"✓ Created table: {table_name}")
+    except client.exceptions.ResourceInUseException:
+        print(f"✓ Table already exists: {table_name}")
+    except Exception as e:
+        print(f"✗ Error creating table {table_name}: {e}")
+        raise
+
+
 def main() -> None:
     """Create all required DynamoDB tables."""
     settings = get_collector_settings()
@@ -109,14 +218,24 @@ def main() -> None:
     print("\nCreating tables...")
     create_videos_table(client, settings.dynamodb_table_videos)
     create_singer_videos_table(client, settings.dynamodb_table_singer_videos)
+    create_singer_summaries_table(client, settings.dynamodb_table_singer_summaries)
+    use_dynamo_cache = settings.gemini_cache_backend.lower() == "dynamodb"
+    if use_dynamo_cache:
+        create_gemini_cache_table(client, settings.dynamodb_table_gemini_cache)
 
     print("\n✓ All tables created successfully!")
     print(f"\nTables:")
     print(f"  1. {settings.dynamodb_table_videos}")
     print(f"     Schema: channel_id (PK), video_id (SK)")
+    print(f"     GSI: {ENRICHMENT_INDEX} (sparse)")
     print(f"  2. {settings.dynamodb_table_singer_videos}")
     print(f"     Schema: singer_key (PK), sort_key (SK)")
     print(f"     GSI: GSI_SONG_KEY, GSI_VIDEO_ID")
+    print(f"  3. {settings.dynamodb_table_singer_summaries}")
+    print(f"     Schema: singer_key (PK)")
+    if use_dynamo_cache:
+        print(f"  4. {settings.dynamodb_table_gemini_cache}")
+        print(f"     Schema: cache_key (PK), TTL: expires_at")
 
 
 if __name__ == "__main__":
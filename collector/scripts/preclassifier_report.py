@@ -0,0 +1,99 @@
+"""
+Script to evaluate the local pre-classifier against stored video types.
+
+Scans the videos table and runs the pre-classifier on every video that
+already has a video_type, using the rest of its channel's videos as the
+channel history. Prints a confusion matrix per confidence threshold, so
+thresholds and keyword weights can be tuned before deploying them.
+
+Usage:
+  uv run python scripts/preclassifier_report.py
+  uv run python scripts/preclassifier_report.py --confidence 0.8 --confidence 0.95
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import boto3
+from config import get_collector_settings
+from db import VideoRecord
+from enricher import DURATION_MAX, DURATION_MIN
+from preclassifier import PreClassifier, confusion_matrix, format_report
+
+
+def load_classified_videos(client, table_name: str) -> List[VideoRecord]:
+    """Scan all videos with a stored video_type."""
+    videos: List[VideoRecord] = []
+    scan_kwargs: Dict[str, Any] = {
+        "TableName": table_name,
+        "FilterExpression": "attribute_exists(video_type)",
+    }
+
+    while True:
+        response = client.scan(**scan_kwargs)
+        videos.extend(VideoRecord.from_items(response.get("Items", [])))
+
+        if "LastEvaluatedKey" in response:
+            scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        else:
+            break
+
+    return videos
+
+
+def main(confidences: List[float]) -> None:
+    """Print a confusion matrix for each confidence threshold."""
+    settings = get_collector_settings()
+    client = boto3.client("dynamodb", region_name=settings.aws_region)
+
+    print(f"Scanning {settings.dynamodb_table_videos}...")
+    videos = [
+        video
+        for video in load_classified_videos(client, settings.dynamodb_table_videos)
+        # Out-of-range videos never reach classification
+        if video.duration is not None and DURATION_MIN <= video.duration <= DURATION_MAX
+    ]
+    print(f"Found {len(videos)} classified videos in the duration range")
+
+    history: Dict[str, Dict[str, int]] = {}
+    for video in videos:
+        counts = history.setdefault(video.channel_id, {})
+        counts[video.video_type] = counts.get(video.video_type, 0) + 1
+
+    for confidence in confidences:
+        classifier = PreClassifier(confidence)
+        pairs = []
+        for video in videos:
+            # Leave the video itself out of its channel history
+            channel_history = dict(history[video.channel_id])
+            channel_history[video.video_type] -= 1
+
+            prediction = classifier.classify(
+                video.video_title, video.description, video.duration, channel_history
+            )
+            pairs.append((video.video_type, prediction and prediction["type"]))
+
+        print(f"\n=== confidence >= {confidence} ===")
+        print(format_report(confusion_matrix(pairs)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Evaluate the pre-classifier against stored video types"
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        action="append",
+        dest="confidences",
+        help="Confidence threshold to evaluate (can be specified multiple times; "
+        "default: PRECLASSIFIER_CONFIDENCE)",
+    )
+    args = parser.parse_args()
+
+    main(args.confidences or [get_collector_settings().preclassifier_confidence])
@@ -0,0 +1,193 @@
+"""
+Test script for the buffered DynamoDB batch writer.
+
+Uses an in-memory fake client, so no AWS access is needed.
+"""
+
+import threading
+
+from batch_writer import MAX_BATCH_SIZE, VIDEOS_KEY, BatchWriteError, BatchWriter
+
+
+class FakeClient:
+    """Records batch_write_item calls and leaves the first N requests unprocessed."""
+
+    def __init__(self, unprocessed_rounds: int = 0):
+        self.calls = []
+        self.unprocessed_rounds = unprocessed_rounds
+
+    def batch_write_item(self, RequestItems):
+        self.calls.append(RequestItems)
+        if self.unprocessed_rounds > 0:
+            self.unprocessed_rounds -= 1
+            return {"UnprocessedItems": RequestItems}
+        return {"UnprocessedItems": {}}
+
+
+def _video(video_id: str, title: str = "title"):
+    return {
+        "channel_id": {"S": "UC1"},
+        "video_id": {"S": video_id},
+        "video_title": {"S": title},
+    }
+
+
+def test_flushes_in_batches_of_25():
+    """60 puts are sent as 25 + 25 + 10."""
+    client = FakeClient()
+    writer = BatchWriter(client)
+
+    for i in range(60):
+        writer.put("videos", _video(f"v{i}"), VIDEOS_KEY)
+    writer.flush()
+
+    sizes = [len(call["videos"]) for call in client.calls]
+    assert sizes == [MAX_BATCH_SIZE, MAX_BATCH_SIZE, 10]
+    assert writer.items_written == 60
+    assert writer.writes_saved == 57
+
+
+def test_duplicate_keys_are_collapsed():
+    """A later request for the same key replaces the pending one."""
+    client = FakeClient()
+    writer = BatchWriter(client)
+
+    writer.put("videos", _video("v1", "old"), VIDEOS_KEY)
+    writer.put("videos", _video("v1", "new"), VIDEOS_KEY)
+    writer.flush()
+
+    (call,) = client.calls
+    assert len(call["videos"]) == 1
+    assert call["videos"][0]["PutRequest"]["Item"]["video_title"]["S"] == "new"
+
+
+def test_flush_table_leaves_other_tables_pending():
+    """flush_table only sends the requested table."""
+    client = FakeClient()
+    writer = BatchWriter(client)
+
+    writer.put("videos", _video("v1"), VIDEOS_KEY)
+    writer.put("other", _video("v2"), VIDEOS_KEY)
+    writer.flush_table("videos")
+
+    assert [list(call) for call in client.calls] == [["videos"]]
+
+    writer.flush()
+    assert [list(call) for call in client.calls] == [["videos"], ["other"]]
+
+
+def test_unprocessed_items_are_retried():
+    """UnprocessedItems are resent until accepted."""
+    client = FakeClient(unprocessed_rounds=2)
+    writer = BatchWriter(client, base_delay=0)
+
+    writer.put("videos", _video("v1"), VIDEOS_KEY)
+    writer.flush()
+
+    assert len(client.calls) == 3
+    assert writer.requests_sent == 3
+
+
+def test_gives_up_after_max_attempts():
+    """BatchWriteError is raised when requests stay unprocessed."""
+    client = FakeClient(unprocessed_rounds=10)
+    writer = BatchWriter(client, max_attempts=3, base_delay=0)
+
+    writer.put("videos", _video("v1"), VIDEOS_KEY)
+    try:
+        writer.flush()
+    except BatchWriteError:
+        pass
+    else:
+        raise AssertionError("expected BatchWriteError")
+
+    assert len(client.calls) == 3
+
+
+def test_automatic_flush_failures_are_reported_by_flush():
+    """A full batch failing while an item is queued surfaces from flush()."""
+    client = FakeClient(unprocessed_rounds=10)
+    writer = BatchWriter(client, max_attempts=2, base_delay=0)
+
+    # The 25th put sends the batch; its failure isn't raised here
+    for i in range(MAX_BATCH_SIZE + 1):
+        writer.put("videos", _video(f"v{i}"), VIDEOS_KEY)
+    assert len(client.calls) == 2
+
+    try:
+        writer.flush()
+    except BatchWriteError as e:
+        assert str(e).startswith(f"{MAX_BATCH_SIZE + 1} write requests")
+    else:
+        raise AssertionError("expected BatchWriteError")
+
+    # Reported once
+    writer.flush()
+
+
+class QueueingClient(FakeClient):
+    """Queues a put from another thread while a batch is in flight."""
+
+    def __init__(self, writer_holder):
+        super().__init__()
+        self.writer_holder = writer_holder
+        self.queued_during_send = []
+
+    def batch_write_item(self, RequestItems):
+        if not self.queued_during_send:
+            thread = threading.Thread(
+                target=self.writer_holder[0].put,
+                args=("videos", _video("late"), VIDEOS_KEY),
+            )
+            thread.start()
+            thread.join(timeout=5)
+            self.queued_during_send.append(not thread.is_alive())
+        return super().batch_write_item(RequestItems)
+
+
+def test_batches_are_sent_outside_the_lock():
+    """Other threads can queue while a batch is being sent."""
+    holder = []
+    client = QueueingClient(holder)
+    writer = BatchWriter(client)
+    holder.append(writer)
+
+    for i in range(MAX_BATCH_SIZE):
+        writer.put("videos", _video(f"v{i}"), VIDEOS_KEY)
+    writer.flush()
+
+    assert client.queued_during_send == [True]
+    assert [len(call["videos"]) for call in client.calls] == [MAX_BATCH_SIZE, 1]
+
+
+class FakeStatementClient:
+    """Fails statements with the given error codes on the first call."""
+
+    def __init__(self, first_errors):
+        self.calls = []
+        self.first_errors = first_errors
+
+    def batch_execute_statement(self, Statements):
+        self.calls.append(Statements)
+        errors = self.first_errors if len(self.calls) == 1 else {}
+        return {
+            "Responses": [
+                {"Error": {"Code": errors[i]}} if i in errors else {}
+                for i in range(len(Statements))
+            ]
+        }
+
+
+def test_statements_retry_only_retryable_errors():
+    """Throttled statements are resent; a missing item is reported."""
+    client = FakeStatementClient({1: "ThrottlingError", 2: "ConditionalCheckFailed"})
+    writer = BatchWriter(client, base_delay=0)
+    statements = [{"Statement": f"UPDATE {i}", "Parameters": []} for i in range(30)]
+
+    errors = writer.execute_statements(statements)
+
+    assert [len(call) for call in client.calls] == [MAX_BATCH_SIZE, 1, 5]
+    assert client.calls[1][0]["Statement"] == "UPDATE 1"
+    assert errors[1] is None
+    assert errors[2] == "ConditionalCheckFailed"
+    assert errors.count(None) == 29
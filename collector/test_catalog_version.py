@@ -0,0 +1,108 @@
+"""
+Test script for the catalog version counter.
+
+Uses an in-memory fake client, so no AWS access is needed.
+"""
+
+import pytest
+from batch_writer import BatchWriteError
+from db import CATALOG_VERSION_KEY, CatalogVersion
+from run_once import finish_run
+
+
+class FakeClient:
+    """Counts update_item calls on the version record; can fail once."""
+
+    def __init__(self, fail: bool = False):
+        self.version = 0
+        self.fail = fail
+
+    def update_item(self, TableName, Key, **kwargs):
+        assert Key == CATALOG_VERSION_KEY
+        if self.fail:
+            self.fail = False
+            raise RuntimeError("throttled")
+        self.version += 1
+        return {"Attributes": {"version": {"N": str(self.version)}}}
+
+
+def test_bumps_are_throttled_and_flushed_by_publish():
+    client = FakeClient()
+    version = CatalogVersion(client, "videos", publish_interval=60)
+
+    # The first write bumps at once; later ones wait for the interval
+    for _ in range(10):
+        version.touch()
+    assert client.version == 1
+
+    assert version.publish() == 2
+    # Nothing changed since
+    assert version.publish() is None
+    assert client.version == 2
+
+
+def test_failed_bump_is_retried():
+    client = FakeClient(fail=True)
+    version = CatalogVersion(client, "videos", publish_interval=60)
+
+    version.touch()
+    assert client.version == 0
+
+    assert version.publish() == 1
+
+
+class FailingWriter:
+    def flush(self):
+        raise BatchWriteError("1 batch failed")
+
+
+class FakeEnricher:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_run_is_published_even_if_the_flush_fails():
+    client = FakeClient()
+    version = CatalogVersion(client, "videos", publish_interval=60)
+    version.touch()
+    version.touch()
+    enricher = FakeEnricher()
+
+    with pytest.raises(BatchWriteError):
+        finish_run(FailingWriter(), version, enricher)
+
+    assert enricher.closed
+    assert client.version == 2
+
+
+class Writer:
+    flushed = False
+
+    def flush(self):
+        self.flushed = True
+
+
+class FailingEnricher:
+    def close(self):
+        raise RuntimeError("pool shutdown failed")
+
+
+def test_run_is_flushed_and_published_even_if_closing_fails():
+    client = FakeClient()
+    version = CatalogVersion(client, "videos", publish_interval=60)
+    version.touch()
+    version.touch()
+    writer = Writer()
+
+    with pytest.raises(RuntimeError):
+        finish_run(writer, version, FailingEnricher())
+
+    assert writer.flushed
+    assert client.version == 2
+
+    # Runs without an enricher (refresh_stats) only flush and publish
+    version.touch()
+    finish_run(writer, version)
+    assert client.version == 3
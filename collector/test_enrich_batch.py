@@ -0,0 +1,83 @@
+"""
+Test script for the batch enrichment CLI.
+
+Uses in-memory fakes of the enricher and the videos repository, so no AWS or
+Gemini access is needed.
+"""
+
+from db import (
+    ENRICHMENT_CLASSIFIED,
+    ENRICHMENT_FAILED,
+    ENRICHMENT_PENDING,
+    ENRICHMENT_SONG_EXTRACTED,
+    VideoRecord,
+)
+from enrich_batch import enrich_channel
+
+
+class FakeRepo:
+    def __init__(self, videos):
+        self.videos = videos
+
+    def list_pending_videos(self, channel_id, limit=0):
+        return self.videos
+
+
+class FakeEnricher:
+    """Classifies titles starting with "song" as SONG, the rest as GAME."""
+
+    def __init__(self, classify_error=None):
+        self.classify_error = classify_error
+        self.classified = []
+        self.extracted = []
+        self.stored = []
+
+    def classify_many(self, channel_id, videos):
+        self.classified += [video.video_id for video in videos]
+        if self.classify_error:
+            raise self.classify_error
+        return {
+            video.video_id: "SONG" if video.video_title.startswith("song") else "GAME"
+            for video in videos
+        }
+
+    def extract_song(self, channel_id, video):
+        self.extracted.append(video.video_id)
+        return {"song_title": video.video_title}
+
+    def analyze_and_store(self, channel_id, video, song_info):
+        self.stored.append(video.video_id)
+
+
+def _video(video_id, title, state=ENRICHMENT_PENDING):
+    return VideoRecord(video_id, title, enrichment_state=state)
+
+
+def test_classified_song_videos_skip_classification():
+    videos = [
+        _video("new-song", "song a"),
+        _video("new-game", "game b"),
+        _video("classified", "song c", ENRICHMENT_CLASSIFIED),
+        _video("extracted", "song d", ENRICHMENT_SONG_EXTRACTED),
+        _video("failed", "song e", ENRICHMENT_FAILED),
+    ]
+    enricher = FakeEnricher()
+
+    enrich_channel("UC1", enricher, FakeRepo(videos))
+
+    assert enricher.classified == ["new-song", "new-game", "failed"]
+    assert enricher.extracted == ["new-song", "classified", "extracted", "failed"]
+    assert enricher.stored == enricher.extracted
+
+
+def test_classification_failure_leaves_classified_songs_running():
+    videos = [
+        _video("new-song", "song a"),
+        _video("classified", "song c", ENRICHMENT_CLASSIFIED),
+    ]
+    enricher = FakeEnricher(classify_error=RuntimeError("quota"))
+
+    enrich_channel("UC1", enricher, FakeRepo(videos))
+
+    assert enricher.classified == ["new-song"]
+    assert enricher.stored == ["classified"]
@@ -0,0 +1,87 @@
+"""
+Test script for the video enricher's failure recording.
+
+Uses in-memory fakes of the Gemini client and the repositories, so no AWS or
+Gemini access is needed.
+"""
+
+import pytest
+from db import ENRICHMENT_ANALYZED, ENRICHMENT_FAILED, VideoRecord
+from enricher import VideoEnricher
+from rate_limiter import ThrottledError
+
+SONG_INFO = {"song_title": "song", "singers": ["A"], "is_cover": True}
+
+
+class FakeRepo:
+    def __init__(self):
+        self.marks = []
+
+    def mark_enrichment(self, channel_id, video_id, state, done=False, error=None):
+        self.marks.append((state, done))
+
+    def update_song_info(self, **kwargs):
+        pass
+
+
+class FakeGemini:
+    def __init__(self, error):
+        self.error = error
+
+    def extract_song_info(self, title, description, channel_name):
+        raise self.error
+
+
+class FakeIndexRepo:
+    def __init__(self, error=None):
+        self.error = error
+
+    def upsert_singer_video_index(self, **kwargs):
+        if self.error:
+            raise self.error
+
+
+def _enricher(gemini=None, index_repo=None):
+    repo = FakeRepo()
+    return repo, VideoEnricher(gemini, repo, index_repo)
+
+
+def _video():
+    return VideoRecord("v1", "title", channel_id="UC1", published_at="2024")
+
+
+def test_throttled_calls_leave_the_video_queued():
+    throttled = ThrottledError("generate_content", 5, RuntimeError("429"))
+    repo, enricher = _enricher(FakeGemini(throttled))
+
+    with pytest.raises(ThrottledError):
+        enricher.extract_song("UC1", _video())
+
+    # No failed attempt is recorded
+    assert repo.marks == []
+
+
+def test_other_errors_are_recorded():
+    repo, enricher = _enricher(FakeGemini(ValueError("bad response")))
+
+    with pytest.raises(ValueError):
+        enricher.extract_song("UC1", _video())
+
+    assert repo.marks == [(ENRICHMENT_FAILED, False)]
+
+
+def test_video_leaves_the_queue_after_the_index_sync():
+    repo, enricher = _enricher(index_repo=FakeIndexRepo())
+
+    enricher.analyze_and_store("UC1", _video(), SONG_INFO)
+
+    assert repo.marks == [(ENRICHMENT_ANALYZED, True)]
+
+
+def test_failed_index_sync_keeps_the_video_queued():
+    repo, enricher = _enricher(index_repo=FakeIndexRepo(RuntimeError("write failed")))
+
+    with pytest.raises(RuntimeError):
+        enricher.analyze_and_store("UC1", _video(), SONG_INFO)
+
+    assert repo.marks == [(ENRICHMENT_FAILED, False)]
@@ -0,0 +1,121 @@
+"""
+Test script for the Gemini response cache (SQLite backend).
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from gemini_cache import (
+    ResponseCache,
+    SQLiteResponseCache,
+    cache_key,
+    create_response_cache,
+)
+from gemini_client import GeminiClient
+
+
+def test_key_depends_on_every_input():
+    """Changing the method, model or prompt changes the key."""
+    base = cache_key("classify_video_type", "model-a", "prompt", {"t": 1})
+
+    assert base == cache_key("classify_video_type", "model-a", "prompt", {"t": 1})
+    assert base != cache_key("extract_song_info", "model-a", "prompt", {"t": 1})
+    assert base != cache_key("classify_video_type", "model-b", "prompt", {"t": 1})
+    assert base != cache_key("classify_video_type", "model-a", "prompt!", {"t": 1})
+    assert base != cache_key("classify_video_type", "model-a", "prompt", {"t": 0})
+
+
+def test_hit_and_miss_counters(tmp_path):
+    cache = SQLiteResponseCache(str(tmp_path / "cache.sqlite3"))
+
+    assert cache.get("k") is None
+    cache.put("k", '{"type": "SONG"}')
+    assert cache.get("k") == '{"type": "SONG"}'
+
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_expired_entries_miss(tmp_path, monkeypatch):
+    cache = SQLiteResponseCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=60)
+    cache.put("k", "{}")
+    assert cache.get("k") == "{}"
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = SQLiteResponseCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.put("a", "1")
+    time.sleep(0.01)
+    cache.put("b", "2")
+    time.sleep(0.01)
+    cache.get("a")  # "b" is now the least recently used
+    time.sleep(0.01)
+    cache.put("c", "3")
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_eviction_runs_every_few_puts(tmp_path):
+    """With max_entries=100, entries are trimmed every 5 puts."""
+    cache = SQLiteResponseCache(str(tmp_path / "cache.sqlite3"), max_entries=100)
+    for i in range(104):
+        cache.put(f"k{i}", "{}")
+    assert len(cache) == 104
+
+    cache.put("k104", "{}")
+    assert len(cache) == 100
+
+
+def test_unusable_backend_falls_back_to_no_cache(tmp_path):
+    settings = SimpleNamespace(
+        gemini_cache_backend="sqlite",
+        gemini_cache_path=str(tmp_path / "missing" / "cache.sqlite3"),
+        gemini_cache_ttl_seconds=0,
+        gemini_cache_max_entries=0,
+    )
+
+    assert create_response_cache(settings) is None
+
+
+def test_backends_must_implement_get_and_put():
+    class Incomplete(ResponseCache):
+        def _get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+class FakeModels:
+    """generate_content stand-in answering with the queued texts in order."""
+
+    def __init__(self, *texts):
+        self.texts = list(texts)
+        self.calls = 0
+
+    def generate_content(self, model, contents, config):
+        self.calls += 1
+        return SimpleNamespace(text=self.texts.pop(0))
+
+
+def test_failed_song_extractions_are_not_cached(tmp_path):
+    client = GeminiClient(
+        "key", cache=SQLiteResponseCache(str(tmp_path / "cache.sqlite3"))
+    )
+    models = FakeModels('{"song_title": ""}', '{"song_title": "Song"}')
+    client.client = SimpleNamespace(models=models)
+
+    assert client.extract_song_info("title", "")["song_title"] == ""
+    # Asked again rather than replayed, and the usable answer is kept
+    assert client.extract_song_info("title", "")["song_title"] == "Song"
+    assert client.extract_song_info("title", "")["song_title"] == "Song"
+    assert models.calls == 2
@@ -0,0 +1,119 @@
+"""
+Test script for the schema-driven DynamoDB item codec.
+"""
+
+from pathlib import Path
+
+import pytest
+from batch_writer import BatchWriter
+from db import ENRICHMENT_PENDING, VideoRecord, VideoRepository
+from item_codec import MAP, MAPS, NUMBER, STRINGS, VIDEO_ITEM, Field, Schema
+from youtube_client import YouTubeVideo
+
+WORD = Schema(Field("word", default=""), Field("importance", NUMBER, default=0))
+SCHEMA = Schema(
+    Field("video_id"),
+    Field("duration", NUMBER),
+    Field("singers", STRINGS),
+    Field("stats", MAP, attribute="ai_stats", schema=Schema(Field("cool", NUMBER))),
+    Field("cloud", MAPS, attribute="comment_cloud", schema=WORD),
+)
+
+
+def test_decode_skips_missing_and_mistyped_attributes():
+    values = SCHEMA.decode(
+        {
+            "video_id": {"S": "v1"},
+            "duration": {"NULL": True},
+            "singers": {"L": []},
+            "comment_cloud": {"L": [{"M": {"word": {"S": "w"}}}, {"S": "x"}]},
+        }
+    )
+
+    assert values == {"video_id": "v1", "cloud": [{"word": "w", "importance": 0}]}
+
+
+def test_round_trip():
+    values = {
+        "video_id": "v1",
+        "duration": 215,
+        "singers": ["A", "B"],
+        "stats": {"cool": 80},
+        "cloud": [{"word": "w", "importance": 9}],
+    }
+
+    item = SCHEMA.encode(values)
+
+    assert item["ai_stats"] == {"M": {"cool": {"N": "80"}}}
+    assert SCHEMA.decode(item) == values
+    assert SCHEMA.decode_many([item, item]) == [values, values]
+
+
+def test_encode_leaves_out_none():
+    assert SCHEMA.encode({"video_id": "v1", "duration": None}) == {
+        "video_id": {"S": "v1"}
+    }
+    assert SCHEMA.encode_value("duration", 0) == {"N": "0"}
+
+
+def test_encode_rejects_unknown_fields():
+    with pytest.raises(ValueError, match="stat, unknown"):
+        SCHEMA.encode({"video_id": "v1", "unknown": "x", "stat": None})
+
+
+def test_fractional_numbers_are_truncated():
+    assert SCHEMA.decode({"duration": {"N": "12.7"}}) == {"duration": 12}
+
+
+def test_video_records_from_items():
+    item = VIDEO_ITEM.encode(
+        {
+            "channel_id": "UC1",
+            "video_id": "v1",
+            "video_title": "title",
+            "duration": 200,
+            "enrichment_attempts": 2,
+            "view_count": 10,
+        }
+    )
+
+    [record] = VideoRecord.from_items([item])
+
+    assert (record.video_id, record.channel_id, record.duration) == ("v1", "UC1", 200)
+    assert record.enrichment_attempts == 2
+    # Attributes outside the record's projection are not read
+    assert record.view_count == 0
+    assert record.description == ""
+
+
+def test_backend_copy_is_identical():
+    here = Path(__file__).parent
+    backend_copy = here.parent / "backend" / "db" / "item_codec.py"
+
+    assert (here / "item_codec.py").read_bytes() == backend_copy.read_bytes()
+
+
+class RecordingClient:
+    def __init__(self):
+        self.items = []
+
+    def batch_write_item(self, RequestItems):
+        for requests in RequestItems.values():
+            self.items += [request["PutRequest"]["Item"] for request in requests]
+        return {"UnprocessedItems": {}}
+
+
+def test_stored_videos_are_returned_as_read_back():
+    client = RecordingClient()
+    repository = VideoRepository(client, "videos", BatchWriter(client))
+    videos = [
+        YouTubeVideo("v1", "UC1", "title", "desc", 200, "2024", view_count=5),
+        # Live streams are not stored
+        YouTubeVideo("v2", "UC1", "live", "", 0, "2024"),
+    ]
+
+    records = repository.batch_upsert_videos(videos)
+
+    [stored] = client.items
+    assert [vars(record) for record in records] == [vars(VideoRecord.from_item(stored))]
+    assert records[0].enrichment_state == ENRICHMENT_PENDING
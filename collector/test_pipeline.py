@@ -0,0 +1,81 @@
+"""
+Test script for the staged worker pipeline and the token-bucket rate limiter.
+"""
+
+import threading
+import time
+
+from pipeline import Pipeline, Stage
+from rate_limiter import TokenBucket
+
+
+def test_items_flow_through_all_stages():
+    """Every item reaches the last stage; stages can fan out and drop."""
+    seen = []
+    lock = threading.Lock()
+
+    def split(chunk):
+        return chunk
+
+    def drop_odd(n):
+        return [n] if n % 2 == 0 else []
+
+    def collect(n):
+        with lock:
+            seen.append(n)
+
+    pipeline = Pipeline(
+        [
+            Stage("split", split),
+            Stage("filter", drop_odd, workers=3),
+            Stage("collect", collect, workers=2),
+        ]
+    )
+    pipeline.run([[1, 2, 3], [4, 5, 6], [7, 8]])
+
+    assert sorted(seen) == [2, 4, 6, 8]
+
+
+def test_failed_items_do_not_stop_the_run():
+    """An exception drops only the item that raised it."""
+    seen = []
+
+    def fail_on_three(n):
+        if n == 3:
+            raise RuntimeError("boom")
+        return [n]
+
+    pipeline = Pipeline([Stage("work", fail_on_three, 2), Stage("done", seen.append)])
+    pipeline.run(range(6))
+
+    assert sorted(seen) == [0, 1, 2, 4, 5]
+
+
+def test_stop_skips_remaining_items():
+    """After stop(), queued and unread items are not processed."""
+    seen = []
+
+    def work(n):
+        seen.append(n)
+        if n == 2:
+            pipeline.stop()
+        return []
+
+    pipeline = Pipeline([Stage("work", work)])
+    pipeline.run(range(100))
+
+    assert pipeline.stopped
+    assert seen[:3] == [0, 1, 2]
+    assert len(seen) < 100
+
+
+def test_token_bucket_allows_burst_then_paces():
+    """Capacity tokens are available at once; the rest wait for refills."""
+    bucket = TokenBucket(rate=50.0, capacity=3)
+
+    assert all(bucket.try_acquire() for _ in range(3))
+    assert not bucket.try_acquire()
+
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.015
@@ -0,0 +1,65 @@
+"""
+Test script for the local video type pre-classifier.
+"""
+
+from preclassifier import PreClassifier, confusion_matrix, format_report
+
+
+def test_obvious_cases_are_settled():
+    """Clear keywords settle the type without Gemini."""
+    classifier = PreClassifier(confidence=0.9)
+
+    song = classifier.classify("【歌ってみた】夜に駆ける / 星街すいせい", "", 245)
+    game = classifier.classify("【マイクラ実況】拠点づくり #5", "", 900)
+    chat = classifier.classify("【雑談】まったり話す", "", 700)
+
+    assert song and song["type"] == "SONG"
+    assert game and game["type"] == "GAME"
+    assert chat and chat["type"] == "UNKNOWN"
+
+
+def test_ambiguous_cases_go_to_gemini():
+    """No keywords, or conflicting ones, leave the decision to Gemini."""
+    classifier = PreClassifier(confidence=0.9)
+
+    assert classifier.classify("新しい動画", "", 300) is None
+    assert classifier.classify("歌ってみた配信の雑談", "", 300) is None
+
+
+def test_keywords_are_width_and_case_insensitive():
+    classifier = PreClassifier(confidence=0.9)
+
+    result = classifier.classify("ＣＯＶＥＲＥＤ ＢＹ someone", "", 200)
+
+    assert result and result["type"] == "SONG"
+
+
+def test_channel_history_shifts_the_decision():
+    """A channel that only posts songs tips a weak SONG signal over."""
+    classifier = PreClassifier(confidence=0.9)
+    title = "オリジナル曲 新曲"
+
+    without_history = classifier.classify(title, "", 700)
+    with_history = classifier.classify(title, "", 700, {"SONG": 40, "GAME": 1})
+
+    assert without_history is None
+    assert with_history and with_history["type"] == "SONG"
+
+
+def test_confusion_matrix_report():
+    pairs = [
+        ("SONG", "SONG"),
+        ("SONG", None),
+        ("GAME", "GAME"),
+        ("UNKNOWN", "GAME"),
+        ("SONG", "SONG"),
+    ]
+
+    matrix = confusion_matrix(pairs)
+
+    assert matrix["SONG"] == {"SONG": 2, "GAME": 0, "UNKNOWN": 0, "GEMINI": 1}
+    assert matrix["UNKNOWN"]["GAME"] == 1
+
+    report = format_report(matrix)
+    assert "Settled locally: 4/5" in report
+    assert "Accuracy of settled: 3/4" in report
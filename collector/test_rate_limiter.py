@@ -0,0 +1,109 @@
+"""
+Test script for the adaptive rate control shared by the API clients.
+"""
+
+import pytest
+from rate_limiter import (
+    THROTTLED,
+    TRANSIENT,
+    AdaptiveLimiter,
+    RateController,
+    RetryPolicy,
+    ThrottledError,
+)
+
+
+class Throttled(Exception):
+    pass
+
+
+class Flaky(Exception):
+    pass
+
+
+def classify(error):
+    if isinstance(error, Throttled):
+        return THROTTLED
+    if isinstance(error, Flaky):
+        return TRANSIENT
+    return None
+
+
+def failing(errors, result="ok"):
+    """A request raising `errors` in turn before succeeding."""
+    remaining = list(errors)
+
+    def request():
+        if remaining:
+            raise remaining.pop(0)
+        return result
+
+    return request
+
+
+def controller(max_attempts=5):
+    return RateController(
+        1000.0, burst=10, max_concurrency=8, retry=RetryPolicy(max_attempts, 0.0)
+    )
+
+
+def test_retries_until_success():
+    control = controller()
+
+    assert control.call("videos", failing([Throttled(), Flaky()]), classify) == "ok"
+
+    metrics = control.metrics()["videos"]
+    assert metrics["calls"] == 3
+    assert metrics["throttled"] == 1
+    assert metrics["transient"] == 1
+    assert metrics["retries"] == 2
+    assert metrics["gave_up"] == 0
+
+
+def test_gives_up_with_throttled_error():
+    control = controller(max_attempts=3)
+
+    with pytest.raises(ThrottledError) as info:
+        control.call("videos", failing([Throttled()] * 5), classify)
+
+    assert info.value.attempts == 3
+    assert isinstance(info.value.last_error, Throttled)
+    assert control.metrics()["videos"]["gave_up"] == 1
+
+
+def test_other_errors_are_not_retried():
+    control = controller()
+
+    with pytest.raises(ValueError):
+        control.call("videos", failing([ValueError("bad request")]), classify)
+
+    assert control.metrics()["videos"]["calls"] == 1
+
+
+def test_endpoints_have_separate_limiters():
+    control = controller()
+    control.call("videos", failing([Throttled()]), classify)
+    control.call("channels", failing([]), classify)
+
+    metrics = control.metrics()
+    assert metrics["videos"]["concurrency"] < 8
+    assert metrics["channels"]["concurrency"] == 8
+
+
+def test_aimd_backs_off_and_recovers():
+    limiter = AdaptiveLimiter(rate=10.0, burst=1, max_concurrency=8)
+
+    with limiter.slot() as started:
+        pass
+    limiter.on_throttle(started)
+    assert limiter.limit == 4
+    assert limiter.bucket.rate == 5.0
+
+    # Throttles of calls sent before the decrease don't cut it again
+    limiter.on_throttle(started)
+    assert limiter.limit == 4
+
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.limit == 8
+    assert limiter.bucket.rate == 10.0
@@ -0,0 +1,75 @@
+"""
+Test script for the multi-channel scheduler.
+"""
+
+import threading
+import time
+
+from scheduler import (
+    INTERRUPTED,
+    SKIPPED,
+    ChannelScheduler,
+    TimeBudget,
+    unfinished_channels,
+)
+
+
+def budget(seconds):
+    """A budget of `seconds` from now."""
+    deadline = time.monotonic() + seconds
+    return TimeBudget(lambda: deadline - time.monotonic())
+
+
+def test_channels_run_concurrently():
+    running = []
+    peak = [0]
+    lock = threading.Lock()
+
+    def collect(channel_url, resume, stop):
+        with lock:
+            running.append(channel_url)
+            peak[0] = max(peak[0], len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(channel_url)
+        if channel_url == "bad":
+            raise ValueError("unknown channel")
+        return {"channel_id": channel_url.upper(), "status": "success"}
+
+    results = ChannelScheduler(collect, max_concurrency=2).run(["a", "bad", "c"])
+
+    assert peak[0] == 2
+    assert [r["channel_url"] for r in results] == ["a", "bad", "c"]
+    assert results[0] == {"channel_url": "a", "channel_id": "A", "status": "success"}
+    assert results[1]["status"] == "error"
+
+
+def test_budget_stops_running_and_skips_waiting_channels():
+    resumed = []
+
+    def collect(channel_url, resume, stop):
+        resumed.append(resume)
+        # A long channel that returns early once stopped
+        stop.wait(5)
+        return {"status": INTERRUPTED if stop.is_set() else "success"}
+
+    scheduler = ChannelScheduler(collect, max_concurrency=1, budget=budget(0.1))
+    started = time.monotonic()
+    results = scheduler.run(["a", "b", "c"], resume=["a", "c"])
+
+    assert time.monotonic() - started < 2
+    assert [r["status"] for r in results] == [INTERRUPTED, SKIPPED, SKIPPED]
+    assert resumed == [True]
+
+    remaining, resume = unfinished_channels(results, ["a", "c"])
+    assert remaining == ["a", "b", "c"]
+    assert resume == ["a", "c"]
+
+
+def test_expired_budget_starts_nothing():
+    def collect(channel_url, resume, stop):
+        raise AssertionError("no channel should start")
+
+    results = ChannelScheduler(collect, budget=budget(-1)).run(["a", "b"])
+
+    assert {r["status"] for r in results} == {SKIPPED}
@@ -0,0 +1,132 @@
+"""
+Test script for the singer-videos index repository.
+
+Uses an in-memory fake client, so no AWS access is needed.
+"""
+
+from types import SimpleNamespace
+
+from batch_writer import BatchWriter
+from db import SingerVideoIndexRepository
+
+
+class ConditionalCheckFailedException(Exception):
+    pass
+
+
+class FakeClient:
+    """Singer-videos records and summary video counts, with a call log."""
+
+    exceptions = SimpleNamespace(
+        ConditionalCheckFailedException=ConditionalCheckFailedException
+    )
+
+    def __init__(self):
+        self.records = {}
+        self.counts = {}
+        self.calls = []
+
+    @staticmethod
+    def _key(key):
+        return key["singer_key"]["S"], key["sort_key"]["S"]
+
+    def batch_get_item(self, RequestItems):
+        self.calls.append("BatchGetItem")
+        [(table, request)] = RequestItems.items()
+        found = [
+            self.records[self._key(key)]
+            for key in request["Keys"]
+            if self._key(key) in self.records
+        ]
+        return {"Responses": {table: found}}
+
+    def put_item(self, TableName, Item, ConditionExpression):
+        self.calls.append("PutItem")
+        if self._key(Item) in self.records:
+            raise ConditionalCheckFailedException()
+        self.records[self._key(Item)] = Item
+
+    def batch_write_item(self, RequestItems):
+        self.calls.append("BatchWriteItem")
+        for requests in RequestItems.values():
+            for request in requests:
+                item = request["PutRequest"]["Item"]
+                self.records[self._key(item)] = item
+        return {"UnprocessedItems": {}}
+
+    def delete_item(self, TableName, Key, ReturnValues):
+        self.calls.append("DeleteItem")
+        old = self.records.pop(self._key(Key), None)
+        return {"Attributes": old} if old else {}
+
+    def query(self, TableName, **kwargs):
+        self.calls.append("Query")
+        [value] = kwargs["ExpressionAttributeValues"].values()
+        field = "video_id" if kwargs.get("IndexName") else "singer_key"
+        items = [item for item in self.records.values() if item[field] == value]
+        return {"Items": items}
+
+    def update_item(self, TableName, Key, UpdateExpression, **kwargs):
+        singer_key = Key["singer_key"]["S"]
+        values = kwargs["ExpressionAttributeValues"]
+        if ":one" in values:
+            self.counts[singer_key] = self.counts.get(singer_key, 0) + 1
+        elif ":delta" in values:
+            if self.counts.get(singer_key, 0) <= 0:
+                raise ConditionalCheckFailedException()
+            self.counts[singer_key] -= 1
+        return {"Attributes": {}}
+
+
+def _repository():
+    client = FakeClient()
+    return client, SingerVideoIndexRepository(
+        client, "singer-videos", "singer-summaries", BatchWriter(client)
+    )
+
+
+def _upsert(repository, singers, replace=False):
+    repository.upsert_singer_video_index(
+        video_id="v1",
+        channel_id="UC1",
+        video_title="title",
+        song_title="song",
+        singers=singers,
+        published_at="2024-01-01T00:00:00Z",
+        is_cover=True,
+        replace=replace,
+    )
+
+
+def test_existing_records_are_batched_and_counted_once():
+    client, repository = _repository()
+
+    _upsert(repository, ["A", "B"])
+    assert client.calls.count("PutItem") == 2
+    assert client.counts == {"a": 1, "b": 1}
+
+    client.calls.clear()
+    _upsert(repository, ["A", "B"])
+    assert client.calls == ["BatchGetItem", "BatchWriteItem"]
+
+    client.calls.clear()
+    _upsert(repository, ["A", "B"], replace=True)
+    assert client.calls == ["Query", "BatchWriteItem"]
+    assert client.counts == {"a": 1, "b": 1}
+
+
+def test_replace_uncounts_removed_singers_once():
+    client, repository = _repository()
+    _upsert(repository, ["A", "B"])
+    stale = repository._query_index_items("v1")
+
+    _upsert(repository, ["B", "C"], replace=True)
+    assert sorted(key for key, _ in client.records) == ["b", "c"]
+    assert client.counts == {"a": 0, "b": 1, "c": 1}
+
+    # A retried delete of records that are already gone changes nothing
+    for item in stale:
+        repository._delete_index_item(item)
+    repository.delete_singer_video_index("v1")
+    repository.delete_singer_video_index("v1")
+    assert client.counts == {"a": 0, "b": 0, "c": 0}
@@ -1,11 +1,55 @@
-from typing import Any, Dict, List, Set
+import asyncio
+from collections import deque
+from typing import (
+    AbstractSet,
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 import isodate
 import requests
+from requests.adapters import HTTPAdapter
+from rate_limiter import (
+    THROTTLED,
+    TRANSIENT,
+    RateController,
+    RetryPolicy,
+    ThrottledError,
+)
 from url_parser import IdentifierType, parse_youtube_url
 
 BASE_URL = "https://www.googleapis.com/youtube/v3"
 
+# 403 reasons that mean "slow down"; quotaExceeded (daily quota) is not
+# retried since it won't recover within the run
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+# Google APIs only gzip responses for clients that ask for it in both headers
+SESSION_HEADERS = {
+    "Accept-Encoding": "gzip",
+    "User-Agent": "vsinger-xross-collector (gzip)",
+}
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+# Partial-response projections: only the attributes parsed below
+THUMBNAIL_FIELDS = "thumbnails(high/url,medium/url,default/url)"
+VIDEO_FIELDS = (
+    "items(id,"
+    f"snippet(channelId,channelTitle,title,description,publishedAt,{THUMBNAIL_FIELDS}),"
+    "contentDetails/duration,"
+    "statistics(viewCount,likeCount,commentCount))"
+)
+
 
 class YouTubeVideo:
     """Represents a YouTube video with metadata."""
@@ -40,16 +84,57 @@ class YouTubeVideo:
 class YouTubeClient:
     """Client for YouTube Data API v3."""
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        rate_control: Optional[RateController] = None,
+        session: Optional[requests.Session] = None,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+    ):
         self.api_key = api_key
+        self.rate_control = rate_control
+        # Keep-alive connections to googleapis.com, reused across calls
+        self.session = session or create_session()
+        self.timeout = timeout
+
+    @classmethod
+    def from_settings(cls, settings) -> "YouTubeClient":
+        """Create a rate-controlled client from collector settings."""
+        return cls(
+            settings.youtube_api_key,
+            rate_control=RateController(
+                settings.youtube_requests_per_second,
+                settings.youtube_burst,
+                settings.youtube_max_concurrency,
+                RetryPolicy(settings.api_max_attempts, settings.api_retry_base_delay),
+            ),
+            session=create_session(settings.youtube_pool_size),
+            timeout=(settings.youtube_connect_timeout, settings.youtube_read_timeout),
+        )
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
 
     def _get(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Make a GET request to YouTube API."""
+        """
+        Make a GET request to YouTube API.
+
+        With rate control, throttled (429/503, rate-limit 403) and transient
+        (5xx, connection) failures are retried with backoff; ThrottledError
+        is raised if they persist.
+        """
         params["key"] = self.api_key
         url = f"{BASE_URL}/{endpoint}"
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+
+        def request() -> Dict[str, Any]:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+
+        if self.rate_control is None:
+            return request()
+        return self.rate_control.call(endpoint, request, _classify_error)
 
     def resolve_channel_id(self, url_or_id: str) -> str:
         """
@@ -113,6 +198,7 @@ class YouTubeClient:
             {
                 "forUsername": username,
                 "part": "id",
+                "fields": "items(id)",
             },
         )
 
@@ -139,6 +225,7 @@ class YouTubeClient:
             {
                 "forHandle": handle,
                 "part": "id",
+                "fields": "items(id)",
             },
         )
 
@@ -165,6 +252,7 @@ class YouTubeClient:
             {
                 "id": video_id,
                 "part": "snippet",
+                "fields": "items(snippet(channelId,channelTitle))",
             },
         )
 
@@ -181,6 +269,7 @@ class YouTubeClient:
             {
                 "id": channel_id,
                 "part": "contentDetails",
+                "fields": "items(contentDetails/relatedPlaylists/uploads)",
             },
         )
 
@@ -204,6 +293,8 @@ class YouTubeClient:
             {
                 "id": channel_id,
                 "part": "snippet,statistics",
+                "fields": f"items(snippet(title,{THUMBNAIL_FIELDS}),"
+                "statistics/subscriberCount)",
             },
         )
 
@@ -237,6 +328,7 @@ class YouTubeClient:
             "playlistId": playlist_id,
             "part": "contentDetails",
             "maxResults": "50",
+            "fields": "nextPageToken,items(contentDetails(videoId,videoPublishedAt))",
         }
         if page_token:
             params["pageToken"] = page_token
@@ -298,6 +390,7 @@ class YouTubeClient:
             {
                 "id": ",".join(video_ids[:50]),
                 "part": "snippet,contentDetails,statistics",
+                "fields": VIDEO_FIELDS,
             },
         )
 
@@ -341,6 +434,39 @@ class YouTubeClient:
 
         return videos
 
+    def fetch_video_statistics(self, video_ids: List[str]) -> Dict[str, Dict[str, int]]:
+        """
+        Fetch only the view/like/comment counts of the given videos.
+
+        Args:
+          video_ids: List of video IDs (max 50 per request)
+
+        Returns:
+          video_id -> {"view_count", "like_count", "comment_count"}; deleted
+          and private videos are missing
+        """
+        if not video_ids:
+            return {}
+
+        result = self._get(
+            "videos",
+            {
+                "id": ",".join(video_ids[:50]),
+                "part": "statistics",
+                "fields": "items(id,statistics(viewCount,likeCount,commentCount))",
+            },
+        )
+
+        statistics = {}
+        for item in result.get("items", []):
+            stats = item.get("statistics", {})
+            statistics[item["id"]] = {
+                "view_count": int(stats.get("viewCount", 0)),
+                "like_count": int(stats.get("likeCount", 0)),
+                "comment_count": int(stats.get("commentCount", 0)),
+            }
+        return statistics
+
     def fetch_video_comments(
         self, video_id: str, max_results: int = 100
     ) -> List[Dict[str, str]]:
@@ -363,6 +489,8 @@ class YouTubeClient:
                     "maxResults": min(max_results, 100),
                     "order": "relevance",  # Most relevant comments first
                     "textFormat": "plainText",
+                    "fields": "items(snippet/topLevelComment/snippet"
+                    "(textDisplay,likeCount))",
                 },
             )
 
@@ -378,7 +506,219 @@ class YouTubeClient:
 
             return comments
 
+        except ThrottledError:
+            # Not the same as "no comments"; let the caller retry later
+            raise
         except Exception as e:
             # Comments may be disabled for the video
             print(f"  ℹ Could not fetch comments for {video_id}: {e}")
             return []
+
+
+class AsyncYouTubeClient:
+    """
+    asyncio front end to YouTubeClient for channel discovery.
+
+    Requests run on worker threads through the wrapped client, so they share
+    its session, rate control and field projections.
+    """
+
+    def __init__(self, client: YouTubeClient, max_pending_details: int = 4):
+        self.client = client
+        self.max_pending_details = max(1, max_pending_details)
+
+    async def iter_channel_videos(
+        self,
+        channel_id: str,
+        max_videos: int = 0,
+        skip_ids: AbstractSet[str] = frozenset(),
+        since: Optional[Tuple[str, str]] = None,
+        known_ids: Optional[Callable[[List[str]], AbstractSet[str]]] = None,
+        progress: Optional["CrawlProgress"] = None,
+    ) -> AsyncIterator[List[YouTubeVideo]]:
+        """
+        Walk the uploads playlist and yield video details page by page.
+
+        As soon as a page of IDs arrives, its `videos` call is started and
+        the next page is requested alongside it. Chunks are yielded in
+        playlist order. Closing the iterator early cancels outstanding
+        requests (a request already running on a thread still finishes, but
+        its result is dropped).
+
+        Args:
+          channel_id: YouTube channel ID
+          max_videos: Stop listing after this many video IDs (0 = no limit)
+          skip_ids: IDs to list but not fetch details for (e.g. stored ones)
+          since: High-water mark (published_at, video_id). The playlist is
+            newest-first, so listing stops at the mark or the first older
+            upload.
+          known_ids: Returns which of a page's IDs are already stored; they
+            are skipped like `skip_ids`
+          progress: Filled in with what the crawl listed
+
+        Yields:
+          Lists of YouTubeVideo, one per playlist page with new videos
+        """
+        progress = progress if progress is not None else CrawlProgress()
+        playlist_id = await asyncio.to_thread(
+            self.client.fetch_uploads_playlist_id, channel_id
+        )
+
+        seen: Set[str] = set()
+        details: Deque[asyncio.Task] = deque()
+        page: Optional[asyncio.Task] = asyncio.create_task(
+            asyncio.to_thread(self.client.fetch_video_ids_from_playlist, playlist_id)
+        )
+
+        try:
+            while page is not None:
+                result = await page
+                page = None
+
+                video_ids = []
+                reached_mark = False
+                for item in result.get("items", []):
+                    video_id = item["contentDetails"]["videoId"]
+                    published_at = item["contentDetails"].get("videoPublishedAt", "")
+                    if since and (
+                        video_id == since[1]
+                        or (published_at and published_at <= since[0])
+                    ):
+                        reached_mark = True
+                        break
+                    if video_id in seen:
+                        continue
+                    if max_videos > 0 and len(seen) >= max_videos:
+                        break
+                    if progress.newest is None and published_at:
+                        progress.newest = (published_at, video_id)
+                    seen.add(video_id)
+                    video_ids.append(video_id)
+                progress.listed = len(seen)
+
+                # Request the next page while this page's details are fetched
+                next_token = result.get("nextPageToken")
+                if (
+                    next_token
+                    and not reached_mark
+                    and (max_videos <= 0 or len(seen) < max_videos)
+                ):
+                    page = asyncio.create_task(
+                        asyncio.to_thread(
+                            self.client.fetch_video_ids_from_playlist,
+                            playlist_id,
+                            next_token,
+                        )
+                    )
+                # Complete unless max_videos cut the listing short
+                listed_all = reached_mark or not next_token
+
+                new_ids = [
+                    video_id for video_id in video_ids if video_id not in skip_ids
+                ]
+                if new_ids and known_ids:
+                    known = await asyncio.to_thread(known_ids, new_ids)
+                    new_ids = [
+                        video_id for video_id in new_ids if video_id not in known
+                    ]
+                if new_ids:
+                    details.append(
+                        asyncio.create_task(
+                            asyncio.to_thread(self.client.fetch_videos, new_ids)
+                        )
+                    )
+
+                # Hand over finished chunks; wait if too many are pending
+                while details and (
+                    details[0].done() or len(details) >= self.max_pending_details
+                ):
+                    yield await details.popleft()
+
+            while details:
+                yield await details.popleft()
+            progress.complete = listed_all
+        finally:
+            for task in [page, *details]:
+                if task is not None:
+                    task.cancel()
+
+    def channel_video_chunks(
+        self,
+        channel_id: str,
+        max_videos: int = 0,
+        skip_ids: AbstractSet[str] = frozenset(),
+        since: Optional[Tuple[str, str]] = None,
+        known_ids: Optional[Callable[[List[str]], AbstractSet[str]]] = None,
+        progress: Optional["CrawlProgress"] = None,
+    ) -> Iterator[List[YouTubeVideo]]:
+        """
+        Blocking iterator over iter_channel_videos for thread-based callers.
+
+        Runs its own event loop; requests keep running on their threads
+        while the caller processes a chunk.
+        """
+        loop = asyncio.new_event_loop()
+        chunks = self.iter_channel_videos(
+            channel_id, max_videos, skip_ids, since, known_ids, progress
+        )
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(chunks.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(chunks.aclose())
+            loop.close()
+
+
+class CrawlProgress:
+    """What a channel crawl has listed so far."""
+
+    def __init__(self):
+        self.listed = 0
+        # (published_at, video_id) of the newest upload listed
+        self.newest: Optional[Tuple[str, str]] = None
+        # True once the crawl reached the end of the playlist or the
+        # high-water mark and every chunk was handed over
+        self.complete = False
+
+
+def create_session(pool_size: int = 10) -> requests.Session:
+    """
+    Create a keep-alive session for the YouTube Data API.
+
+    The connection pool holds up to `pool_size` connections, so worker
+    threads sharing the client don't open new ones; size it to at least
+    the number of concurrent callers.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.headers.update(SESSION_HEADERS)
+    return session
+
+
+def _classify_error(error: Exception) -> Optional[str]:
+    """Decide whether a failed request is worth retrying."""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return TRANSIENT
+    if not isinstance(error, requests.HTTPError) or error.response is None:
+        return None
+
+    status = error.response.status_code
+    if status in (429, 503):
+        return THROTTLED
+    if status == 403 and _error_reason(error.response) in RATE_LIMIT_REASONS:
+        return THROTTLED
+    if status in (500, 502, 504):
+        return TRANSIENT
+    return None
+
+
+def _error_reason(response: requests.Response) -> str:
+    """The `reason` of a YouTube API error body, or "" if there is none."""
+    try:
+        return response.json()["error"]["errors"][0]["reason"]
+    except (ValueError, KeyError, IndexError, TypeError):
+        return ""